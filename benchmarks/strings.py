@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2017, DIANA-HEP
+# All rights reserved.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# 
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# 
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Compares the three ways of decoding string baskets: the original Python loop,
+# the same loop compiled by numba (if installed), and the NumPy implementation.
+#
+#     python benchmarks/strings.py [numstrings]
+
+import sys
+import time
+
+import numpy
+
+from uproot.interp.strings import _asstrings_fromroot_python
+from uproot.interp.strings import _asstrings_fromroot_numpy
+
+def basket(numstrings, seed=12345):
+    # strings of 0-40 bytes, with 1 in 1000 over 255 bytes (which have a 5-byte header)
+    random = numpy.random.RandomState(seed)
+    lengths = random.randint(0, 41, numstrings)
+    lengths[random.randint(0, 1000, numstrings) == 0] = 300
+    headers = numpy.where(lengths < 255, 1, 5)
+
+    offsets = numpy.empty(numstrings + 1, dtype=numpy.int32)
+    offsets[0] = 0
+    numpy.cumsum(headers + lengths, out=offsets[1:])
+
+    data = random.randint(ord("a"), ord("z") + 1, offsets[-1]).astype(numpy.uint8)
+    data[offsets[:-1]] = numpy.where(lengths < 255, lengths, 255)
+    return data, offsets
+
+def best(function, data, offsets, repeat=5):
+    out = None
+    for i in range(repeat):
+        starttime = time.time()
+        function(data, offsets, 0, len(offsets) - 1, 1, True)
+        seconds = time.time() - starttime
+        if out is None or seconds < out:
+            out = seconds
+    return out
+
+if __name__ == "__main__":
+    numstrings = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    data, offsets = basket(numstrings)
+
+    expectation = _asstrings_fromroot_python(data, offsets, 0, numstrings, 1, True)
+    result = _asstrings_fromroot_numpy(data, offsets, 0, numstrings, 1, True)
+    assert all(numpy.array_equal(x, y) for x, y in zip(expectation, result))
+
+    print("{0} strings, {1} bytes".format(numstrings, len(data)))
+    print("Python loop: {0:8.4f} s".format(best(_asstrings_fromroot_python, data, offsets, repeat=1)))
+
+    try:
+        import numba
+    except ImportError:
+        print("numba:       not installed")
+    else:
+        compiled = numba.njit(_asstrings_fromroot_python)
+        compiled(data, offsets, 0, numstrings, 1, True)      # compile before timing
+        print("numba:       {0:8.4f} s".format(best(compiled, data, offsets)))
+
+    print("NumPy:       {0:8.4f} s".format(best(_asstrings_fromroot_numpy, data, offsets)))
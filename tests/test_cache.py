@@ -151,3 +151,70 @@ class TestCache(unittest.TestCase):
             self.assertTrue(len(keycache) > 0)
             self.assertEqual(branch.array(entrystart=entrystart, entrystop=entrystop, keycache=keycache).tolist(), expectation[entrystart:entrystop])
             keycache = {}
+
+    def test_basketcache_shared_between_trees(self):
+        file = uproot.open("tests/samples/HZZ-zlib.root")
+        basketcache = {}
+        first = file["events"]["Jet_Px"].array(basketcache=basketcache)
+        numbaskets = len(basketcache)
+        self.assertTrue(numbaskets > 0)
+
+        # a new TTree object and a different interpretation reuse the same baskets
+        second = uproot.open("tests/samples/HZZ-zlib.root")["events"]["Jet_Px"].array(numpy.float64, basketcache=basketcache)
+        self.assertEqual(len(basketcache), numbaskets)
+        self.assertEqual(first.tolist(), second.tolist())
+
+    def test_weightedmemorycache(self):
+        cache = uproot.cache.WeightedMemoryCache(30000)
+        cache.setcost("expensive", 1.0)
+        cache["expensive"] = numpy.zeros(1000, dtype=numpy.uint8)
+        for i in range(10):
+            cache.setcost(i, 0.001)
+            cache[i] = numpy.zeros(1000, dtype=numpy.uint8)
+        for i in range(10, 30):
+            cache[i] = numpy.zeros(1000, dtype=numpy.uint8)
+
+        self.assertTrue(cache.numbytes <= 30000)
+        self.assertTrue(cache.numevicted > 0)
+        self.assertTrue("expensive" in cache)
+        self.assertEqual(cache.cost("expensive"), 1.0)
+
+        del cache["expensive"]
+        self.assertFalse("expensive" in cache)
+        self.assertEqual(cache.get("expensive", None), None)
+
+        cache = uproot.cache.WeightedMemoryCache(30000)
+        cache.setcost("expensive", 1.0)
+        cache["expensive"] = numpy.zeros(1000, dtype=numpy.uint8)
+        cache["cheap"] = numpy.ones(1000, dtype=numpy.uint8)
+        copy = cache.copy()
+        self.assertEqual(copy.pop("cheap").tolist(), [1] * 1000)
+        self.assertEqual(copy.pop("cheap", None), None)
+        self.assertRaises(KeyError, lambda: copy.pop("cheap"))
+        self.assertTrue("cheap" in cache)
+        self.assertEqual(copy.setdefault("cheap", 5), 5)
+        self.assertEqual(copy.setdefault("cheap", 6), 5)
+        self.assertEqual(cache.popitem()[0], "cheap")
+        self.assertEqual(cache.popitem()[0], "expensive")
+        self.assertEqual(cache.numbytes, 0)
+        self.assertRaises(KeyError, lambda: cache.popitem())
+
+        for i in range(cache.maxpendingcosts + 10):
+            cache.setcost(i, 1.0)
+        self.assertEqual(len(cache._costs), cache.maxpendingcosts)
+
+        basketcache = uproot.cache.WeightedMemoryCache(100*1024**2)
+        uproot.open("tests/samples/HZZ-zlib.root")["events"]["Jet_Px"].array(basketcache=basketcache)
+        self.assertTrue(len(basketcache) > 0)
+        self.assertTrue(all(basketcache.cost(key) > 0 for key in basketcache))
+
+        # any cache with a setcost method is given the costs
+        class CostedDict(dict):
+            def __init__(self):
+                self.costs = {}
+            def setcost(self, key, cost):
+                self.costs[key] = cost
+        basketcache = CostedDict()
+        uproot.open("tests/samples/HZZ-zlib.root")["events"]["Jet_Px"].array(basketcache=basketcache)
+        self.assertTrue(len(basketcache) > 0)
+        self.assertEqual(set(basketcache.costs), set(basketcache))
@@ -75,3 +75,77 @@ class TestSTLVector(unittest.TestCase):
     def test_slice(self):
         tree = uproot.open("tests/samples/small-evnt-tree-fullsplit.root")["tree"]
         self.assertEqual(tree.array("SliceI16").tolist(), [[], [1], [2, 2], [3, 3, 3], [4, 4, 4, 4], [5, 5, 5, 5, 5], [6, 6, 6, 6, 6, 6], [7, 7, 7, 7, 7, 7, 7], [8, 8, 8, 8, 8, 8, 8, 8], [9, 9, 9, 9, 9, 9, 9, 9, 9], [], [11], [12, 12], [13, 13, 13], [14, 14, 14, 14], [15, 15, 15, 15, 15], [16, 16, 16, 16, 16, 16], [17, 17, 17, 17, 17, 17, 17], [18, 18, 18, 18, 18, 18, 18, 18], [19, 19, 19, 19, 19, 19, 19, 19, 19], [], [21], [22, 22], [23, 23, 23], [24, 24, 24, 24], [25, 25, 25, 25, 25], [26, 26, 26, 26, 26, 26], [27, 27, 27, 27, 27, 27, 27], [28, 28, 28, 28, 28, 28, 28, 28], [29, 29, 29, 29, 29, 29, 29, 29, 29], [], [31], [32, 32], [33, 33, 33], [34, 34, 34, 34], [35, 35, 35, 35, 35], [36, 36, 36, 36, 36, 36], [37, 37, 37, 37, 37, 37, 37], [38, 38, 38, 38, 38, 38, 38, 38], [39, 39, 39, 39, 39, 39, 39, 39, 39], [], [41], [42, 42], [43, 43, 43], [44, 44, 44, 44], [45, 45, 45, 45, 45], [46, 46, 46, 46, 46, 46], [47, 47, 47, 47, 47, 47, 47], [48, 48, 48, 48, 48, 48, 48, 48], [49, 49, 49, 49, 49, 49, 49, 49, 49], [], [51], [52, 52], [53, 53, 53], [54, 54, 54, 54], [55, 55, 55, 55, 55], [56, 56, 56, 56, 56, 56], [57, 57, 57, 57, 57, 57, 57], [58, 58, 58, 58, 58, 58, 58, 58], [59, 59, 59, 59, 59, 59, 59, 59, 59], [], [61], [62, 62], [63, 63, 63], [64, 64, 64, 64], [65, 65, 65, 65, 65], [66, 66, 66, 66, 66, 66], [67, 67, 67, 67, 67, 67, 67], [68, 68, 68, 68, 68, 68, 68, 68], [69, 69, 69, 69, 69, 69, 69, 69, 69], [], [71], [72, 72], [73, 73, 73], [74, 74, 74, 74], [75, 75, 75, 75, 75], [76, 76, 76, 76, 76, 76], [77, 77, 77, 77, 77, 77, 77], [78, 78, 78, 78, 78, 78, 78, 78], [79, 79, 79, 79, 79, 79, 79, 79, 79], [], [81], [82, 82], [83, 83, 83], [84, 84, 84, 84], [85, 85, 85, 85, 85], [86, 86, 86, 86, 86, 86], [87, 87, 87, 87, 87, 87, 87], [88, 88, 88, 88, 88, 88, 88, 88], [89, 89, 89, 89, 89, 89, 89, 89, 89], [], [91], [92, 92], [93, 93, 93], [94, 94, 94, 94], [95, 95, 95, 95, 95], [96, 96, 96, 96, 96, 96], [97, 97, 97, 97, 97, 97, 97], [98, 98, 98, 98, 98, 98, 98, 98], [99, 99, 99, 99, 99, 99, 99, 99, 99]])
+
+    def test_vector_of_numbers_ranges(self):
+        branch = uproot.open("tests/samples/small-evnt-tree-fullsplit.root")["tree"]["StlVecF64"]
+        self.assertEqual(branch.array(entrystart=15, entrystop=42).tolist(), [[i] * (i % 10) for i in range(15, 42)])
+
+        interpretation = asstlvector(asdtype(">f8"))
+        header = numpy.full(10, 255, numpy.uint8)     # headers must not leak into the content
+        data = numpy.concatenate([header, header, numpy.array([1.5], ">f8").view(numpy.uint8), header, numpy.array([2.5, 3.5], ">f8").view(numpy.uint8)])
+        offsets = numpy.array([0, 10, 28, 54], dtype=numpy.int32)
+        source = interpretation.fromroot(data, offsets, 0, 3)
+        self.assertEqual(offsets.tolist(), [0, 10, 28, 54])
+        destination = interpretation.destination(interpretation.source_numitems(source), 3)
+        interpretation.fill(source, destination, 0, 3, 0, 3)
+        self.assertEqual(interpretation.finalize(destination, uproot.open("tests/samples/small-evnt-tree-fullsplit.root")["tree"]["StlVecF64"]).tolist(), [[], [1.5], [2.5, 3.5]])
+
+    def test_strings_numpy(self):
+        from uproot.interp.strings import _asstrings_fromroot_numpy, _asstrings_fromroot_python
+        strings = [b"", b"one", b"x" * 300, b"", b"two", b"y" * 255]
+        data, offsets = [], [0]
+        for x in strings:
+            header = [len(x)] if len(x) < 255 else [255, 0, 0, len(x) // 256, len(x) % 256]
+            data.extend(header + list(bytearray(x)))
+            offsets.append(len(data))
+        data, offsets = numpy.array(data, dtype=numpy.uint8), numpy.array(offsets, dtype=numpy.int32)
+
+        for start, stop in [(0, 6), (1, 4), (2, 3), (3, 3)]:
+            content, starts, stops = _asstrings_fromroot_numpy(data, offsets, start, stop, 1, True)
+            self.assertEqual([content[i:j].tostring() for i, j in zip(starts, stops)], strings[start:stop])
+            expectation = _asstrings_fromroot_python(data, offsets, start, stop, 1, True)
+            self.assertEqual([x.tolist() for x in (content, starts, stops)], [x.tolist() for x in expectation])
+        self.assertEqual(offsets.tolist()[:3], [0, 1, 5])
+
+    def test_vector_of_vector_of_numbers_columnar(self):
+        array = uproot.open("tests/samples/vectorVectorDouble.root")["t"]["x"].array()
+        self.assertEqual(array.content.tolist(), [10.0, 10.0, 20.0, 20.0, -21.0, -22.0, 200.0, -201.0, 202.0])
+        self.assertEqual(array.starts.tolist(), [0, 0, 2, 5, 6])
+        self.assertEqual(array.stops.tolist(), [0, 2, 5, 6, 9])
+        self.assertEqual(array.inner.tolist(), [[], [], [10.0], [], [10.0, 20.0], [20.0, -21.0, -22.0], [200.0], [-201.0], [202.0]])
+        self.assertEqual(array[-1].tolist(), [[200.0], [-201.0], [202.0]])
+        self.assertEqual(array[2:4].tolist(), [[[10.0], [], [10.0, 20.0]], [[20.0, -21.0, -22.0]]])
+
+    def test_strings_columnar(self):
+        array = uproot.open("tests/samples/small-evnt-tree-fullsplit.root")["tree"].array("StlVecStr")
+        self.assertEqual(array.starts.tolist()[:5], [0, 0, 1, 3, 6])
+        self.assertEqual(array.stops.tolist()[:5], [0, 1, 3, 6, 10])
+        self.assertEqual(array.strings[:3].tolist(), [b"vec-001", b"vec-002", b"vec-002"])
+        self.assertEqual(array.content[:7].tostring(), b"vec-001")
+        self.assertEqual(array[-1], [b"vec-099"] * 9)
+        self.assertEqual(array[3:5].tolist(), [[b"vec-003"] * 3, [b"vec-004"] * 4])
+
+    def test_vector_of_objects_columns(self):
+        import struct
+        from uproot.interp.jagged import JaggedArray, JaggedObjects
+        context = uproot.open("tests/samples/small-evnt-tree-fullsplit.root")._context
+        P3 = context.classes["P3"]
+        self.assertEqual(P3._recordtype.names, ("@cnt", "@vers", "Px", "Py", "Pz"))
+        self.assertTrue(context.classes["TBranch"]._recordtype is None)
+
+        # a char* member has a variable length, so such objects are not read as records
+        import copy
+        streamerinfo = copy.deepcopy([x for x in context.streamerinfos if x.fName == b"P3"][0])
+        streamerinfo.fElements[1].fType = uproot.const.kCharStar
+        classes = dict(context.classes)
+        del classes["P3"]
+        self.assertTrue(uproot.rootio._defineclasses([streamerinfo], classes)["P3"]._recordtype is None)
+
+        entries = [[(1, 2.5, 3)], [], [(4, 5.5, 6), (7, 8.5, 9)]]
+        data = [struct.pack(">IHI", 0x40000000 | (6 + 22*len(x)), 9, len(x)) + b"".join(struct.pack(">IHidi", 0x40000000 | 18, P3._classversion, px, py, pz) for px, py, pz in x) for x in entries]
+        offsets = numpy.cumsum([0] + [len(x) for x in data])
+        objects = JaggedObjects(JaggedArray(numpy.frombuffer(b"".join(data), dtype=numpy.uint8), offsets[:-1], offsets[1:]), P3, context)
+
+        self.assertEqual(list(objects.columns), ["Px", "Py", "Pz"])
+        self.assertEqual(objects.columns["Py"].tolist(), [[2.5], [], [5.5, 8.5]])
+        self.assertEqual([[(p.Px, p.Py, p.Pz) for p in x] for x in objects], entries)
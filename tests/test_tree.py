@@ -29,6 +29,9 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from collections import namedtuple
+import os
+import threading
+import time
 import unittest
 
 import numpy
@@ -40,6 +43,23 @@ def basest(array):
         array = array.base
     return array
 
+class basketsread(object):
+    # within a with block, records (branch name, basket number, basketcache) for every basket that is read
+    def __enter__(self):
+        self.read = []
+        self.original = original = uproot.tree.TBranchMethods._basket
+        def _basket(branch, i, interpretation, local_entrystart, local_entrystop, basketcache, *args, **kwds):
+            self.read.append((branch.name, i, basketcache))
+            return original(branch, i, interpretation, local_entrystart, local_entrystop, basketcache, *args, **kwds)
+        uproot.tree.TBranchMethods._basket = _basket
+        return self
+
+    def __exit__(self, *args):
+        uproot.tree.TBranchMethods._basket = self.original
+
+    def baskets(self, name):
+        return set(i for n, i, basketcache in self.read if n == name)
+
 class TestTree(unittest.TestCase):
     def runTest(self):
         pass
@@ -62,6 +82,66 @@ class TestTree(unittest.TestCase):
         self.assertTrue(ratio_fI30.min() > 0.9999 and ratio_fI30.max() < 1.0001)
         self.assertTrue(ratio_fI28.min() > 0.9999 and ratio_fI28.max() < 1.0001)
 
+    def test_double32_truncated(self):
+        t = uproot.open("tests/samples/demo-double32.root")["T"]
+        fD64 = t.array("fD64")
+        for numbits in 14, 12, 10, 8, 6, 4, 2:
+            fR = t.array("fR{0}".format(numbits))
+            self.assertEqual(fR.dtype, numpy.dtype(numpy.float64))
+            self.assertTrue(numpy.all(abs(fR - fD64) <= abs(fD64) * 2.0**-(numbits + 1)))
+            self.assertEqual(fR[3:7].tolist(), t.array("fR{0}".format(numbits), entrystart=3, entrystop=7).tolist())
+
+    def test_float16(self):
+        t = uproot.open("tests/samples/demo-double32.root")["T"]
+        fR12 = t.array("fR12")
+        as16 = t.array("fR12", uproot.interp.asfloat16(0.0, 0.0, 12))
+        self.assertEqual(as16.dtype, numpy.dtype(numpy.float32))
+        self.assertEqual(as16.tolist(), fR12.astype(numpy.float32).tolist())
+        fI16 = t.array("fI16", uproot.interp.asfloat16(-numpy.pi, numpy.pi, 16))
+        self.assertEqual(fI16.dtype, numpy.dtype(numpy.float32))
+        self.assertTrue(numpy.allclose(fI16, t.array("fI16"), atol=1e-6))
+
+    def test_narrowing(self):
+        t = uproot.open("tests/samples/sample-6.10.05-uncompressed.root")["sample"]
+        i4 = t.array("i8", t["i8"].interpretation.to("i4", checkoverflow=True))
+        self.assertEqual(i4.dtype, numpy.dtype(numpy.int32))
+        self.assertEqual(i4.tolist(), t.array("i8").tolist())
+        f4 = t.array("f8", t["f8"].interpretation.to("f4", checkoverflow=True))
+        self.assertEqual(f4.dtype, numpy.dtype(numpy.float32))
+        self.assertEqual(f4.tolist(), t.array("f8").astype(numpy.float32).tolist())
+        Ai2 = t.array("Ai8", t["Ai8"].interpretation.to("i2", checkoverflow=True))
+        self.assertEqual(Ai2.content.dtype, numpy.dtype(numpy.int16))
+        self.assertEqual(Ai2.tolist(), t.array("Ai8").tolist())
+        self.assertRaises(ValueError, lambda: t.array("i8", t["i8"].interpretation.to("u1", checkoverflow=True)))
+        self.assertEqual(t.array("i8", t["i8"].interpretation.to("u1")).dtype, numpy.dtype(numpy.uint8))
+
+        # an unchecked read in the cache does not satisfy a checked read
+        cache = {}
+        t.array("i8", t["i8"].interpretation.to("u1"), cache=cache)
+        self.assertRaises(ValueError, lambda: t.array("i8", t["i8"].interpretation.to("u1", checkoverflow=True), cache=cache))
+        self.assertFalse(t["i8"].interpretation.to("u1").compatible(t["i8"].interpretation.to("u1", checkoverflow=True)))
+
+    def test_zerocopy(self):
+        t = uproot.open("tests/samples/sample-6.10.05-uncompressed.root")["sample"]
+        interpretation = t["i8"].interpretation.to(">i8")
+        view = t.array("i8", interpretation, entrystart=3, entrystop=6, copy=False)
+        self.assertEqual(view.tolist(), [-12, -11, -10])
+        self.assertFalse(view.flags.writeable)
+        self.assertFalse(view.flags.owndata)
+        self.assertEqual(t.array("i8", interpretation, copy=False).tolist(), t.array("i8").tolist())
+        self.assertTrue(t.array("i8", copy=False).flags.writeable)   # needs a byte-swap, so it is a copy
+
+        cache = {}
+        t.array("i8", interpretation, entrystart=3, entrystop=6, copy=False, cache=cache)
+        copied = t.array("i8", interpretation, entrystart=3, entrystop=6, cache=cache)
+        self.assertTrue(copied.flags.writeable)
+        self.assertEqual(copied.tolist(), [-12, -11, -10])
+
+        lazy = t.lazyarray("u1", copy=False)
+        self.assertFalse(lazy[3:6].flags.writeable)
+        self.assertEqual(lazy[3:6].tolist(), [3, 4, 5])
+        self.assertEqual(lazy[1:8].tolist(), list(range(1, 8)))
+
     ###################################################### basket
 
     def test_flat_basket(self):
@@ -431,6 +511,330 @@ class TestTree(unittest.TestCase):
             i += 1
             if i > 30: i = 0
 
+    def test_tree_iterator_prefetch(self):
+        try:
+            from concurrent.futures import ThreadPoolExecutor
+        except ImportError:
+            return
+
+        tree = uproot.open("tests/samples/sample-6.10.05-zlib.root")["sample"]
+        expectation = [(start, stop, arrays[b"Af8"].tolist(), arrays[b"str"].tolist()) for start, stop, arrays in tree.iterate(["Af8", "str"], 4, reportentries=True)]
+
+        with ThreadPoolExecutor(2) as executor:
+            for prefetch in 1, 2, 10:
+                self.assertEqual([(start, stop, arrays[b"Af8"].tolist(), arrays[b"str"].tolist()) for start, stop, arrays in tree.iterate(["Af8", "str"], 4, reportentries=True, executor=executor, prefetch=prefetch)], expectation)
+
+            iterator = tree.iterate(["Af8", "str"], 4, executor=executor, prefetch=3)
+            for i, arrays in enumerate(iterator):
+                if i == 2:
+                    break
+            iterator.close()
+
+        # baskets of prefetched steps that have not started are cancelled when the iteration stops
+        class Counting(ThreadPoolExecutor):
+            def __init__(self):
+                super(Counting, self).__init__(1)
+                self.numrun = 0
+            def submit(self, fn, *args, **kwds):
+                def run(*args, **kwds):
+                    time.sleep(0.001)
+                    self.numrun += 1
+                    return fn(*args, **kwds)
+                return super(Counting, self).submit(run, *args, **kwds)
+
+        with Counting() as executor:
+            for arrays in tree.iterate(["Af8", "str"], 4, executor=executor, prefetch=10):
+                pass
+        total = executor.numrun
+        with Counting() as executor:
+            for arrays in tree.iterate(["Af8", "str"], 4, executor=executor, prefetch=10):
+                break
+        self.assertTrue(executor.numrun < total)
+
+        self.assertRaises(ValueError, lambda: list(tree.iterate("Af8", 4, prefetch=1)))
+
+    def test_tree_iterator_releases_baskets(self):
+        tree = uproot.open("tests/samples/sample-6.10.05-zlib.root")["sample"]
+        expectation = tree.arrays(["Af8", "i4", "str"])
+
+        with basketsread() as recorder:
+            for start, stop, arrays in tree.iterate(["Af8", "i4", "str"], 4, reportentries=True):
+                for name in expectation:
+                    self.assertEqual(arrays[name].tolist(), expectation[name][start:stop].tolist())
+                # only baskets that continue past this step are still held
+                held = set(recorder.read[-1][2])
+                needed = set(branch._basketcachekey(i) for branch in (tree["Af8"], tree["i4"], tree["str"]) for i in range(branch.numbaskets) if branch.basket_entrystart(i) < stop < branch.basket_entrystop(i))
+                self.assertTrue(held.issubset(needed))
+
+    def test_clusters(self):
+        tree = uproot.open("tests/samples/sample-6.10.05-zlib.root")["sample"]
+        self.assertEqual(list(tree.clusters(["i4"])), [(0, 7), (7, 14), (14, 21), (21, 28), (28, 30)])
+        self.assertEqual(list(tree.clusters(["i4", "f8"])), [(0, 21), (21, 30)])
+        self.assertEqual(list(tree.clusters(["i4", "f8"], entrystart=3, entrystop=25)), [(0, 21), (21, 30)])
+        self.assertEqual(list(tree.clusters(["i4", "f8"], entrystart=0, entrystop=25, strict=True)), [(0, 21)])
+        self.assertEqual(list(tree.clusters(["i4", "f8"], entrystart=21, entrystop=30)), [(21, 30)])
+
+    def test_tree_iterator_bytes(self):
+        tree = uproot.open("tests/samples/HZZ-zlib.root")["events"]
+        expectation = tree.arrays(["Jet_Px", "NJet", "EventWeight"])
+
+        steps = list(tree.iterate(["Jet_Px", "NJet", "EventWeight"], "5 kB", reportentries=True))
+        self.assertTrue(len(steps) > 10)
+        self.assertEqual(steps[0][0], 0)
+        self.assertEqual(steps[-1][1], tree.numentries)
+        for (start, stop, arrays), (nextstart, nextstop, nextarrays) in zip(steps[:-1], steps[1:]):
+            self.assertEqual(stop, nextstart)
+        for start, stop, arrays in steps:
+            numbytes = arrays[b"NJet"].nbytes + arrays[b"EventWeight"].nbytes + arrays[b"Jet_Px"].content.nbytes + arrays[b"Jet_Px"].starts.nbytes + arrays[b"Jet_Px"].stops.nbytes
+            self.assertTrue(numbytes < 1.5 * 5 * 1024)
+            for name in expectation:
+                self.assertEqual(arrays[name].tolist(), expectation[name][start:stop].tolist())
+
+        # steps that cover several baskets stop at basket boundaries
+        tree = uproot.open("tests/samples/sample-6.10.05-zlib.root")["sample"]
+        boundaries = set(tree["i4"]._entryoffsets).union(set(tree["f8"]._entryoffsets))
+        steps = [(start, stop) for start, stop, arrays in tree.iterate(["i4", "f8"], "100 B", reportentries=True)]
+        self.assertEqual(steps, [(0, 7), (7, 15), (15, 21), (21, 28), (28, 30)])
+        self.assertTrue(all(stop in boundaries for start, stop in steps))
+
+        self.assertRaises(ValueError, lambda: list(tree.iterate("i4", "100")))
+        self.assertEqual([(start, stop) for start, stop, arrays in tree.iterate(["i4", "f8"], u"100 B", reportentries=True)], steps)
+        self.assertEqual([(start, stop) for start, stop, arrays in tree.iterate(["i4", "f8"], b"100 B", reportentries=True)], steps)
+
+    def test_sparse_entries(self):
+        tree = uproot.open("tests/samples/sample-6.10.05-zlib.root")["sample"]
+        expectation = tree.arrays(["i4", "Ai8", "str"])
+        entries = [25, 3, 4, -1, 3]
+
+        arrays = tree.arrays(["i4", "Ai8", "str"], entries=entries)
+        for name in expectation:
+            self.assertEqual(arrays[name].tolist(), [expectation[name].tolist()[i] for i in [3, 4, 25, 29]])
+
+        mask = numpy.zeros(tree.numentries, dtype=numpy.bool_)
+        mask[[3, 4, 25, 29]] = True
+        self.assertEqual(tree.array("Ai8", entries=mask).tolist(), arrays[b"Ai8"].tolist())
+        self.assertEqual(tree.array("Ai8", entries=mask, entrystart=4, entrystop=29).tolist(), arrays[b"Ai8"][1:3].tolist())
+        self.assertEqual(tree.array("i4", entries=[]).tolist(), [])
+
+        # only the baskets containing selected entries are read
+        branch = tree["i4"]
+        with basketsread() as recorder:
+            branch.array(entries=[3, 4, 25, 29])
+        self.assertEqual(recorder.baskets(b"i4"), set(int(numpy.searchsorted(branch._entryoffsets, i, side="right")) - 1 for i in [3, 4, 25, 29]))
+
+        steps = list(tree.iterate(["i4", "Ai8", "str"], 10, entries=[3, 4, 25, 29], reportentries=True))
+        self.assertEqual([(start, stop) for start, stop, arrays in steps], [(0, 10), (20, 30)])
+        self.assertEqual([arrays[b"i4"].tolist() for start, stop, arrays in steps], [[expectation[b"i4"][3], expectation[b"i4"][4]], [expectation[b"i4"][25], expectation[b"i4"][29]]])
+
+        nooffsets = uproot.open("tests/samples/small-dy-nooffsets.root")["tree"]
+        withoffsets = uproot.open("tests/samples/small-dy-withoffsets.root")["tree"]
+        self.assertEqual(nooffsets.array("Jet_pt", entries=[0, 17, 398, 399, 400]).tolist(), withoffsets.array("Jet_pt", entries=[0, 17, 398, 399, 400]).tolist())
+
+        self.assertRaises(IndexError, lambda: tree.array("i4", entries=[30]))
+        self.assertRaises(ValueError, lambda: tree.array("i4", entries=[True, False]))
+
+    def test_cut(self):
+        tree = uproot.open("tests/samples/HZZ-zlib.root")["events"]
+        expectation = tree.arrays(["NJet", "Jet_Px", "EventWeight"])
+        passing = [i for i, n in enumerate(expectation[b"NJet"]) if n >= 3]
+
+        arrays = tree.arrays(["Jet_Px", "EventWeight"], cut=("NJet", lambda arrays: arrays[b"NJet"] >= 3))
+        self.assertEqual(set(arrays), set([b"Jet_Px", b"EventWeight"]))
+        for name in arrays:
+            self.assertEqual(arrays[name].tolist(), [expectation[name].tolist()[i] for i in passing])
+
+        arrays = tree.arrays("EventWeight", entrystart=100, entrystop=2000, entries=numpy.arange(0, 2421, 2), cut=("NJet", lambda arrays: arrays[b"NJet"] >= 3))
+        self.assertEqual(arrays[b"EventWeight"].tolist(), [expectation[b"EventWeight"][i] for i in passing if 100 <= i < 2000 and i % 2 == 0])
+
+        steps = list(tree.iterate(["Jet_Px", "EventWeight"], 500, cut=("NJet", lambda arrays: arrays[b"NJet"] >= 3), reportentries=True))
+        self.assertEqual(sum(len(arrays[b"Jet_Px"]) for start, stop, arrays in steps), len(passing))
+        for start, stop, arrays in steps:
+            self.assertEqual(arrays[b"Jet_Px"].tolist(), [expectation[b"Jet_Px"].tolist()[i] for i in passing if start <= i < stop])
+
+        # a basket without any passing entry is not read
+        tree = uproot.open("tests/samples/sample-6.10.05-zlib.root")["sample"]
+        with basketsread() as recorder:
+            arrays = tree.arrays("f8", cut=("i4", lambda arrays: arrays[b"i4"] == -14))
+        self.assertEqual(len(arrays[b"f8"]), 1)
+        self.assertEqual(recorder.baskets(b"f8"), set([tree["f8"]._basketstartstop(1, 2)[0]]))
+
+        # a branch in both the cut and the output is read once
+        expectation = tree.arrays(["i4", "Ai8", "str"])
+        passing = [i for i, x in enumerate(expectation[b"i4"]) if x % 3 == 0]
+        for reused, branches in [(True, ["i4", "Ai8", "str"]), (True, "i4"), (False, {"i4": uproot.interp.asdtype(">i4", ">i8")})]:
+            with basketsread() as recorder:
+                arrays = tree.arrays(branches, cut=(["i4", "Ai8"], lambda arrays: arrays[b"i4"] % 3 == 0))
+            for name in arrays:
+                self.assertEqual(arrays[name].tolist(), [expectation[name].tolist()[i] for i in passing])
+            self.assertEqual(len([x for x in recorder.read if x[0] == b"i4"]) == tree["i4"].numbaskets, reused)
+        with basketsread() as cutonly:
+            list(tree.iterate("f8", 10, cut=(["i4", "Ai8"], lambda arrays: arrays[b"i4"] % 3 == 0)))
+        with basketsread() as recorder:
+            steps = list(tree.iterate(["f8", "Ai8"], 10, cut=(["i4", "Ai8"], lambda arrays: arrays[b"i4"] % 3 == 0), reportentries=True))
+        self.assertEqual(len([x for x in recorder.read if x[0] == b"Ai8"]), len([x for x in cutonly.read if x[0] == b"Ai8"]))
+        for start, stop, arrays in steps:
+            self.assertEqual(arrays[b"Ai8"].tolist(), [expectation[b"Ai8"].tolist()[i] for i in passing if start <= i < stop])
+
+        self.assertRaises(TypeError, lambda: tree.arrays("f8", cut=lambda arrays: arrays[b"i4"] > 0))
+        self.assertRaises(ValueError, lambda: tree.arrays("f8", cut=("i4", lambda arrays: arrays[b"i4"])))
+
+    def test_formula(self):
+        tree = uproot.open("tests/samples/HZZ-zlib.root")["events"]
+        expectation = tree.arrays(["NJet", "MET_px", "MET_py", "Jet_Px", "Jet_Py", "EventWeight"])
+
+        arrays = tree.arrays(["NJet", "sqrt(MET_px**2 + MET_py**2)", "NJet >= 2 and not NJet > 3", "hypot(Jet_Px, Jet_Py) * EventWeight"], outputtype=tuple)
+        self.assertEqual(len(arrays), 4)
+        self.assertEqual(arrays[0].tolist(), expectation[b"NJet"].tolist())
+        self.assertTrue(numpy.allclose(arrays[1], numpy.sqrt(expectation[b"MET_px"]**2 + expectation[b"MET_py"]**2)))
+        self.assertEqual(arrays[2].tolist(), ((expectation[b"NJet"] >= 2) & (expectation[b"NJet"] <= 3)).tolist())
+        self.assertEqual(arrays[3].starts.tolist(), expectation[b"Jet_Px"].starts.tolist())
+        self.assertTrue(numpy.allclose(arrays[3].content, numpy.hypot(expectation[b"Jet_Px"].content, expectation[b"Jet_Py"].content) * numpy.repeat(expectation[b"EventWeight"], expectation[b"NJet"])))
+
+        flat = tree.arrays(["Jet_Px + Jet_Py"], flatten=True)[b"Jet_Px + Jet_Py"]
+        self.assertTrue(numpy.allclose(flat, expectation[b"Jet_Px"].content + expectation[b"Jet_Py"].content))
+
+        for start, stop, arrays in tree.iterate(["MET_px - MET_py", "NJet"], 1000, reportentries=True):
+            self.assertEqual(set(arrays), set([b"MET_px - MET_py", b"NJet"]))
+            self.assertTrue(numpy.allclose(arrays[b"MET_px - MET_py"], expectation[b"MET_px"][start:stop] - expectation[b"MET_py"][start:stop]))
+
+        tree.aliases = {b"met": b"TMath::Sqrt(MET_px*MET_px + MET_py*MET_py)", b"twoorthree": b"NJet >= 2 && !(NJet > 3)"}
+        arrays = tree.arrays(["met", "twoorthree"])
+        self.assertTrue(numpy.allclose(arrays[b"met"], numpy.sqrt(expectation[b"MET_px"]**2 + expectation[b"MET_py"]**2)))
+        self.assertEqual(arrays[b"twoorthree"].tolist(), ((expectation[b"NJet"] >= 2) & (expectation[b"NJet"] <= 3)).tolist())
+
+        # "!" binds as tightly as in C: (!NJet) > 1 and (!NJet) + 1
+        arrays = tree.arrays(["!NJet > 0", "!NJet + 1", "!(NJet > 1)", "NJet != 1"])
+        self.assertEqual(arrays[b"!NJet > 0"].tolist(), (expectation[b"NJet"] == 0).tolist())
+        self.assertEqual(arrays[b"!NJet + 1"].tolist(), numpy.where(expectation[b"NJet"] == 0, 2, 1).tolist())
+        self.assertEqual(arrays[b"!(NJet > 1)"].tolist(), (expectation[b"NJet"] <= 1).tolist())
+        self.assertEqual(arrays[b"NJet != 1"].tolist(), (expectation[b"NJet"] != 1).tolist())
+        self.assertEqual(tree.arrays(["!NJet > 1"])[b"!NJet > 1"].tolist(), [False] * tree.numentries)
+
+        self.assertRaises(KeyError, lambda: tree.arrays(["NoSuchBranch + 1"]))
+
+    def test_formula_numexpr(self):
+        try:
+            import numexpr
+        except ImportError:
+            return
+        from uproot._formula import Formula
+
+        # logical operators on integers are logical, not bitwise, with numexpr as with NumPy
+        x = numpy.array([0, 1, 2, 3, 0, 2], dtype=numpy.int32)
+        y = numpy.array([0, 2, 1, 0, 5, 2], dtype=numpy.int64)
+        z = numpy.array([0.0, 0.5, -1.0, 2.0, 0.0, 3.0])
+        for expression in ["x and y", "x or y", "not x", "not x + 1", "!x", "!x > 0", "!x + 1", "x && y", "x || z", "!(x > 1) && y", "x and y > 1 or not z", "0 < x < y", "not (x and z)", "x + y * z"]:
+            formula = Formula(expression)
+            self.assertTrue(formula._numexpr is not None)
+            arrays = [{"x": x, "y": y, "z": z}[name] for name in formula.inputs]
+            fromnumpy = eval(formula._numpy, {"numpy": numpy}, {"_inputs": arrays})
+            fromnumexpr = numexpr.evaluate(formula._numexpr, local_dict=dict(("_{0}".format(i), array) for i, array in enumerate(arrays)), global_dict={})
+            self.assertEqual(fromnumexpr.tolist(), fromnumpy.tolist(), expression)
+
+    def test_reduce(self):
+        try:
+            from concurrent.futures import ThreadPoolExecutor
+        except ImportError:
+            return
+        paths = ["tests/samples/HZZ-zlib.root", "tests/samples/HZZ.root"]
+        expectation = [uproot.open(path)["events"].arrays(["NJet", "Jet_Px", "MET_px", "EventWeight"]) for path in paths]
+        def concatenate(name):
+            return numpy.concatenate([x[name].content if isinstance(x[name], uproot.interp.jagged.JaggedArray) else x[name] for x in expectation])
+
+        for executor in [None, ThreadPoolExecutor(4)]:
+            result = uproot.reduce(paths, "events", ["NJet", "Jet_Px", "MET_px"], uproot.reducers.Sum(), executor=executor)
+            self.assertEqual(result[b"NJet"], concatenate(b"NJet").sum())
+            self.assertAlmostEqual(result[b"Jet_Px"], concatenate(b"Jet_Px").sum(), places=2)
+            self.assertAlmostEqual(result[b"MET_px"], concatenate(b"MET_px").sum(), places=2)
+
+            result = uproot.reduce(paths, "events", ["NJet", "MET_px"], uproot.reducers.Count(), entrysteps=500, executor=executor)
+            self.assertEqual(result, {b"NJet": 2 * 2421, b"MET_px": 2 * 2421})
+
+            result = uproot.reduce(paths, "events", "Jet_Px", uproot.reducers.Min(), executor=executor)
+            self.assertEqual(result[b"Jet_Px"], concatenate(b"Jet_Px").min())
+            result = uproot.reduce(paths, "events", "Jet_Px", uproot.reducers.Max(), executor=executor)
+            self.assertEqual(result[b"Jet_Px"], concatenate(b"Jet_Px").max())
+
+            result = uproot.reduce(paths, "events", "MET_px", uproot.reducers.Hist(10, -100, 100, weight="EventWeight"), entrysteps=300, executor=executor)
+            self.assertEqual(set(result), set([b"MET_px"]))
+            counts, edges = numpy.histogram(concatenate(b"MET_px"), bins=10, range=(-100, 100), weights=concatenate(b"EventWeight"))
+            self.assertTrue(numpy.allclose(result[b"MET_px"].numpy[0], counts))
+
+            # custom mapper and combiner, with a cut
+            result = uproot.reduce(paths, "events", "NJet", lambda arrays: len(arrays[b"NJet"]), lambda one, two: one + two, cut=("NJet", lambda arrays: arrays[b"NJet"] >= 3), executor=executor)
+            self.assertEqual(result, (concatenate(b"NJet") >= 3).sum())
+
+            # a reducer's own branch is reduced too if it was requested
+            result = uproot.reduce(paths, "events", ["MET_px", "EventWeight"], uproot.reducers.Hist(10, -100, 100, weight="EventWeight"), executor=executor)
+            self.assertEqual(set(result), set([b"MET_px", b"EventWeight"]))
+            self.assertTrue(numpy.allclose(result[b"MET_px"].numpy[0], counts))
+
+            # fewer open files give the same results; every file is closed, and no more than parallelfiles are open at a time
+            sources = []
+            def localsource(path):
+                sources.append(uproot.source.memmap.MemmapSource(path))
+                if executor is not None:
+                    self.assertTrue(sum(source._source is not None for source in sources) <= 2)
+                return sources[-1]
+            result = uproot.reduce(paths + paths, "events", ["NJet", "MET_px"], uproot.reducers.Count(), entrysteps=500, executor=executor, parallelfiles=1)
+            self.assertEqual(result, {b"NJet": 4 * 2421, b"MET_px": 4 * 2421})
+            result = uproot.reduce(paths + paths[:1], "events", "Jet_Px", uproot.reducers.Max(), entrysteps=500, executor=executor, localsource=localsource, parallelfiles=2)
+            self.assertEqual(result[b"Jet_Px"], concatenate(b"Jet_Px").max())
+            self.assertEqual(len(sources), 3)
+            self.assertTrue(all(source._source is None for source in sources))
+
+        self.assertRaises(TypeError, lambda: uproot.reduce(paths, "events", "NJet", lambda arrays: len(arrays[b"NJet"])))
+        self.assertRaises(ValueError, lambda: uproot.reduce(paths, "events", "NJet", uproot.reducers.Sum(), parallelfiles=0))
+        self.assertEqual(uproot.reduce(paths, "events", "NJet", uproot.reducers.Sum(), entrysteps=[]), None)
+
+    def test_iterate_parallelfiles(self):
+        try:
+            import concurrent.futures
+        except ImportError:
+            return
+        paths = ["tests/samples/HZZ-zlib.root", "tests/samples/HZZ.root", "tests/samples/HZZ-uncompressed.root", "tests/samples/HZZ-lzma.root"]
+        expectation = list(uproot.iterate(paths, "events", ["NJet", "Jet_Px"], entrysteps=1000, reportentries=True))
+
+        steps = list(uproot.iterate(paths, "events", ["NJet", "Jet_Px"], entrysteps=1000, reportentries=True, parallelfiles=3))
+        self.assertEqual([(start, stop) for start, stop, arrays in steps], [(start, stop) for start, stop, arrays in expectation])
+        for (start, stop, arrays), (start2, stop2, arrays2) in zip(steps, expectation):
+            self.assertEqual(arrays[b"NJet"].tolist(), arrays2[b"NJet"].tolist())
+            self.assertEqual(arrays[b"Jet_Px"].tolist(), arrays2[b"Jet_Px"].tolist())
+
+        # in completion order, every step is still reported with its own entry numbers
+        steps = list(uproot.iterate(paths, "events", "NJet", entrysteps=1000, reportentries=True, parallelfiles=4, ordered=False))
+        self.assertEqual(sorted((start, stop) for start, stop, arrays in steps), [(start, stop) for start, stop, arrays in expectation])
+        byentries = dict(((start, stop), arrays) for start, stop, arrays in expectation)
+        for start, stop, arrays in steps:
+            self.assertEqual(arrays[b"NJet"].tolist(), byentries[start, stop][b"NJet"].tolist())
+
+        steps = list(uproot.iterate(paths, "events", "NJet", parallelfiles=2, blocking=False))
+        self.assertEqual(sum(len(arrays()[b"NJet"]) for arrays in steps), 4 * 2421)
+
+        # breaking out early leaves no files waiting
+        for arrays in uproot.iterate(paths, "events", "NJet", entrysteps=100, parallelfiles=2):
+            break
+
+        # no more than parallelfiles files are opened while the consumer is still in the first one
+        opened = []
+        original = uproot.rootio.open
+        def counting(path, *args, **kwds):
+            opened.append(path)
+            return original(path, *args, **kwds)
+        uproot.rootio.open = counting
+        try:
+            steps = uproot.iterate(paths, "events", "NJet", entrysteps=1000, parallelfiles=2)
+            next(steps)
+            time.sleep(0.5)
+            self.assertEqual(opened, paths[:2])
+            self.assertEqual(sum(len(arrays[b"NJet"]) for arrays in steps), 4 * 2421 - 1000)
+            self.assertEqual(opened, paths)
+        finally:
+            uproot.rootio.open = original
+
+        self.assertRaises(ValueError, lambda: list(uproot.iterate(paths, "events", "NJet", parallelfiles=0)))
+        self.assertRaises(KeyError, lambda: list(uproot.iterate(paths + ["tests/samples/sample-6.10.05-zlib.root"], "events", "NJet", parallelfiles=2, ordered=False)))
+
     def test_directories(self):
         file = uproot.open("tests/samples/nesteddirs.root")
 
@@ -607,4 +1011,160 @@ class TestTree(unittest.TestCase):
                  1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 2.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0,
                  1.0, 0.0, 0.0, 0.0, 1.0, 2.0, 3.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0,
                  0.0, 0.0, 1.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0]
-        self.assertEqual(tree.array("fH")[20].values, check)
\ No newline at end of file
+        self.assertEqual(tree.array("fH")[20].values, check)
+
+    def test_pipeline(self):
+        tree = uproot.open("tests/samples/HZZ-zlib.root")["events"]
+        expectation = tree.arrays(["Jet_Px", "Muon_Px", "NJet", "EventWeight"])
+
+        with uproot.pipeline.Pipeline(io=1, decompress=2, interpret=2, queuesize=1) as pipeline:
+            arrays = tree.arrays(["Jet_Px", "Muon_Px", "NJet", "EventWeight"], executor=pipeline)
+            for name in expectation:
+                self.assertEqual(arrays[name].tolist(), expectation[name].tolist())
+
+            self.assertEqual([x[b"NJet"].tolist() for x in tree.iterate("NJet", 1000, executor=pipeline)],
+                             [expectation[b"NJet"][i : i + 1000].tolist() for i in range(0, tree.numentries, 1000)])
+
+            timings = pipeline.timings
+            self.assertEqual(set(timings), set(["io", "decompress", "interpret"]))
+            self.assertTrue(all(x["tasks"] > 0 for x in timings.values()))
+            self.assertTrue(timings["decompress"]["seconds"] > 0)
+
+            self.assertRaises(ValueError, lambda: tree.array("Jet_Px", uproot.interp.asdtype(">f8"), executor=pipeline))
+
+    def test_processpool(self):
+        try:
+            from concurrent.futures import ProcessPoolExecutor
+            from multiprocessing import shared_memory
+        except ImportError:
+            return
+
+        tree = uproot.open("tests/samples/small-evnt-tree-fullsplit.root")["tree"]
+        with ProcessPoolExecutor(2) as executor:
+            for name in ["Str", "StlVecStr", "StlVecU32", "SliceI16", "I32"]:
+                self.assertEqual(tree.array(name, executor=executor).tolist(), tree.array(name).tolist())
+                self.assertEqual(tree.array(name, entrystart=3, entrystop=77, executor=executor).tolist(), tree.array(name, entrystart=3, entrystop=77).tolist())
+
+            tree = uproot.open("tests/samples/HZZ-zlib.root")["events"]
+            expectation = tree.array("Jet_Px")
+            self.assertEqual([x.tolist() for (x,) in tree.iterate("Jet_Px", 1000, outputtype=tuple, executor=executor)],
+                             [expectation[i : i + 1000].tolist() for i in range(0, tree.numentries, 1000)])
+
+            # shared memory is released when the workers finish, even if the result is never waited on
+            shm = "/dev/shm"
+            before = set(os.listdir(shm)) if os.path.isdir(shm) else set()
+            tree.array("Jet_Px", executor=executor, blocking=False)
+            for x in tree.iterate("Jet_Px", 100, executor=executor, prefetch=3):
+                break
+
+        if os.path.isdir(shm):
+            self.assertEqual(set(os.listdir(shm)) - before, set())
+
+    def test_threadpool_schedule(self):
+        try:
+            from concurrent.futures import ThreadPoolExecutor
+        except ImportError:
+            return
+
+        tree = uproot.open("tests/samples/HZZ-zlib.root")["events"]
+        expectation = tree.arrays(["Jet_Px", "Muon_Px", "NJet", "EventWeight"], entrystart=100, entrystop=1900)
+
+        with ThreadPoolExecutor(3) as executor:
+            arrays = tree.arrays(["Jet_Px", "Muon_Px", "NJet", "EventWeight"], entrystart=100, entrystop=1900, executor=executor)
+            for name in expectation:
+                self.assertEqual(arrays[name].tolist(), expectation[name].tolist())
+
+            arrays = tree.arrays(["Jet_Px", "Muon_Px", "NJet", "EventWeight"], entrystart=100, entrystop=1900, executor=executor, blocking=False)()
+            for name in expectation:
+                self.assertEqual(arrays[name].tolist(), expectation[name].tolist())
+
+            self.assertRaises(ValueError, lambda: tree.arrays({"Jet_Px": uproot.interp.asdtype(">f8")}, executor=executor))
+
+        # an executor that stops accepting tasks fails the remaining ones instead of leaving them waiting
+        class Failing(ThreadPoolExecutor):
+            def __init__(self, accept):
+                super(Failing, self).__init__(2)
+                self.accept = accept
+            def submit(self, *args, **kwds):
+                self.accept -= 1
+                if self.accept < 0:
+                    raise RuntimeError("executor is shut down")
+                return super(Failing, self).submit(*args, **kwds)
+
+        for accept in [0, 2]:
+            with Failing(accept) as executor:
+                self.assertRaises(RuntimeError, lambda: tree.arrays(["Jet_Px", "Muon_Px", "NJet", "EventWeight"], executor=executor))
+
+        # at most limit tasks are on the executor before the first one finishes
+        class Gated(ThreadPoolExecutor):
+            def __init__(self, max_workers):
+                super(Gated, self).__init__(max_workers)
+                self.max_workers = max_workers
+                self.gate = threading.Event()
+                self.submitted = 0
+            def submit(self, function, *args):
+                self.submitted += 1
+                return super(Gated, self).submit(lambda: self.gate.wait() and function(*args))
+
+        for limit, expected in [(2, 2), (None, 3)]:
+            with Gated(3) as executor:
+                wait = tree.arrays(["Jet_Px", "Muon_Px", "NJet", "EventWeight"], executor=executor, blocking=False, limit=limit)
+                self.assertEqual(executor.submitted, expected)
+                executor.gate.set()
+                self.assertEqual(wait()[b"Jet_Px"].tolist(), tree.array("Jet_Px").tolist())
+
+        self.assertRaises(ValueError, lambda: tree.arrays("NJet", limit=0))
+
+    def test_bulk_keys(self):
+        tree = uproot.open("tests/samples/small-evnt-tree-fullsplit.root")["tree"]
+        for branch in tree.values():
+            numbaskets = branch._numgoodbaskets
+            keycache = {}
+            bulk = list(branch._threadsafe_iterate_keys(keycache, True, 0, numbaskets))
+            self.assertEqual(len(keycache), numbaskets)
+            for i, key in enumerate(bulk):
+                expectation = branch._basketkey(branch._source, i, True)
+                for attr in ["fNbytes", "fVersion", "fObjlen", "fKeylen", "fSeekKey", "fBufferSize", "fNevBuf", "fLast", "border"]:
+                    self.assertEqual(getattr(key, attr), getattr(expectation, attr))
+                self.assertEqual(key.basketdata().tolist(), expectation.basketdata().tolist())
+
+    def test_basketstartstop(self):
+        branch = uproot.open("tests/samples/foriter.root")["foriter"]["data"]
+        numentries = branch.numentries
+        for entrystart in range(numentries + 1):
+            for entrystop in range(entrystart, numentries + 2):
+                overlapping = [i for i in range(branch.numbaskets) if entrystart < branch.basket_entrystop(i) and branch.basket_entrystart(i) < entrystop]
+                if len(overlapping) == 0:
+                    self.assertEqual(branch._basketstartstop(entrystart, entrystop), (None, None))
+                else:
+                    self.assertEqual(branch._basketstartstop(entrystart, entrystop), (overlapping[0], overlapping[-1] + 1))
+
+    def test_nooffsets_shared_counts(self):
+        withoffsets = uproot.open("tests/samples/small-dy-withoffsets.root")["tree"]
+        nooffsets = uproot.open("tests/samples/small-dy-nooffsets.root")["tree"]
+        for entrystart, entrystop in [(0, 501), (250, 450), (398, 399), (399, 401)]:
+            self.assertEqual(nooffsets.array("Jet_pt", entrystart=entrystart, entrystop=entrystop).tolist(), withoffsets.array("Jet_pt", entrystart=entrystart, entrystop=entrystop).tolist())
+
+        expectation = withoffsets.arrays(["Jet_pt", "Jet_jetId"], entrystart=150, entrystop=450)
+        arrays = nooffsets.arrays(["Jet_pt", "Jet_jetId"], entrystart=150, entrystop=450)
+        for name in expectation:
+            self.assertEqual(arrays[name].tolist(), expectation[name].tolist())
+
+        for x, y in zip(nooffsets.iterate(["Jet_pt", "Muon_pt"], 150), withoffsets.iterate(["Jet_pt", "Muon_pt"], 150)):
+            for name in x:
+                self.assertEqual(x[name].tolist(), y[name].tolist())
+
+    def test_sharedoffsets(self):
+        tree = uproot.open("tests/samples/small-dy-withoffsets.root")["tree"]
+        expectation = tree.arrays(["Jet_pt", "Jet_jetId", "Muon_pt", "Muon_charge"], entrystart=100, entrystop=450)
+        arrays = tree.arrays(["Jet_pt", "Jet_jetId", "Muon_pt", "Muon_charge"], entrystart=100, entrystop=450, sharedoffsets=True)
+        for name in expectation:
+            self.assertEqual(arrays[name].tolist(), expectation[name].tolist())
+
+        self.assertTrue(arrays[b"Jet_pt"].starts.base is arrays[b"Jet_jetId"].starts.base)
+        self.assertTrue(arrays[b"Muon_pt"].stops.base is arrays[b"Muon_charge"].stops.base)
+        self.assertFalse(arrays[b"Jet_pt"].starts.base is arrays[b"Muon_pt"].starts.base)
+
+        jet_pt, jet_jetId = arrays[b"Jet_pt"], arrays[b"Jet_jetId"]
+        jet_pt.leafcount = jet_jetId.leafcount = None
+        self.assertTrue(jet_pt.aligned(jet_jetId))
@@ -30,8 +30,9 @@
 
 # high-level entry points
 from uproot.rootio import open, xrootd
-from uproot.tree import iterate, numentries, lazyarray, lazyarrays, daskarray, daskarrays, daskframe
+from uproot.tree import iterate, reduce, numentries, lazyarray, lazyarrays, daskarray, daskarrays, daskframe
 from uproot.hist import hist
+import uproot.reducers
 
 from uproot.source.memmap import MemmapSource
 from uproot.source.file import FileSource
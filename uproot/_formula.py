@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2017, DIANA-HEP
+# All rights reserved.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# 
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# 
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import ast
+import re
+
+import numpy
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+import uproot.interp.jagged
+
+class Formula(object):
+    # an expression of branch names, compiled once into NumPy (and, where it can be, numexpr) code and evaluated per array or step
+
+    # name in the expression -> NumPy function; names in ROOT's TMath are accepted too
+    functions = {"sqrt": "sqrt", "Sqrt": "sqrt", "exp": "exp", "Exp": "exp", "log": "log", "Log": "log", "log10": "log10", "Log10": "log10", "log1p": "log1p", "expm1": "expm1",
+                 "sin": "sin", "Sin": "sin", "cos": "cos", "Cos": "cos", "tan": "tan", "Tan": "tan", "asin": "arcsin", "ASin": "arcsin", "arcsin": "arcsin", "acos": "arccos", "ACos": "arccos", "arccos": "arccos",
+                 "atan": "arctan", "ATan": "arctan", "arctan": "arctan", "atan2": "arctan2", "ATan2": "arctan2", "arctan2": "arctan2", "sinh": "sinh", "SinH": "sinh", "cosh": "cosh", "CosH": "cosh", "tanh": "tanh", "TanH": "tanh",
+                 "abs": "absolute", "fabs": "absolute", "Abs": "absolute", "pow": "power", "Power": "power", "hypot": "hypot", "Hypot": "hypot", "min": "minimum", "Min": "minimum", "max": "maximum", "Max": "maximum", "where": "where"}
+
+    # NumPy function -> numexpr function, for the functions that numexpr has
+    numexprfunctions = {"sqrt": "sqrt", "exp": "exp", "log": "log", "log10": "log10", "log1p": "log1p", "expm1": "expm1", "sin": "sin", "cos": "cos", "tan": "tan", "arcsin": "arcsin", "arccos": "arccos",
+                        "arctan": "arctan", "arctan2": "arctan2", "sinh": "sinh", "cosh": "cosh", "tanh": "tanh", "absolute": "abs", "where": "where"}
+
+    constants = {"pi": numpy.pi}
+
+    _binops = {ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/", ast.Pow: "**", ast.Mod: "%", ast.FloorDiv: "//", ast.BitAnd: "&", ast.BitOr: "|"}
+    _cmpops = {ast.Lt: "<", ast.LtE: "<=", ast.Gt: ">", ast.GtE: ">=", ast.Eq: "==", ast.NotEq: "!="}
+
+    def __init__(self, expression):
+        self.expression = expression
+
+        # C++ operators of ROOT formulas (e.g. in TTree aliases) in Python syntax
+        source = expression.replace("TMath::", "").replace("&&", " and ").replace("||", " or ").strip()
+
+        # C's "!" binds as tightly as Python's "~" (not as loosely as "not"), so it is parsed as "~" and remembered by position
+        self._nots = set()
+        for match in re.finditer(r"!(?!=)", source):
+            lines = source[:match.start()].split("\n")
+            self._nots.add((len(lines), len(lines[-1])))
+        source = re.sub(r"!(?!=)", "~", source)
+
+        try:
+            self._tree = ast.parse(source, mode="eval").body
+        except SyntaxError:
+            raise ValueError("cannot parse formula {0}".format(repr(expression)))
+
+        self.inputs = []
+        self._collect(self._tree)
+
+        self._numpy = compile(self._generate(self._tree, False), repr(expression), "eval")
+        try:
+            self._numexpr = self._generate(self._tree, True)
+        except _NotNumexpr:
+            self._numexpr = None
+
+    def __repr__(self):
+        return "Formula({0})".format(repr(self.expression))
+
+    @property
+    def isname(self):
+        # a bare name is not a formula, just a branch that may or may not exist
+        return self._dottedname(self._tree) is not None
+
+    @staticmethod
+    def _dottedname(node):
+        if isinstance(node, ast.Name):
+            return node.id
+        elif isinstance(node, ast.Attribute):
+            parent = Formula._dottedname(node.value)
+            if parent is not None:
+                return parent + "." + node.attr
+        return None
+
+    @staticmethod
+    def _number(node):
+        if hasattr(ast, "Constant") and isinstance(node, ast.Constant) and isinstance(node.value, (bool, int, float)):
+            return node.value
+        elif isinstance(node, getattr(ast, "Num", ())):
+            return node.n
+        else:
+            return None
+
+    def _collect(self, node):
+        name = self._dottedname(node)
+        if name is not None:
+            if name not in self.constants and name not in self.inputs:
+                self.inputs.append(name)
+        elif isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in self.functions or len(getattr(node, "keywords", ())) > 0:
+                raise ValueError("unrecognized function in formula {0}: {1}".format(repr(self.expression), ast.dump(node.func)))
+            for x in node.args:
+                self._collect(x)
+        else:
+            for x in ast.iter_child_nodes(node):
+                self._collect(x)
+
+    def _isnot(self, node):
+        return isinstance(node, ast.UnaryOp) and (isinstance(node.op, ast.Not) or (isinstance(node.op, ast.Invert) and (node.lineno, node.col_offset) in self._nots))
+
+    def _truth(self, node):
+        # numexpr's "&", "|" and "~" are bitwise on integers, so the operands of logical operators are made boolean first
+        if isinstance(node, (ast.Compare, ast.BoolOp)) or self._isnot(node):
+            return self._generate(node, True)
+        else:
+            return "({0} != 0)".format(self._generate(node, True))
+
+    def _generate(self, node, usenumexpr):
+        name = self._dottedname(node)
+        if name is not None:
+            if name in self.constants:
+                return repr(self.constants[name])
+            elif usenumexpr:
+                return "_{0}".format(self.inputs.index(name))
+            else:
+                return "_inputs[{0}]".format(self.inputs.index(name))
+
+        number = self._number(node)
+        if number is not None:
+            return repr(number)
+
+        if isinstance(node, ast.BinOp) and type(node.op) in self._binops:
+            if usenumexpr and isinstance(node.op, ast.FloorDiv):
+                raise _NotNumexpr
+            return "({0} {1} {2})".format(self._generate(node.left, usenumexpr), self._binops[type(node.op)], self._generate(node.right, usenumexpr))
+
+        elif self._isnot(node):
+            if usenumexpr:
+                return "(~{0})".format(self._truth(node.operand))
+            else:
+                return "numpy.logical_not({0})".format(self._generate(node.operand, usenumexpr))
+
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd, ast.Invert)):
+            return "({0}{1})".format({ast.USub: "-", ast.UAdd: "+", ast.Invert: "~"}[type(node.op)], self._generate(node.operand, usenumexpr))
+
+        elif isinstance(node, ast.BoolOp):
+            if usenumexpr:
+                return "({0})".format((" & " if isinstance(node.op, ast.And) else " | ").join(self._truth(x) for x in node.values))
+            else:
+                values = [self._generate(x, usenumexpr) for x in node.values]
+                out = values[0]
+                for x in values[1:]:
+                    out = "numpy.{0}({1}, {2})".format("logical_and" if isinstance(node.op, ast.And) else "logical_or", out, x)
+                return out
+
+        elif isinstance(node, ast.Compare) and all(type(x) in self._cmpops for x in node.ops):
+            operands = [self._generate(x, usenumexpr) for x in [node.left] + node.comparators]
+            pairs = ["({0} {1} {2})".format(operands[i], self._cmpops[type(op)], operands[i + 1]) for i, op in enumerate(node.ops)]
+            if len(pairs) == 1:
+                return pairs[0]
+            elif usenumexpr:
+                return "({0})".format(" & ".join(pairs))
+            else:
+                out = pairs[0]
+                for x in pairs[1:]:
+                    out = "numpy.logical_and({0}, {1})".format(out, x)
+                return out
+
+        elif isinstance(node, ast.Call):
+            function = self.functions[node.func.id]
+            args = ", ".join(self._generate(x, usenumexpr) for x in node.args)
+            if not usenumexpr:
+                return "numpy.{0}({1})".format(function, args)
+            elif function in self.numexprfunctions:
+                return "{0}({1})".format(self.numexprfunctions[function], args)
+            elif function == "power" and len(node.args) == 2:
+                return "({0} ** {1})".format(*[self._generate(x, usenumexpr) for x in node.args])
+            else:
+                raise _NotNumexpr
+
+        else:
+            raise ValueError("unsupported syntax in formula {0}: {1}".format(repr(self.expression), ast.dump(node)))
+
+    def __call__(self, *arrays):
+        # one array per input, in the order of self.inputs; jagged inputs must have the same number of items in every entry
+        jagged = [x for x in arrays if isinstance(x, uproot.interp.jagged.JaggedArray)]
+        if len(jagged) == 0:
+            return self._evaluate(arrays)
+
+        counts = jagged[0].stops - jagged[0].starts
+        for x in jagged[1:]:
+            if not numpy.array_equal(x.stops - x.starts, counts):
+                raise ValueError("jagged inputs of formula {0} do not have the same number of items in every entry".format(repr(self.expression)))
+        offsets = uproot.interp.jagged.sizes2offsets(counts)
+
+        # evaluate on one item per row: jagged contents in order, with each entry's value of a flat input repeated for each of its items
+        flat = []
+        for x in arrays:
+            if isinstance(x, uproot.interp.jagged.JaggedArray):
+                if len(x.starts) > 0 and numpy.array_equal(x.starts[1:], x.stops[:-1]):
+                    flat.append(x.content[x.starts[0] : x.starts[0] + offsets[-1]])
+                else:
+                    flat.append(x.content[numpy.repeat(x.starts - offsets[:-1], counts) + numpy.arange(offsets[-1])])
+            else:
+                flat.append(numpy.repeat(x, counts, axis=0))
+
+        return uproot.interp.jagged.JaggedArray(self._evaluate(flat), offsets[:-1], offsets[1:])
+
+    def _evaluate(self, arrays):
+        if numexpr is not None and self._numexpr is not None and all(isinstance(x, numpy.ndarray) and x.dtype.kind in "biuf" for x in arrays):
+            return numexpr.evaluate(self._numexpr, local_dict=dict(("_{0}".format(i), x) for i, x in enumerate(arrays)), global_dict={})
+        else:
+            return eval(self._numpy, {"numpy": numpy}, {"_inputs": arrays})
+
+class _NotNumexpr(Exception):
+    pass
@@ -419,9 +419,17 @@ tree_fragments = {
     "entrystop": u"""entrystop : ``None`` or int
         entry at which reading stops (exclusive). If ``None`` *(default)*, stop at the end of the branch.""",
 
+    # entries
+    "entries": u"""entries : ``None``, array of int, or array of bool
+        if not ``None`` *(default)*, read only these entries: an array of entry numbers (negative numbers count from the end) or a boolean mask with one value per entry. The result contains the selected entries within *entrystart* and *entrystop* in increasing order, without duplicates. Only the baskets containing selected entries are decompressed, and only the selected entries are copied into the output, so a sparse selection is much cheaper than reading everything and masking. When iterating, steps without any selected entries are skipped.""",
+
+    # cut
+    "cut": u"""cut : ``None`` or *(branches, function)*
+        if not ``None`` *(default)*, read only the entries that pass a cut: first the cut's *branches* (any of the forms accepted by *branches*) are read and passed to *function* as a ``dict`` of branch name → array, which must return a boolean mask with one value per entry. The remaining branches are then read with the passing entries as *entries*, so their baskets without any passing entry are not decompressed. Branches that are both in the cut and in the output (with the same interpretation) are not read again; their passing entries are selected from the cut's arrays. When iterating, the cut is evaluated step by step.""",
+
     # entrysteps
-    "entrysteps": u"""entrysteps : ``None``, positive int, or iterable of *(int, int)* pairs
-        if ``None`` *(default)*, iterate in steps of TTree clusters (number of entries for which all branches' baskets align); if an integer, iterate in steps of equal numbers of entries (except at the end of a file); otherwise, iterate in explicit, user-specified *(start, stop)* intervals ("start" is inclusive and "stop" is exclusive).""",
+    "entrysteps": u"""entrysteps : ``None``, positive int, str, or iterable of *(int, int)* pairs
+        if ``None`` *(default)*, iterate in steps of TTree clusters (number of entries for which all branches' baskets align); if an integer, iterate in steps of equal numbers of entries (except at the end of a file); if a memory size like ``"100 MB"`` (units ``B``, ``kB``, ``MB``, ``GB``, ``TB``, in powers of 1024), iterate in steps whose arrays, estimated from the uncompressed basket sizes of the selected branches, fit within that size, preferring to start and stop at basket boundaries; otherwise, iterate in explicit, user-specified *(start, stop)* intervals ("start" is inclusive and "stop" is exclusive).""",
 
     # branch
     "branch": u"""branch : str
@@ -437,7 +445,8 @@ tree_fragments = {
         - if a function :py:class:`TBranchMethods <uproot.tree.TBranchMethods>` \u21d2 ``None`` or :py:class:`Interpretation <uproot.interp.interp.Interpretation>`, select branches for which the function does not return ``None`` and use the interpretation it returns otherwise;
         - if a ``dict`` of str \u2192 :py:class:`Interpretation <uproot.interp.interp.Interpretation>`, select branches named by keys and use interpretations from the associated values;
         - if a list of str, select branches by name;
-        - if a single str, select a single branch. The selection by string can include filename-like glob characters (``*``, ``?``, ``[...]``) or it can be a full regular expression (Python flavored) if surrounded by slashes, like ``/pattern/i`` (where ``i`` is an optional `Python re flag <https://docs.python.org/2/library/re.html>`_).""",
+        - if a single str, select a single branch. The selection by string can include filename-like glob characters (``*``, ``?``, ``[...]``) or it can be a full regular expression (Python flavored) if surrounded by slashes, like ``/pattern/i`` (where ``i`` is an optional `Python re flag <https://docs.python.org/2/library/re.html>`_).
+        - in :py:meth:`arrays <uproot.tree.TTreeMethods.arrays>` and :py:meth:`iterate <uproot.tree.TTreeMethods.iterate>`, a str that is not a branch name may be a formula of branch names, such as ``"sqrt(px**2 + py**2)"``, using arithmetic, comparisons, ``and``/``or``/``not`` (or ``&&``/``||``/``!``, where ``!`` binds as tightly as in C), and functions like ``sqrt``, ``exp``, ``log``, ``abs``, ``atan2``, ``hypot``, ``min``, ``max``, and ``where`` (with or without ``TMath::``); the TTree's aliases that stand for formulas are evaluated the same way. Formulas are compiled once and evaluated on each array or step, with `numexpr <https://github.com/pydata/numexpr>`_ if it is installed. Their input branches are read, but not returned unless requested. Jagged inputs must have the same number of items in each entry, and flat inputs are repeated for each item.""",
 
     # outputtype
     "outputtype": u"""outputtype : type
@@ -457,7 +466,7 @@ tree_fragments = {
 
     # basketcache
     "basketcache": u"""basketcache : ``None`` or ``dict``-like object
-        if not ``None`` *(default)*, raw basket data will be saved in the ``dict``-like object for later use. Accessing the same arrays with a different interpretation or a different entry range fully utilizes this cache, since the interpretation/construction from baskets is performed after retrieving data from this cache.""",
+        if not ``None`` *(default)*, raw basket data will be saved in the ``dict``-like object for later use. Accessing the same arrays with a different interpretation or a different entry range fully utilizes this cache, since the interpretation/construction from baskets is performed after retrieving data from this cache. Baskets are keyed by file and position in the file, so the same cache may be shared among different ``TTree`` objects from the same file. If the cache has a **setcost(key, cost)** method, such as :py:class:`WeightedMemoryCache <uproot.cache.memorycache.WeightedMemoryCache>`, which keeps the baskets that were most expensive to decompress, it is called with the time (in seconds) taken to read and decompress each basket.""",
 
     # keycache
     "keycache": u"""keycache : ``None`` or ``dict``-like object
@@ -465,12 +474,20 @@ tree_fragments = {
 
     # executor
     "executor": u"""executor : `concurrent.futures.Executor <https://docs.python.org/3/library/concurrent.futures.html>`_
-        if not ``None`` *(default)*, parallelize basket-reading and decompression by scheduling tasks on the executor. Assumes caches are thread-safe.""",
+        if not ``None`` *(default)*, parallelize basket-reading and decompression by scheduling tasks on the executor. Assumes caches are thread-safe. A :py:class:`Pipeline <uproot.pipeline.Pipeline>` reads, decompresses, and interprets baskets on separately sized thread pools. A ``concurrent.futures.ProcessPoolExecutor`` (Python 3.8 or later) sends ranges of baskets to worker processes, which fill the output through ``multiprocessing.shared_memory``, for interpretations whose decoding is limited by the GIL (e.g. strings); caches are not used by the workers. Object interpretations (``asobj``, ``asobjs``, and other ``asvar`` types that cannot be pickled) only have their bytes filled by the workers; the objects are still constructed in this process.""",
 
     # blocking
     "blocking": u"""blocking : bool
         if ``True`` *(default)*, do not exit this function until the arrays are read, and return those arrays. If ``False``, exit immediately and return a zero-argument function. That zero-argument function returns the desired array, and it blocks until the array is available. This option is only useful with a non-``None`` executor.""",
 
+    # prefetch
+    "prefetch": u"""prefetch : int
+        number of steps to read ahead on the *executor* while the current step is being processed (default is ``0``, no read-ahead). At most this many steps beyond the current one are in memory at a time. Requires a non-``None`` executor.""",
+
+    # copy
+    "copy": u"""copy : bool
+        if ``True`` *(default)*, always return newly allocated arrays. If ``False``, branches read with an :py:class:`asdtype <uproot.interp.numerical.asdtype>` whose destination type and dimensions are the same as the source (no byte-swap, e.g. ``interpretation.to(interpretation.fromdtype)``, or single-byte types) and whose baskets are not compressed are returned as read-only views of the file's bytes (memory-mapped for local files), with no copy. A range that spans several baskets must be concatenated; slices of a lazy array that fall within one basket are views. Views are not put in the *cache*. Other branches are read as usual.""",
+
     # recursive
     "recursive": u"""recursive : bool
         if ``False`` *(default)*, only iterate at this tree/branch level; if ``True``, depth-first iterate over all subbranches as well.""",
@@ -525,6 +542,16 @@ u"""Opens a series of ROOT files (local or remote), yielding the same number of
 
     {blocking}
 
+    {prefetch}
+
+    {cut}
+
+    parallelfiles : positive int
+        if ``1`` *(default)*, open and read the files one after another; otherwise, open and read this many files at a time on a thread pool of that size, independently of the *executor* (which still parallelizes baskets within each file). Each file is read completely into memory before its steps are yielded, and the next file is only started when the steps of a finished file have all been consumed, so up to *parallelfiles* whole files' arrays may be held in memory at once: this is only suitable for files that are small compared to the available memory (use *parallelfiles* ``1`` with *entrysteps* to stream large files).
+
+    ordered : bool
+        if ``True`` *(default)*, yield the steps of the files in the order of *path*; otherwise, yield the steps of whichever file is finished first. The entry numbers (*reportentries* and DataFrame indexes) are the same in either case. Has no effect if *parallelfiles* is ``1``.
+
     {localsource}
 
     {xrootdsource}
@@ -537,6 +564,59 @@ u"""Opens a series of ROOT files (local or remote), yielding the same number of
         aligned array segments from the files.
     """.format(**dict(list(open_fragments.items()) + list(tree_fragments.items())))
 
+################################################################ uproot.tree.reduce
+
+uproot.tree.reduce.__doc__ = \
+u"""Opens a series of ROOT files (local or remote), applies a mapper to each step of entries and combines the results into one.
+
+    The steps (TTree clusters by default) of up to *parallelfiles* open files are mapped in parallel on the *executor*, if given; when the last step of a file has been mapped, the file is closed and the next one is opened. The partial results of each file are combined pairwise, neighbor with neighbor, level by level, and then those of all files are combined the same way, with each level running in parallel. The order of combination is always the same, regardless of which tasks finish first. Each step is read without the executor (its threads are busy with the steps themselves).
+
+    Parameters
+    ----------
+    path : str or list of str
+        glob pattern(s) for local file paths (POSIX wildcards like "``*``") or URLs specifying the locations of the files. A list of filenames are processed in the given order, but glob patterns get pre-sorted to ensure a predictable order.
+
+    treepath : str
+        path within each ROOT file to find the TTree (may include "``/``" for subdirectories or "``;``" for cycle numbers).
+
+    {branches}
+
+    mapper : function or :py:class:`Reducer <uproot.reducers.Reducer>`
+        function that takes a dict of arrays (for the selected branches, restricted to one step) and returns a partial result; or a :py:class:`Reducer <uproot.reducers.Reducer>`, such as :py:class:`Sum() <uproot.reducers.Sum>`, which provides both the mapper and the combiner, and reduces each branch separately.
+
+    combiner : ``None`` or function
+        function that takes two partial results and returns their combination; required unless *mapper* is a :py:class:`Reducer <uproot.reducers.Reducer>`.
+
+    {entrysteps}
+
+    {flatten}
+
+    {cache}
+
+    {basketcache}
+
+    {keycache}
+
+    executor : `concurrent.futures.Executor <https://docs.python.org/3/library/concurrent.futures.html>`_
+        if not ``None`` *(default)*, open the files, map the steps, and combine the partial results by scheduling tasks on the executor. Assumes caches are thread-safe.
+
+    {cut}
+
+    parallelfiles : positive int
+        the maximum number of files to have open at a time *(default is 8)*. Without an *executor*, files are read one at a time.
+
+    {localsource}
+
+    {xrootdsource}
+
+    {options}
+
+    Returns
+    -------
+    object
+        the combination of all partial results, or ``None`` if there are no steps.
+    """.format(**dict(list(open_fragments.items()) + list(tree_fragments.items())))
+
 ################################################################ uproot.tree.TTreeMethods
 
 uproot.tree.TTreeMethods.__doc__ = \
@@ -764,6 +844,8 @@ u"""Read one branch into an array (or other object if provided an alternate *int
 
     {entrystop}
 
+    {entries}
+
     {flatten}
 
     {cache}
@@ -776,6 +858,8 @@ u"""Read one branch into an array (or other object if provided an alternate *int
 
     {blocking}
 
+    {copy}
+
     Returns
     -------
     array or other object, depending on *interpretation*.
@@ -798,6 +882,8 @@ u"""Create a lazy array that would read the branch as needed.
 
     {executor}
 
+    {copy}
+
     Returns
     -------
     lazy array (square brackets initiate data reading)
@@ -817,6 +903,10 @@ u"""Read many branches into arrays (or other objects if provided alternate *inte
 
     {entrystop}
 
+    {entries}
+
+    {cut}
+
     {flatten}
 
     {cache}
@@ -829,6 +919,14 @@ u"""Read many branches into arrays (or other objects if provided alternate *inte
 
     {blocking}
 
+    {copy}
+
+    sharedoffsets : bool
+        if ``True`` *(not default)*, jagged branches counted by the same leaf (e.g. all ``Muon_*`` branches counted by ``nMuon``) share a single offsets array, so the resulting JaggedArrays use less memory and :py:meth:`aligned <uproot.interp.jagged.JaggedArray.aligned>` compares them without looking at their contents. Do not modify the starts or stops of one of these JaggedArrays in place.
+
+    limit : ``None`` or positive int
+        the maximum number of basket tasks to have on the *executor* at a time (the baskets of all branches are submitted in file order, as earlier ones finish). If ``None`` *(default)*, the executor's ``max_workers`` attribute if it has one, or else the default size of a ``concurrent.futures`` pool: ``min(32, cpu_count() + 4)`` threads. Set it to the size of a larger pool, such as one for reading remote files. Has no effect without an *executor*, or with a :py:class:`Pipeline <uproot.pipeline.Pipeline>` or a process pool.
+
     Returns
     -------
     outputtype of arrays or other objects, depending on *interpretation*
@@ -852,6 +950,8 @@ u"""Create many lazy arrays.
 
     {executor}
 
+    {copy}
+
     Returns
     -------
     outputtype of lazy arrays (square brackets initiate data reading)
@@ -877,6 +977,10 @@ u"""Iterate over many arrays at once, yielding the same number of entries from a
 
     {entrystop}
 
+    {entries}
+
+    {cut}
+
     {flatten}
 
     {cache}
@@ -889,6 +993,8 @@ u"""Iterate over many arrays at once, yielding the same number of entries from a
 
     {blocking}
 
+    {prefetch}
+
     Returns
     -------
     iterator over (int, int, outputtype) (if *reportentries*) or just outputtype (otherwise)
@@ -1264,6 +1370,8 @@ u"""Read the branch into an array (or other object if provided an alternate *int
 
     {entrystop}
 
+    {entries}
+
     {flatten}
 
     {cache}
@@ -1276,6 +1384,8 @@ u"""Read the branch into an array (or other object if provided an alternate *int
 
     {blocking}
 
+    {copy}
+
     Returns
     -------
     array or other object, depending on *interpretation*
@@ -1297,6 +1407,8 @@ u"""Create a lazy array that would read the branch as needed.
 
     {executor}
 
+    {copy}
+
     Returns
     -------
     lazy array (square brackets initiate data reading)
@@ -1542,6 +1654,9 @@ u"""Interpret branch data as a new Numpy array with given dtypes and dimensions.
     todims : ``None`` or tuple of ints
         Numpy shape of each destination entry. The Numpy shape of the whole destination array is ``(numentries,) + todims``. If ``None`` *(default)*, ``todims`` will be equal to ``fromdims``. Making them different allows you to reshape arrays while reading.
 
+    checkoverflow : bool
+        if ``True`` *(not default)* and ``todtype`` is narrower than ``fromdtype`` (e.g. ``">i8"`` to ``"i4"`` or ``">f8"`` to ``"f4"``), raise ``ValueError`` if any value cannot be represented in ``todtype``. The check is made in the same pass that fills the destination.
+
     Notes
     -----
 
@@ -1559,6 +1674,9 @@ u"""Create a new :py:class:`asdtype <uproot.interp.numerical.asdtype>` interpret
     todims : ``None`` or tuple of ints
         if not ``None``, change the destination dimensions.
 
+    checkoverflow : ``None`` or bool
+        if not ``None``, change whether narrowing conversions are checked for overflow.
+
     Returns
     -------
     :py:class:`asdtype <uproot.interp.numerical.asdtype>`
@@ -1651,6 +1769,9 @@ u"""Create a new :py:class:`asjagged <uproot.interp.jagged.asjagged>` interpreta
     todims : ``None`` or tuple of ints
         if not ``None``, change the destination dimensions of inner arrays.
 
+    checkoverflow : ``None`` or bool
+        if not ``None``, change whether narrowing conversions of inner arrays are checked for overflow.
+
     Returns
     -------
     :py:class:`asjagged <uproot.interp.jagged.asjagged>`
@@ -1820,6 +1941,35 @@ u"""A ``dict`` with thread safety.
     This class is a direct subclass of ``dict`` with a global lock. Every method acquires the lock upon entry and releases it upon exit.
 """
 
+################################################################ uproot.cache.WeightedMemoryCache
+
+uproot.cache.memorycache.WeightedMemoryCache.__doc__ = \
+u"""A ``dict`` with a cost-weighted (GreedyDual-Size) eviction policy and thread safety.
+
+    Each key-value pair has a *cost*, the time it would take to recompute the value, and upon reaching the memory budget, the key-value pairs with the lowest cost per byte are evicted first. Among equally cheap key-value pairs, the least recently used are evicted first. Used as a **basketcache**, uproot declares the time spent reading and decompressing each basket as its cost, so highly compressed baskets outlive baskets that are cheap to read again (such as uncompressed baskets, which cost nothing but a memory map).
+
+    Every method acquires a global lock upon entry and releases it upon exit.
+
+    **Attributes, properties, and methods:**
+
+    - **numbytes** (*int*) the number of bytes currently stored in this cache.
+    - **numevicted** (*int*) the number of key-value pairs that have been evicted.
+    - **setcost(key, cost)** declare the cost (in seconds) of recomputing *key*; may be called before or after the key-value pair is inserted (only the latest **maxpendingcosts** costs declared for keys that have not been inserted are kept). Key-value pairs without a declared cost have zero cost.
+    - **cost(key)** the cost of recomputing *key*.
+    - all ``dict`` methods that get, set, delete, and iterate over key-value pairs; **popitem()** removes the key-value pair that would be evicted next.
+
+    Parameters
+    ----------
+    limitbytes : int
+        the memory budget expressed in bytes. Note that this is a required parameter.
+
+    items : iterable of key-value 2-tuples
+        ordered pairs to insert into this cache; same meaning as in ``dict`` constructor.
+
+    **kwds
+        key-value pairs to insert into this cache; same meaning as in ``dict`` constructor.
+"""
+
 ################################################################ uproot.cache.DiskCache
 
 uproot.cache.diskcache.DiskCache.__doc__ = \
@@ -2421,3 +2571,83 @@ u"""A :py:class:`Source <uproot.source.source.Source>` for compressed data.
     uncompressedbytes : int
         number of bytes before compression.
 """
+
+################################################################ uproot.pipeline.Pipeline
+
+uproot.pipeline.Pipeline.__doc__ = \
+u"""An executor that reads, decompresses, and interprets baskets in three stages, each on its own thread pool.
+
+    Pass an instance of this class as the **executor** of any array-reading function. Instead of scheduling one task per basket that reads, decompresses, interprets, and copies the basket, each basket flows through three stages, connected by bounded queues:
+
+    - **io**: fetch the compressed bytes from the source (latency-bound, so it benefits from more threads than cores when reading remote files);
+    - **decompress**: inflate the bytes (CPU-bound; the compression libraries release the GIL);
+    - **interpret**: convert the bytes into arrays and copy them into the output.
+
+    When a queue is full, the stage in front of it waits, so no more than *queuesize* baskets are waiting between any two stages. Functions that accept an executor but do not read baskets use the **interpret** pool.
+
+    **Attributes, properties, and methods:**
+
+    - **timings** (*dict*) for each stage name, the total ``"seconds"`` spent in the stage, the total seconds ``"blocked"`` waiting for room in the next stage's queue, and the number of ``"tasks"`` processed.
+    - **reset()** set all timings to zero.
+    - **submit(fn, *args, **kwds)** and **map(fn, *iterables)** as in `concurrent.futures.Executor <https://docs.python.org/3/library/concurrent.futures.html>`_, using the **interpret** pool.
+    - **run(functions, items)** pass each item through the three *functions* in sequence, one per stage; returns a generator of ``None`` (success) or ``sys.exc_info()`` (failure) for each item, which blocks until that item is done.
+    - **shutdown(wait=True)** shut down all pools; also called when leaving a ``with`` block.
+
+    Parameters
+    ----------
+    io : int
+        number of threads for reading (default is 4).
+
+    decompress : ``None`` or int
+        number of threads for decompression; if ``None`` *(default)*, use the number of CPUs.
+
+    interpret : ``None`` or int
+        number of threads for interpretation; if ``None`` *(default)*, use the number of CPUs.
+
+    queuesize : ``None`` or int
+        maximum number of baskets waiting in front of each stage; if ``None`` *(default)*, use twice the largest number of threads.
+"""
+
+################################################################ uproot.reducers.Reducer
+
+uproot.reducers.Reducer.__doc__ = \
+u"""Abstract class for ready-made mappers and combiners to pass to :py:func:`uproot.reduce <uproot.tree.reduce>`, reducing each branch separately.
+
+    The mapper returns a dict from branch name to the **map** of that branch's array and the combiner combines two such dicts branch by branch with **combine**. Subclasses implement **map(array, arrays)**, in which *arrays* is the dict of all arrays in the step, and **combine(one, two)**. Branches in **branches** are read for the reducer's own use and are not reduced, unless they were also requested as branches to reduce: **mapper(arrays, exclude=None)** leaves out the names in *exclude*, which are the names in **branches** if ``None``.
+
+    **Attributes, properties, and methods:**
+
+    - **branches** (*tuple of bytes*) extra branches to read.
+    - **mapper(arrays)** map every branch that is not in **branches**.
+    - **combiner(one, two)** combine the results of two mappers.
+"""
+
+uproot.reducers.Sum.__doc__ = \
+u"""Sums the values of each branch (all items, for jagged arrays); for fixed-size arrays, sums each element separately."""
+
+uproot.reducers.Count.__doc__ = \
+u"""Counts the entries of each branch."""
+
+uproot.reducers.Min.__doc__ = \
+u"""Finds the minimum value of each branch (all items, for jagged arrays), or ``None`` if there are no values."""
+
+uproot.reducers.Max.__doc__ = \
+u"""Finds the maximum value of each branch (all items, for jagged arrays), or ``None`` if there are no values."""
+
+uproot.reducers.Hist.__doc__ = \
+u"""Fills a one-dimensional histogram (:py:func:`uproot.hist <uproot.hist.hist>`) with the values of each branch (all items, for jagged arrays).
+
+    Parameters
+    ----------
+    numbins : int
+        number of bins.
+
+    low : float
+        low edge of the first bin.
+
+    high : float
+        high edge of the last bin.
+
+    weight : ``None`` or str
+        if not ``None`` *(default)*, name of a branch with the weights, which is read along with the others; a flat weight applies to all items of its entry in jagged arrays.
+"""
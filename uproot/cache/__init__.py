@@ -31,6 +31,7 @@
 from uproot.cache.memorycache import MemoryCache
 from uproot.cache.memorycache import ThreadSafeMemoryCache
 from uproot.cache.memorycache import ThreadSafeDict
+from uproot.cache.memorycache import WeightedMemoryCache
 from uproot.cache.diskcache import DiskCache
 
 from uproot.cache.diskcache import arrayread
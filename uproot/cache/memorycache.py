@@ -33,6 +33,8 @@ import numbers
 import threading
 import platform
 import math
+import heapq
+from collections import OrderedDict
 
 import numpy
 
@@ -577,3 +579,191 @@ class ThreadSafeDict(dict):
                     return super(ThreadSafeDict, self).__lt__(self, other)
         else:
             raise TypeError("unorderable types: {0} < {1}".format(type(self), type(other)))
+
+class WeightedMemoryCache(dict):
+    # makes __doc__ attribute mutable before Python 3.3
+    __metaclass__ = type.__new__(type, "type", (type,), {})
+
+    # costs are declared just before their key-value pairs are inserted; only the most recent of those not yet inserted are kept
+    maxpendingcosts = 1024
+
+    def __init__(self, limitbytes, items=(), **kwds):
+        assert isinstance(limitbytes, numbers.Integral) and limitbytes > 0
+        self.limitbytes = limitbytes
+        self.numevicted = 0
+        self._lock = threading.RLock()
+        self._lookup = {}
+        self._entries = {}       # key -> [priority, cost, numbytes, sequence number]
+        self._costs = OrderedDict()   # costs declared before the key-value pair is inserted
+        self._heap = []
+        self._inflation = 0.0
+        self._sequence = 0
+        self._numbytes = 0
+        self.update(items, **kwds)
+
+    @property
+    def numbytes(self):
+        return self._numbytes
+
+    def _push(self, key, entry):
+        # GreedyDual-Size: expensive-to-recompute bytes outrank cheap ones, and the inflation value ages everything else
+        self._sequence += 1
+        entry[0] = self._inflation + float(entry[1]) / max(entry[2], 1)
+        entry[3] = self._sequence
+        heapq.heappush(self._heap, (entry[0], self._sequence, key))
+        if len(self._heap) > 4 * len(self._entries) + 64:
+            self._heap = [(x[0], x[3], k) for k, x in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def setcost(self, key, cost):
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None:
+                self._costs.pop(key, None)
+                self._costs[key] = cost
+                while len(self._costs) > self.maxpendingcosts:
+                    self._costs.popitem(last=False)
+            else:
+                entry[1] = cost
+                self._push(key, entry)
+
+    def cost(self, key):
+        with self._lock:
+            return self._entries[key][1]
+
+    def __getitem__(self, key):
+        with self._lock:
+            value = self._lookup[key]
+            self._push(key, self._entries[key])
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            numbytes = MemoryCache.sizeof(value)
+            entry = self._entries.get(key, None)
+            if entry is None:
+                entry = self._entries[key] = [0.0, self._costs.pop(key, 0.0), numbytes, 0]
+            else:
+                self._numbytes -= entry[2]
+                entry[2] = numbytes
+                cost = self._costs.pop(key, None)
+                if cost is not None:
+                    entry[1] = cost
+
+            self._lookup[key] = value
+            self._numbytes += numbytes
+            self._push(key, entry)
+
+            while len(self._heap) > 0 and self._numbytes > self.limitbytes:
+                priority, sequence, victim = heapq.heappop(self._heap)
+                entry = self._entries.get(victim, None)
+                if entry is None or entry[3] != sequence:
+                    continue    # stale heap item: the key was deleted or touched since this was pushed
+                self._inflation = priority
+                self._numbytes -= entry[2]
+                del self._entries[victim]
+                del self._lookup[victim]
+                self.numevicted += 1
+
+    def __delitem__(self, key):
+        with self._lock:
+            entry = self._entries.pop(key)
+            del self._lookup[key]
+            self._numbytes -= entry[2]
+
+    def pop(self, key, *default):
+        with self._lock:
+            if key in self._lookup:
+                value = self._lookup[key]
+                del self[key]
+                return value
+            elif len(default) > 0:
+                return default[0]
+            else:
+                raise KeyError(key)
+
+    def popitem(self):
+        # removes the key-value pair that would be evicted next
+        with self._lock:
+            while len(self._heap) > 0:
+                priority, sequence, key = heapq.heappop(self._heap)
+                entry = self._entries.get(key, None)
+                if entry is not None and entry[3] == sequence:
+                    return key, self.pop(key)
+            raise KeyError("popitem(): cache is empty")
+
+    def setdefault(self, key, default=None):
+        with self._lock:
+            if key in self._lookup:
+                return self[key]
+            else:
+                self[key] = default
+                return self._lookup.get(key, default)
+
+    def copy(self):
+        with self._lock:
+            out = self.__class__(self.limitbytes)
+            out.numevicted = self.numevicted
+            out._lookup = dict(self._lookup)
+            out._entries = dict((key, list(entry)) for key, entry in self._entries.items())
+            out._costs = OrderedDict(self._costs)
+            out._heap = list(self._heap)
+            out._inflation = self._inflation
+            out._sequence = self._sequence
+            out._numbytes = self._numbytes
+            return out
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._lookup
+
+    has_key = __contains__
+
+    def __len__(self):
+        return len(self._lookup)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self):
+        with self._lock:
+            return list(self._lookup.keys())
+
+    def values(self):
+        with self._lock:
+            return list(self._lookup.values())
+
+    def items(self):
+        with self._lock:
+            return list(self._lookup.items())
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._lookup:
+                return self[key]
+            else:
+                return default
+
+    def update(self, items=(), **kwds):
+        with self._lock:
+            if hasattr(items, "keys"):
+                for key in items.keys():
+                    self[key] = items[key]
+            else:
+                for key, value in items:
+                    self[key] = value
+            for key, value in kwds.items():
+                self[key] = value
+
+    def clear(self):
+        with self._lock:
+            self.numevicted = 0
+            self._lookup = {}
+            self._entries = {}
+            self._costs = OrderedDict()
+            self._heap = []
+            self._inflation = 0.0
+            self._numbytes = 0
+
+    def __repr__(self):
+        return "<WeightedMemoryCache with {0} items, {1} of {2} bytes>".format(len(self), self._numbytes, self.limitbytes)
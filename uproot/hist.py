@@ -182,7 +182,7 @@ class TH1Methods(object):
         if not isinstance(other, TH1Methods) or self.numbins != other.numbins or self.low != other.low or self.high != other.high:
             raise TypeError("TH1 histograms can only be combined with other TH1 histograms with the same binning")
         for i in range(len(self)):
-            self[i] = other[i]
+            self[i] += other[i]
         return self
 
     @property
@@ -522,7 +522,7 @@ class TH2Methods(TH1Methods):
         if not isinstance(other, TH2Methods) or self.numbins != other.numbins or self.low != other.low or self.high != other.high:
             raise TypeError("TH2 histograms can only be combined with other TH2 histograms with the same binning")
         for i in range(len(self)):
-            self[i] = other[i]
+            self[i] += other[i]
         return self
 
     @property
@@ -30,6 +30,8 @@
 
 from uproot.interp.numerical import asdtype
 from uproot.interp.numerical import asarray
+from uproot.interp.numerical import asdouble32
+from uproot.interp.numerical import asfloat16
 from uproot.interp.jagged import asjagged
 from uproot.interp.jagged import asstlvector
 from uproot.interp.jagged import asvar
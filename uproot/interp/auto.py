@@ -37,6 +37,7 @@ import numpy
 import uproot.const
 from uproot.interp.numerical import asdtype
 from uproot.interp.numerical import asdouble32
+from uproot.interp.numerical import asfloat16
 from uproot.interp.numerical import asarray
 from uproot.interp.numerical import asstlbitset
 from uproot.interp.jagged import asjagged
@@ -132,7 +133,7 @@ def interpret(branch, swapbytes=True):
                 if obj in branch._context.classes:
                     return asobj(branch._context.classes.get(obj), branch._context)
 
-            if branch.fLeaves[0].__class__.__name__ == "TLeafElement" and branch.fLeaves[0].fType == uproot.const.kDouble32:
+            if branch.fLeaves[0].__class__.__name__ == "TLeafElement" and branch.fLeaves[0].fType in (uproot.const.kDouble32, uproot.const.kFloat16):
                 def transform(node, tofloat=True):
                     if isinstance(node, ast.AST):
                         if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load) and node.id == "pi":
@@ -154,10 +155,12 @@ def interpret(branch, swapbytes=True):
                     else:
                         raise Exception(ast.dump(node))
 
+                isfloat16 = (branch.fLeaves[0].fType == uproot.const.kFloat16)
+
                 try:
                     left, right = branch._streamer.fTitle.index(b"["), branch._streamer.fTitle.index(b"]")
                 except (ValueError, AttributeError):
-                    out = asdtype(">f4", "f8", dims, dims)
+                    low, high, numbits = 0.0, 0.0, 0
                 else:
                     try:
                         spec = eval(compile(ast.Expression(transform(ast.parse(branch._streamer.fTitle[left : right + 1]).body[0].value)), repr(branch._streamer.fTitle), "eval"))
@@ -166,9 +169,22 @@ def interpret(branch, swapbytes=True):
                             numbits = 32
                         else:
                             low, high, numbits = spec
-                        out = asdouble32(low, high, numbits, dims, dims)
                     except:
                         return None
+
+                # as in TStreamerElement::GetRange: [0, 0, numbits] truncates the mantissa if numbits < 15;
+                # otherwise, Double32_t is a plain float and Float16_t keeps 12 bits of mantissa
+                if low == 0.0 and high == 0.0 and not 2 <= numbits <= 14:
+                    numbits = 0
+                try:
+                    if isfloat16:
+                        out = asfloat16(low, high, numbits if numbits != 0 else 12, dims, dims)
+                    elif numbits == 0:
+                        out = asdtype(">f4", "f8", dims, dims)
+                    else:
+                        out = asdouble32(low, high, numbits, dims, dims)
+                except:
+                    return None
                     
             else:
                 fromdtype = _leaf2dtype(branch.fLeaves[0]).newbyteorder(">")
@@ -29,9 +29,11 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import numbers
+from collections import OrderedDict
 
 import numpy
 
+import uproot.const
 import uproot.source.source
 import uproot.source.cursor
 from uproot.interp.interp import Interpretation
@@ -44,16 +46,12 @@ def sizes2offsets(sizes):
     sizes.cumsum(out=out[1:])
     return out
 
-def _compactify(fromdata, fromstarts, fromstops, todata, tostarts, tostops):
-    for i in range(len(fromstarts)):
-        todata[tostarts[i]:tostops[i]] = fromdata[fromstarts[i]:fromstops[i]]
-
-try:
-    import numba
-except ImportError:
-    pass
-else:
-    _compactify = numba.njit(_compactify)
+def _compactmask(starts, stops, lo, hi):
+    # True for bytes in [lo, hi) that belong to some [starts[i], stops[i]); ranges must not overlap
+    delta = numpy.zeros(hi - lo + 1, dtype=numpy.int8)
+    delta[starts - lo] += 1
+    delta[stops - lo] -= 1
+    return numpy.add.accumulate(delta[:-1], dtype=numpy.int8).view(numpy.bool_)
 
 class asjagged(Interpretation):
     # makes __doc__ attribute mutable before Python 3.3
@@ -69,10 +67,10 @@ class asjagged(Interpretation):
         else:
             return "asjagged({0}, skip_bytes={1})".format(repr(self.asdtype), self.skip_bytes)
 
-    def to(self, todtype=None, todims=None, skip_bytes=None):
+    def to(self, todtype=None, todims=None, skip_bytes=None, checkoverflow=None):
         if skip_bytes is None:
             skip_bytes = self.skip_bytes
-        return asjagged(self.asdtype.to(todtype, todims), skip_bytes)
+        return asjagged(self.asdtype.to(todtype, todims, checkoverflow), skip_bytes)
 
     @property
     def identifier(self):
@@ -101,40 +99,65 @@ class asjagged(Interpretation):
         return self.asdtype.numitems(numbytes - numentries*self.skip_bytes, numentries)
 
     def source_numitems(self, source):
-        return self.asdtype.source_numitems(source.content)
+        if self.skip_bytes == 0:
+            return self.asdtype.source_numitems(source.content)
+        else:
+            return self.asdtype.numitems(int((source.stops - source.starts).sum()), len(source))
 
     def fromroot(self, data, offsets, local_entrystart, local_entrystop):
         if local_entrystart == local_entrystop:
-            content = self.asdtype.fromroot(data, None, 0, 0)
-        else:
-            itemsize = self.asdtype.fromdtype.itemsize * _dimsprod(self.asdtype.fromdims)
             if self.skip_bytes == 0:
-                numpy.floor_divide(offsets, itemsize, offsets)
-                starts = offsets[local_entrystart     : local_entrystop    ]
-                stops  = offsets[local_entrystart + 1 : local_entrystop + 1]
-                content = self.asdtype.fromroot(data, None, starts[0], stops[-1])
+                content = self.asdtype.fromroot(data, None, 0, 0)
             else:
-                fromstarts = offsets[local_entrystart     : local_entrystop  ] + self.skip_bytes
-                fromstops  = offsets[local_entrystart + 1 : local_entrystop + 1]
-                newoffsets = numpy.empty(1 + local_entrystop - local_entrystart, dtype=offsets.dtype)
-                newoffsets[0] = 0
-                numpy.cumsum(fromstops - fromstarts, out=newoffsets[1:])
-                newdata = numpy.empty(newoffsets[-1], dtype=data.dtype)
-                _compactify(data, fromstarts, fromstops, newdata, newoffsets[:-1], newoffsets[1:])
-                numpy.floor_divide(newoffsets, itemsize, newoffsets)
-                starts = newoffsets[:-1]
-                stops = newoffsets[1:]
-                content = self.asdtype.fromroot(newdata, None, 0, stops[-1])
+                content = data[:0]
+            return JaggedArray(content, numpy.empty(0, dtype=numpy.int64), numpy.empty(0, dtype=numpy.int64))
+
+        elif self.skip_bytes == 0:
+            # offsets may belong to a cache or be shared, so they are not divided in place
+            itemsize = self.asdtype.fromdtype.itemsize * _dimsprod(self.asdtype.fromdims)
+            offsets = offsets[local_entrystart : local_entrystop + 1] // itemsize
+            starts = offsets[:-1]
+            stops  = offsets[1:]
+            content = self.asdtype.fromroot(data, None, starts[0], stops[-1])
             return JaggedArray(content, starts, stops)
 
+        else:
+            # not compact: content is the raw basket and starts/stops are byte positions after each entry's header;
+            # fill removes the headers while copying into the destination
+            starts = offsets[local_entrystart     : local_entrystop    ] + self.skip_bytes
+            stops  = offsets[local_entrystart + 1 : local_entrystop + 1]
+            return JaggedArray(data, starts, stops)
+
     def destination(self, numitems, numentries):
         content = self.asdtype.destination(numitems, numentries)
         sizes = numpy.empty(numentries, dtype=numpy.int64)
         return JaggedArray._Prep(content, sizes)
 
     def fill(self, source, destination, itemstart, itemstop, entrystart, entrystop):
-        destination.sizes[entrystart:entrystop] = source.stops - source.starts
-        self.asdtype.fill(source.content, destination.content, itemstart, itemstop, entrystart, entrystop)
+        if self.skip_bytes == 0:
+            destination.sizes[entrystart:entrystop] = source.stops - source.starts
+            self.asdtype.fill(source.content, destination.content, itemstart, itemstop, entrystart, entrystop)
+
+        else:
+            itemsize = self.asdtype.fromdtype.itemsize * _dimsprod(self.asdtype.fromdims)
+            destination.sizes[entrystart:entrystop] = (source.stops - source.starts) // itemsize
+            if len(source) == 0:
+                return
+
+            lo, hi = source.starts[0], source.stops[-1]
+            mask = _compactmask(source.starts, source.stops, lo, hi)
+            fromdtype, todtype = self.asdtype.fromdtype, self.asdtype.todtype
+
+            if self.asdtype.__class__ is asdtype and fromdtype.kind == todtype.kind and fromdtype.itemsize == todtype.itemsize and destination.content.flags.c_contiguous:
+                # copy the bytes straight into the destination and fix the byte order there
+                flattened = destination.content.reshape(-1)[itemstart:itemstop]
+                numpy.compress(mask, source.content[lo:hi], out=flattened.view(numpy.uint8))
+                if fromdtype.itemsize > 1 and fromdtype.isnative != todtype.isnative:
+                    flattened.byteswap(True)
+
+            else:
+                compact = numpy.compress(mask, source.content[lo:hi])
+                self.asdtype.fill(self.asdtype.fromroot(compact, None, 0, len(compact) // itemsize), destination.content, itemstart, itemstop, entrystart, entrystop)
 
     def clip(self, destination, itemstart, itemstop, entrystart, entrystop):
         destination.content = self.asdtype.clip(destination.content, itemstart, itemstop, entrystart, entrystop)
@@ -142,7 +165,9 @@ class asjagged(Interpretation):
         return destination
 
     def finalize(self, destination, branch):
-        offsets = sizes2offsets(destination.sizes)
+        offsets = destination.offsets
+        if offsets is None:
+            offsets = sizes2offsets(destination.sizes)
         starts = offsets[:-1]
         stops  = offsets[1:]
         content = self.asdtype.finalize(destination.content, branch)
@@ -173,6 +198,7 @@ class JaggedArray(object):
         def __init__(self, content, sizes):
             self.content = content
             self.sizes = sizes
+            self.offsets = None
 
     @staticmethod
     def fromlists(lists):
@@ -266,9 +292,15 @@ class JaggedArray(object):
         else:
             raise ValueError("starts and stops are not compatible; cannot express as offsets")
 
+    @staticmethod
+    def _sameview(one, two):
+        return one is two or (one.base is not None and one.base is two.base and one.ctypes.data == two.ctypes.data and one.shape == two.shape and one.strides == two.strides)
+
     def aligned(self, other):
         if self.leafcount is not None and other.leafcount is not None and self.leafcount is other.leafcount:
             return True
+        elif self._sameview(self.starts, other.starts) and self._sameview(self.stops, other.stops):
+            return True
         else:
             return numpy.array_equal(self.starts, other.starts) and numpy.array_equal(self.stops, other.stops)
 
@@ -453,6 +485,38 @@ class JaggedObjects(VariableLength):
         super(JaggedObjects, self).__init__(jaggedarray, cls)
         self._class = cls
         self._context = context
+        self._columns = None
+
+    @property
+    def columns(self):
+        if self._columns is None:
+            recordtype = getattr(self._class, "_recordtype", None)
+            if recordtype is None:
+                raise TypeError("{0} has members that are not all basic types, so it cannot be read as columns".format(self._class.__name__))
+
+            # each entry is a 10-byte vector header followed by fixed-size objects, each with its own byte count and version
+            content, starts, stops = self.jaggedarray.content, self.jaggedarray.starts, self.jaggedarray.stops
+            if len(starts) == 0:
+                counts = numpy.empty(0, dtype=numpy.int64)
+            else:
+                counts = _readcounts(content, starts + 6, self.indexdtype)
+            if not numpy.array_equal(stops - starts - 10, counts * recordtype.itemsize):
+                raise ValueError("{0} objects are not all {1} bytes long; cannot read them as columns".format(self._class.__name__, recordtype.itemsize))
+
+            if counts.sum() == 0:
+                records = numpy.empty(0, dtype=recordtype)
+            else:
+                records = numpy.compress(_compactmask(starts + 10, stops, starts[0] + 10, stops[-1]), content[starts[0] + 10 : stops[-1]]).view(recordtype)
+                if not (numpy.all((records["@cnt"] & ~numpy.uint32(uproot.const.kByteCountMask)) == recordtype.itemsize - 4) and numpy.all(records["@vers"] == self._class._classversion)):
+                    raise ValueError("{0} objects do not all have version {1} and {2} bytes; cannot read them as columns".format(self._class.__name__, self._class._classversion, recordtype.itemsize))
+
+            offsets = sizes2offsets(counts)
+            self._columns = OrderedDict()
+            for name in recordtype.names[2:]:
+                column = records[name]
+                self._columns[name] = JaggedArray(column.astype(column.dtype.newbyteorder("=")), offsets[:-1], offsets[1:])
+
+        return self._columns
 
     def interpret(self, item):
         size, = item[6:10].view(JaggedObjects.indexdtype)
@@ -517,10 +581,16 @@ class JaggedObject(VariableLength):
 def asstlvectorvector(fromdtype):
     return asvar(JaggedJaggedArray, skip_bytes=6, args=(numpy.dtype(fromdtype),))
 
+def _readcounts(content, positions, dtype):
+    # read a big-endian integer at each (arbitrarily aligned) byte position
+    index = positions[:, numpy.newaxis] + numpy.arange(dtype.itemsize)
+    return content[index].reshape(-1).view(dtype).astype(numpy.int64)
+
 class JaggedJaggedArray(VariableLength):
     def __init__(self, jaggedarray, fromdtype):
         super(JaggedJaggedArray, self).__init__(jaggedarray, fromdtype)
         self.fromdtype = fromdtype
+        self._columnar = None
 
     @classmethod
     def _dtype(cls, args):
@@ -529,6 +599,77 @@ class JaggedJaggedArray(VariableLength):
 
     indexdtype = numpy.dtype(">i4")
 
+    def _decode(self):
+        # decode all entries at once: step k reads the k-th inner vector of every entry that has one
+        content = self.jaggedarray.content
+        itemsize = self.fromdtype.itemsize
+
+        outercounts = _readcounts(content, self.jaggedarray.starts, self.indexdtype)
+        outeroffsets = sizes2offsets(outercounts)
+
+        innersizes = numpy.empty(outeroffsets[-1], dtype=numpy.int64)
+        innerstarts = numpy.empty(outeroffsets[-1], dtype=numpy.int64)
+        position = self.jaggedarray.starts + 4
+        active = numpy.nonzero(outercounts > 0)[0]
+        k = 0
+        while len(active) > 0:
+            here = position[active]
+            sizes = _readcounts(content, here, self.indexdtype)
+            innersizes[outeroffsets[active] + k] = sizes
+            innerstarts[outeroffsets[active] + k] = here + 4
+            position[active] = here + 4 + sizes*itemsize
+            k += 1
+            active = active[outercounts[active] > k]
+
+        if len(innerstarts) == 0:
+            flat = numpy.empty(0, dtype=self.fromdtype.newbyteorder("="))
+        else:
+            innerstops = innerstarts + innersizes*itemsize
+            flat = numpy.compress(_compactmask(innerstarts, innerstops, innerstarts[0], innerstops[-1]), content[innerstarts[0]:innerstops[-1]])
+            flat = flat.view(self.fromdtype).astype(self.fromdtype.newbyteorder("="))
+
+        inneroffsets = sizes2offsets(innersizes)
+        self._columnar = (JaggedArray(flat, inneroffsets[:-1], inneroffsets[1:]), outeroffsets[:-1], outeroffsets[1:])
+
+    # columnar view: inner vectors of entry i are inner[starts[i]:stops[i]]
+    @property
+    def inner(self):
+        if self._columnar is None:
+            self._decode()
+        return self._columnar[0]
+
+    @property
+    def starts(self):
+        if self._columnar is None:
+            self._decode()
+        return self._columnar[1]
+
+    @property
+    def stops(self):
+        if self._columnar is None:
+            self._decode()
+        return self._columnar[2]
+
+    @property
+    def content(self):
+        return self.inner.content
+
+    def __getitem__(self, index):
+        if isinstance(index, numbers.Integral):
+            inner = self.inner
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError("index out of range for JaggedJaggedArray")
+            return JaggedArray(inner.content, inner.starts[self.starts[index]:self.stops[index]], inner.stops[self.starts[index]:self.stops[index]])
+        else:
+            return super(JaggedJaggedArray, self).__getitem__(index)
+
+    def __iter__(self):
+        inner, starts, stops = self.inner, self.starts, self.stops
+        for i in range(len(starts)):
+            yield JaggedArray(inner.content, inner.starts[starts[i]:stops[i]], inner.stops[starts[i]:stops[i]])
+
     def interpret(self, item):
         i = 0
         size, = item[i : i + 4].view(JaggedJaggedArray.indexdtype)
@@ -56,7 +56,7 @@ class _asnumeric(Interpretation):
         return numpy.empty((0,) + self.todims, dtype=self.todtype)
 
     def compatible(self, other):
-        return (isinstance(self, (asdtype, asarray)) and isinstance(other, (asdtype, asarray)) and self.todtype == other.todtype and self.todims == other.todims) or \
+        return (isinstance(self, (asdtype, asarray)) and isinstance(other, (asdtype, asarray)) and self.todtype == other.todtype and self.todims == other.todims and self.checkoverflow == other.checkoverflow) or \
                (isinstance(self, asdouble32) and isinstance(other, asdouble32) and self.low == other.low and self.high == other.high and self.numbits == other.numbits and self.todtype == other.todtype and self.todims == other.todims) or \
                (isinstance(self, asstlbitset) and isinstance(other, asstlbitset) and self.todtype == other.dtype and self.todims == (other.numbytes,))
 
@@ -82,7 +82,11 @@ class _asnumeric(Interpretation):
         else:
             flattened_destination = destination.reshape(len(destination) * _dimsprod(self.todims))
 
-        flattened_destination[itemstart:itemstop] = flattened_source
+        if getattr(self, "checkoverflow", False):
+            self._checkedfill(flattened_source, flattened_destination[itemstart:itemstop])
+        else:
+            # one pass: NumPy byte-swaps and converts (possibly narrowing) as it copies
+            flattened_destination[itemstart:itemstop] = flattened_source
 
     def clip(self, destination, itemstart, itemstop, entrystart, entrystop):
         product = _dimsprod(self.todims)
@@ -99,7 +103,12 @@ class asdtype(_asnumeric):
     # makes __doc__ attribute mutable before Python 3.3
     __metaclass__ = type.__new__(type, "type", (_asnumeric.__metaclass__,), {})
 
-    def __init__(self, fromdtype, todtype=None, fromdims=(), todims=None):
+    # items converted per pass in a checked fill, so that the overflow check runs on data still in cache
+    _blocksize = 65536
+
+    checkoverflow = False
+
+    def __init__(self, fromdtype, todtype=None, fromdims=(), todims=None, checkoverflow=False):
         if isinstance(fromdtype, numpy.dtype):
             self.fromdtype = fromdtype
         elif isinstance(fromdtype, string_types) and len(fromdtype) > 0 and fromdtype[0] in (">", "<", "=", "|", b">", b"<", b"=", b"|"):
@@ -123,8 +132,12 @@ class asdtype(_asnumeric):
         else:
             self.todims = todims
 
-    def to(self, todtype=None, todims=None):
-        return asdtype(self.fromdtype, todtype, self.fromdims, todims)
+        self.checkoverflow = checkoverflow
+
+    def to(self, todtype=None, todims=None, checkoverflow=None):
+        if checkoverflow is None:
+            checkoverflow = self.checkoverflow
+        return asdtype(self.fromdtype, todtype, self.fromdims, todims, checkoverflow)
 
     def toarray(self, array):
         return asarray(self.fromdtype, array, self.fromdims)
@@ -140,6 +153,9 @@ class asdtype(_asnumeric):
         if self.todims != self.fromdims:
             args.append(repr(self.todims))
 
+        if self.checkoverflow:
+            args.append("checkoverflow=True")
+
         return "asdtype(" + ", ".join(args) + ")"
 
     @property
@@ -148,7 +164,7 @@ class asdtype(_asnumeric):
         todtype = "{0}{1}{2}".format(self._byteorder_transform[self.todtype.byteorder], self.todtype.kind, self.todtype.itemsize)
         fromdims = "(" + ",".join(repr(x) for x in self.fromdims) + ")"
         todims = "(" + ",".join(repr(x) for x in self.todims) + ")"
-        return "asdtype({0},{1},{2},{3})".format(fromdtype, todtype, fromdims, todims)
+        return "asdtype({0},{1},{2},{3}{4})".format(fromdtype, todtype, fromdims, todims, ",checkoverflow" if self.checkoverflow else "")
 
     def numitems(self, numbytes, numentries):
         return numbytes // self.fromdtype.itemsize
@@ -161,16 +177,48 @@ class asdtype(_asnumeric):
             array = array.reshape((len(array) // product,) + self.fromdims)
         return array[local_entrystart:local_entrystop]
 
+    def _checkedfill(self, source, destination):
+        fromdtype, todtype = source.dtype, destination.dtype
+
+        if todtype.kind in ("i", "u") and fromdtype.kind in ("i", "u", "f") and fromdtype != todtype:
+            info = numpy.iinfo(todtype)
+            def overflowed(src, dst):
+                if fromdtype.kind == "f" and numpy.isnan(src).any():
+                    return True
+                return len(src) > 0 and (src.min() < info.min or src.max() > info.max)
+
+        elif todtype.kind == "f" and fromdtype.kind == "f" and todtype.itemsize < fromdtype.itemsize:
+            def overflowed(src, dst):
+                isinf = numpy.isinf(dst)
+                return isinf.any() and not numpy.array_equal(isinf, numpy.isinf(src))
+
+        else:
+            destination[:] = source
+            return
+
+        with numpy.errstate(over="ignore", invalid="ignore"):
+            for start in range(0, len(source), self._blocksize):
+                src = source[start : start + self._blocksize]
+                dst = destination[start : start + len(src)]
+                dst[:] = src
+                if overflowed(src, dst):
+                    raise ValueError("some {0} values cannot be represented as {1} (overflow)".format(repr(str(fromdtype)), repr(str(todtype))))
+
 class asdouble32(_asnumeric):
     # makes __doc__ attribute mutable before Python 3.3
     __metaclass__ = type.__new__(type, "type", (_asnumeric.__metaclass__,), {})
 
+    # items converted per pass in fill, so that the second pass over each block is still in cache
+    _blocksize = 65536
+
     def __init__(self, low, high, numbits, fromdims=(), todims=None):
         if not isinstance(numbits, numbers.Integral) or not 2 <= numbits <= 32:
             raise TypeError("numbits must be an integer between 2 and 32 (inclusive)")
         if low == 0.0 and high == 0.0:
-            raise NotImplementedError("Double32_t with dropped mantissa bits not yet implemented")
-        if high <= low:
+            # ROOT's truncated-mantissa mode: one exponent byte and a two-byte mantissa (with sign bit) per item
+            if numbits > 14:
+                raise ValueError("truncated mantissa (low == high == 0) must have numbits between 2 and 14 (inclusive)")
+        elif high <= low:
             raise ValueError("high ({0}) must be strictly greater than low ({1})".format(high, low))
 
         self.low = low
@@ -180,10 +228,10 @@ class asdouble32(_asnumeric):
         self.fromdims = fromdims
 
         if todims is None:
-            self.todims = todims
-        else:
             self.todims = fromdims
-    
+        else:
+            self.todims = todims
+
     def __repr__(self):
         args = [repr(self.low), repr(self.high), repr(self.numbits)]
 
@@ -193,7 +241,18 @@ class asdouble32(_asnumeric):
         if self.todims != self.fromdims:
             args.append(repr(self.todims))
 
-        return "asdouble32(" + ", ".join(args) + ")"
+        return self.__class__.__name__ + "(" + ", ".join(args) + ")"
+
+    @property
+    def truncated(self):
+        return self.low == 0.0 and self.high == 0.0
+
+    @property
+    def fromdtype(self):
+        if self.truncated:
+            return numpy.dtype([("exponent", "u1"), ("mantissa", ">u2")])
+        else:
+            return numpy.dtype(">u4")
 
     @property
     def todtype(self):
@@ -203,21 +262,69 @@ class asdouble32(_asnumeric):
     def identifier(self):
         fromdims = "(" + ",".join(repr(x) for x in self.fromdims) + ")"
         todims = "(" + ",".join(repr(x) for x in self.todims) + ")"
-        return "asdouble32({0},{1},{2},{3},{4})".format(self.low, self.high, self.numbits, fromdims, todims)
+        return "{0}({1},{2},{3},{4},{5})".format(self.__class__.__name__, self.low, self.high, self.numbits, fromdims, todims)
 
     def numitems(self, numbytes, numentries):
-        return numbytes // 4
+        return numbytes // self.fromdtype.itemsize
 
     def fromroot(self, data, offsets, local_entrystart, local_entrystop):
-        array = data.view(">u4")
+        # raw integers (or exponent/mantissa records); the conversion to floating point happens in fill
+        array = data.view(self.fromdtype)
         if self.fromdims != ():
             product = _dimsprod(self.fromdims)
             assert len(array) % product == 0, "{0} % {1} == {2} != 0".format(len(array), product, len(array) % product)
             array = array.reshape((len(array) // product,) + self.fromdims)
-        array = array[local_entrystart:local_entrystop].astype(self.todtype)
-        numpy.multiply(array, (self.high - self.low) / (2.0**self.numbits), array)
-        numpy.add(array, self.low, array)
-        return array
+        return array[local_entrystart:local_entrystop]
+
+    def fill(self, source, destination, itemstart, itemstop, entrystart, entrystop):
+        flattened_source = source.reshape(-1)
+        if self.todims == ():
+            flattened_destination = destination
+        else:
+            flattened_destination = destination.reshape(len(destination) * _dimsprod(self.todims))
+        flattened_destination = flattened_destination[itemstart:itemstop]
+
+        if self.truncated:
+            numbits = self.numbits
+            mask = (1 << (numbits + 1)) - 1
+            signbit = 1 << (numbits + 1)
+            bits = numpy.empty(min(self._blocksize, len(flattened_source)), dtype=numpy.uint32)
+            floats = bits.view(numpy.float32)
+            for start in range(0, len(flattened_source), self._blocksize):
+                raw = flattened_source[start : start + self._blocksize]
+                out = flattened_destination[start : start + len(raw)]
+                b, f = bits[:len(raw)], floats[:len(raw)]
+
+                # same bit manipulation as TBufferFile::ReadWithNbits
+                mantissa = raw["mantissa"]
+                numpy.bitwise_and(mantissa, mask, out=b)
+                numpy.left_shift(b, 23 - numbits, out=b)
+                numpy.bitwise_or(b, numpy.left_shift(raw["exponent"].astype(numpy.uint32), 23), out=b)
+                numpy.negative(f, out=f, where=(mantissa & signbit) != 0)
+                out[:] = f
+
+        else:
+            # TStreamerElement::GetRange uses 0xffffffff rather than 2**32 for 32-bit ranges
+            if self.numbits == 32:
+                scale = (self.high - self.low) / float(0xffffffff)
+            else:
+                scale = (self.high - self.low) / float(1 << self.numbits)
+            for start in range(0, len(flattened_source), self._blocksize):
+                raw = flattened_source[start : start + self._blocksize]
+                out = flattened_destination[start : start + len(raw)]
+                numpy.multiply(raw, scale, out=out, casting="unsafe")
+                numpy.add(out, self.low, out=out, casting="unsafe")
+
+class asfloat16(asdouble32):
+    # makes __doc__ attribute mutable before Python 3.3
+    __metaclass__ = type.__new__(type, "type", (asdouble32.__metaclass__,), {})
+
+    def __init__(self, low=0.0, high=0.0, numbits=12, fromdims=(), todims=None):
+        super(asfloat16, self).__init__(low, high, numbits, fromdims, todims)
+
+    @property
+    def todtype(self):
+        return numpy.dtype(numpy.float32)
 
 class asarray(asdtype):
     # makes __doc__ attribute mutable before Python 3.3
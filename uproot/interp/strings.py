@@ -35,6 +35,8 @@ from types import MethodType
 import numpy
 
 from uproot.interp.interp import Interpretation
+from uproot.interp.jagged import _compactmask
+from uproot.interp.jagged import _readcounts
 from uproot.interp.jagged import asvar
 from uproot.interp.jagged import JaggedArray
 from uproot.interp.jagged import sizes2offsets
@@ -42,7 +44,7 @@ from uproot.interp.jagged import VariableLength
 
 CHARTYPE = numpy.dtype(numpy.uint8)
 
-def _asstrings_fromroot(data, offsets, local_entrystart, local_entrystop, skip_bytes, skip4_if_255):
+def _asstrings_fromroot_python(data, offsets, local_entrystart, local_entrystop, skip_bytes, skip4_if_255):
     if local_entrystart < 0 or local_entrystop >= len(offsets) or local_entrystart > local_entrystop:
         raise ValueError("illegal local_entrystart or local_entrystop in asstrings.fromroot")
 
@@ -66,12 +68,34 @@ def _asstrings_fromroot(data, offsets, local_entrystart, local_entrystop, skip_b
 
     return content[:stop], newoffsets[:-1], newoffsets[1:]
 
+def _asstrings_fromroot_numpy(data, offsets, local_entrystart, local_entrystop, skip_bytes, skip4_if_255):
+    if local_entrystart < 0 or local_entrystop >= len(offsets) or local_entrystart > local_entrystop:
+        raise ValueError("illegal local_entrystart or local_entrystop in asstrings.fromroot")
+
+    datastarts = offsets[local_entrystart : local_entrystop] + skip_bytes
+    datastops = offsets[local_entrystart + 1 : local_entrystop + 1]
+    if skip4_if_255 and len(datastarts) > 0:
+        # strings of 255 bytes or more have a 4-byte length after the 255 marker
+        datastarts += 4 * (data[datastarts - 1] == 255)
+
+    newoffsets = numpy.empty(1 + local_entrystop - local_entrystart, dtype=offsets.dtype)
+    newoffsets[0] = 0
+    numpy.cumsum(datastops - datastarts, out=newoffsets[1:])
+
+    if len(datastarts) == 0:
+        content = numpy.empty(0, dtype=CHARTYPE)
+    else:
+        lo, hi = datastarts[0], datastops[-1]
+        content = numpy.compress(_compactmask(datastarts, datastops, lo, hi), data[lo:hi])
+
+    return content, newoffsets[:-1], newoffsets[1:]
+
 try:
     import numba
 except ImportError:
-    pass
+    _asstrings_fromroot = _asstrings_fromroot_numpy
 else:
-    _asstrings_fromroot = numba.njit(_asstrings_fromroot)
+    _asstrings_fromroot = numba.njit(_asstrings_fromroot_python)
 
 class asstrings(asvar):
     def __init__(self, skip_bytes=1, skip4_if_255=True):
@@ -144,6 +168,88 @@ class ListStrings(VariableLength):
 
     indexdtype = numpy.dtype(">i4")
 
+    def __init__(self, *args):
+        super(ListStrings, self).__init__(*args)
+        self._columnar = None
+
+    def _decode(self):
+        # decode all entries at once: step k reads the k-th string of every entry that has not run out of bytes
+        content = self.jaggedarray.content
+        position = self.jaggedarray.starts.astype(numpy.int64)
+        stops = self.jaggedarray.stops
+
+        levels = []
+        active = numpy.nonzero(position < stops)[0]
+        while len(active) > 0:
+            here = position[active]
+            sizes = content[here].astype(numpy.int64)
+            strstarts = here + 1
+            islong = (sizes == 255)
+            if islong.any():
+                sizes[islong] = _readcounts(content, here[islong] + 1, self.indexdtype)
+                strstarts[islong] += 4
+            levels.append((active, strstarts, sizes))
+            position[active] = strstarts + sizes
+            active = active[position[active] < stops[active]]
+
+        counts = numpy.zeros(len(position), dtype=numpy.int64)
+        for active, strstarts, sizes in levels:
+            counts[active] += 1
+        offsets = sizes2offsets(counts)
+
+        allstarts = numpy.empty(offsets[-1], dtype=numpy.int64)
+        allsizes = numpy.empty(offsets[-1], dtype=numpy.int64)
+        for k, (active, strstarts, sizes) in enumerate(levels):
+            allstarts[offsets[active] + k] = strstarts
+            allsizes[offsets[active] + k] = sizes
+
+        if len(allstarts) == 0:
+            chars = numpy.empty(0, dtype=CHARTYPE)
+        else:
+            allstops = allstarts + allsizes
+            chars = numpy.compress(_compactmask(allstarts, allstops, allstarts[0], allstops[-1]), content[allstarts[0]:allstops[-1]])
+
+        stroffsets = sizes2offsets(allsizes)
+        self._columnar = (Strings(JaggedArray(chars, stroffsets[:-1], stroffsets[1:])), offsets[:-1], offsets[1:])
+
+    # columnar view: strings of entry i are strings[starts[i]:stops[i]]; Python bytes are only made on access
+    @property
+    def strings(self):
+        if self._columnar is None:
+            self._decode()
+        return self._columnar[0]
+
+    @property
+    def starts(self):
+        if self._columnar is None:
+            self._decode()
+        return self._columnar[1]
+
+    @property
+    def stops(self):
+        if self._columnar is None:
+            self._decode()
+        return self._columnar[2]
+
+    @property
+    def content(self):
+        return self.strings.jaggedarray.content
+
+    def __getitem__(self, index):
+        if isinstance(index, numbers.Integral):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError("index out of range for ListStrings")
+            return list(self.strings[self.starts[index]:self.stops[index]])
+        else:
+            return super(ListStrings, self).__getitem__(index)
+
+    def __iter__(self):
+        strings, starts, stops = self.strings, self.starts, self.stops
+        for i in range(len(starts)):
+            yield list(strings[starts[i]:stops[i]])
+
     @staticmethod
     def interpret(item):
         i = 0
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2017, DIANA-HEP
+# All rights reserved.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# 
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# 
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import multiprocessing
+import sys
+import threading
+import time
+
+class Pipeline(object):
+    # makes __doc__ attribute mutable before Python 3.3
+    __metaclass__ = type.__new__(type, "type", (type,), {})
+
+    stages = ("io", "decompress", "interpret")
+
+    def __init__(self, io=4, decompress=None, interpret=None, queuesize=None):
+        try:
+            from concurrent.futures import ThreadPoolExecutor
+        except ImportError:
+            raise ImportError("\n\nInstall futures package (for concurrent.futures in Python 2) with:\n\n    pip install futures --user\nor\n    conda install -c conda-forge futures\n\n(or just use Python 3).")
+
+        if decompress is None:
+            decompress = multiprocessing.cpu_count()
+        if interpret is None:
+            interpret = multiprocessing.cpu_count()
+        if queuesize is None:
+            queuesize = 2 * max(io, decompress, interpret)
+
+        self.numworkers = (io, decompress, interpret)
+        self.queuesize = queuesize
+
+        self._pools = [ThreadPoolExecutor(n) for n in self.numworkers]
+        self._slots = [None] + [threading.BoundedSemaphore(queuesize) for n in self.numworkers[1:]]
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._busy = [0.0] * len(self.stages)
+            self._blocked = [0.0] * len(self.stages)
+            self._count = [0] * len(self.stages)
+
+    @property
+    def timings(self):
+        with self._lock:
+            out = {}
+            for k, name in enumerate(self.stages):
+                out[name] = {"seconds": self._busy[k], "blocked": self._blocked[k], "tasks": self._count[k]}
+            return out
+
+    def _record(self, k, busy, blocked):
+        with self._lock:
+            self._busy[k] += busy
+            self._blocked[k] += blocked
+            self._count[k] += 1
+
+    def submit(self, fn, *args, **kwds):
+        return self._pools[-1].submit(fn, *args, **kwds)
+
+    def map(self, fn, *iterables):
+        return self._pools[-1].map(fn, *iterables)
+
+    def run(self, functions, items):
+        from concurrent.futures import Future
+        assert len(functions) == len(self.stages)
+
+        items = list(items)
+        results = [Future() for x in items]
+        pending = iter(range(len(items)))
+        pendinglock = threading.Lock()
+
+        def feed():
+            # the first stage has no queue in front of it: it pulls the next item whenever a task finishes
+            with pendinglock:
+                index = next(pending, None)
+            if index is not None:
+                self._pools[0].submit(step, 0, index, items[index])
+
+        def step(k, index, arg):
+            if k > 0:
+                self._slots[k].release()
+            starttime = time.time()
+            try:
+                out = functions[k](arg)
+            except:
+                self._record(k, time.time() - starttime, 0.0)
+                results[index].set_result(sys.exc_info())
+                if k == 0:
+                    feed()
+                return
+            endtime = time.time()
+
+            if k + 1 < len(self.stages):
+                self._slots[k + 1].acquire()     # back-pressure: wait for room in the next stage's queue
+                self._record(k, endtime - starttime, time.time() - endtime)
+                self._pools[k + 1].submit(step, k + 1, index, out)
+            else:
+                self._record(k, endtime - starttime, 0.0)
+                results[index].set_result(None)
+
+            if k == 0:
+                feed()
+
+        for i in range(min(len(items), self.queuesize)):
+            feed()
+
+        return (x.result() for x in results)
+
+    def shutdown(self, wait=True):
+        for pool in self._pools:
+            pool.shutdown(wait=wait)
+
+    def __enter__(self, *args, **kwds):
+        return self
+
+    def __exit__(self, *args, **kwds):
+        self.shutdown()
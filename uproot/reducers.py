@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2017, DIANA-HEP
+# All rights reserved.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# 
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# 
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import numpy
+
+from uproot.hist import hist
+import uproot.interp.jagged
+from uproot.rootio import _bytesid
+
+def _flat(array):
+    if isinstance(array, uproot.interp.jagged.JaggedArray):
+        return array.content
+    else:
+        return numpy.asarray(array)
+
+class Reducer(object):
+    # makes __doc__ attribute mutable before Python 3.3
+    __metaclass__ = type.__new__(type, "type", (type,), {})
+
+    # branches that the reducer reads for itself (such as weights) and does not reduce
+    branches = ()
+
+    def mapper(self, arrays, exclude=None):
+        if exclude is None:
+            exclude = self.branches
+        return dict((name, self.map(array, arrays)) for name, array in arrays.items() if name not in exclude)
+
+    def combiner(self, one, two):
+        return dict((name, self.combine(one[name], two[name])) for name in one)
+
+    def map(self, array, arrays):
+        raise NotImplementedError
+
+    def combine(self, one, two):
+        raise NotImplementedError
+
+class Sum(Reducer):
+    def __repr__(self):
+        return "Sum()"
+
+    def map(self, array, arrays):
+        return _flat(array).sum(axis=0)
+
+    def combine(self, one, two):
+        return one + two
+
+class Count(Reducer):
+    def __repr__(self):
+        return "Count()"
+
+    def map(self, array, arrays):
+        return len(array)
+
+    def combine(self, one, two):
+        return one + two
+
+class Min(Reducer):
+    def __repr__(self):
+        return "Min()"
+
+    def map(self, array, arrays):
+        array = _flat(array)
+        if len(array) == 0:
+            return None
+        else:
+            return array.min(axis=0)
+
+    def combine(self, one, two):
+        if one is None:
+            return two
+        elif two is None:
+            return one
+        else:
+            return numpy.minimum(one, two)
+
+class Max(Reducer):
+    def __repr__(self):
+        return "Max()"
+
+    def map(self, array, arrays):
+        array = _flat(array)
+        if len(array) == 0:
+            return None
+        else:
+            return array.max(axis=0)
+
+    def combine(self, one, two):
+        if one is None:
+            return two
+        elif two is None:
+            return one
+        else:
+            return numpy.maximum(one, two)
+
+class Hist(Reducer):
+    def __init__(self, numbins, low, high, weight=None):
+        self.numbins = numbins
+        self.low = low
+        self.high = high
+        self.weight = weight
+        if weight is None:
+            self.branches = ()
+        else:
+            self.branches = (_bytesid(weight),)
+
+    def __repr__(self):
+        return "Hist({0}, {1}, {2}{3})".format(self.numbins, self.low, self.high, "" if self.weight is None else ", weight={0}".format(repr(self.weight)))
+
+    def map(self, array, arrays):
+        out = hist(self.numbins, self.low, self.high)
+        if self.weight is None:
+            out.fillall(_flat(array))
+        else:
+            weights = arrays[self.branches[0]]
+            if isinstance(array, uproot.interp.jagged.JaggedArray) and not isinstance(weights, uproot.interp.jagged.JaggedArray):
+                # one weight per entry applies to all of its items
+                weights = numpy.repeat(weights, array.stops - array.starts)
+            out.fillallw(_flat(array), _flat(weights))
+        return out
+
+    def combine(self, one, two):
+        one += two
+        return one
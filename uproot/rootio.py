@@ -644,7 +644,17 @@ def _defineclasses(streamerinfos, classes):
             dtypes = {}
             basicnames = []
             basicletters = ""
+            recordfields = []      # stays a list only while every member is a fixed-size basic type (char* has a variable length)
             for elementi, element in enumerate(streamerinfo.fElements):
+                if recordfields is not None:
+                    if isinstance(element, TStreamerBasicType) and not isinstance(element, TStreamerBasicPointer) and element.fType not in (uproot.const.kDouble32, uproot.const.kFloat16, uproot.const.kCharStar) and _ftype2dtype(element.fType) != "None":
+                        if element.fArrayLength == 0:
+                            recordfields.append("({0}, {1})".format(repr(_safename(element.fName)), _ftype2dtype(element.fType)))
+                        else:
+                            recordfields.append("({0}, {1}, ({2},))".format(repr(_safename(element.fName)), _ftype2dtype(element.fType), element.fArrayLength))
+                    else:
+                        recordfields = None
+
                 if isinstance(element, TStreamerArtificial):
                     code.append("        _raise_notimplemented({0}, {1}, source, cursor)".format(repr(element.__class__.__name__), repr(repr(element.__dict__))))
 
@@ -745,6 +755,11 @@ def _defineclasses(streamerinfos, classes):
                 code.append("    {0} = {1}".format(n, v))
             for n, v in sorted(dtypes.items()):
                 code.append("    {0} = {1}".format(n, v))
+            if recordfields:
+                # layout of one object (with its byte count and version) for reading many at once as a structured array
+                code.append("    _recordtype = numpy.dtype([('@cnt', '>u4'), ('@vers', '>u2'), {0}])".format(", ".join(recordfields)))
+            else:
+                code.append("    _recordtype = None")
 
             code.insert(0, "    _classversion = {0}".format(streamerinfo.fClassVersion))
             code.insert(0, "    _versions = versions")
@@ -59,7 +59,8 @@ class MemmapSource(uproot.source.source.Source):
         pass
 
     def close(self):
-        self._source._mmap.close()
+        # arrays that are views of the map (in basket caches or read with copy=False) keep it open until they are deleted
+        self._source = None
 
     def data(self, start, stop, dtype=None):
         # assert start >= 0
@@ -29,17 +29,23 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import base64
+import functools
 import glob
+import hashlib
 import inspect
 import itertools
 import math
+import multiprocessing
 import numbers
 import os.path
+import pickle
 import re
 import struct
 import sys
 import threading
+import time
 from collections import namedtuple
+from collections import deque
 try:
     from urlparse import urlparse
 except ImportError:
@@ -73,6 +79,8 @@ except ImportError:
 import numpy
 
 import uproot.rootio
+import uproot.pipeline
+import uproot._formula
 from uproot.rootio import _bytesid
 from uproot.rootio import nofilter
 from uproot.interp.auto import interpret
@@ -97,6 +105,22 @@ def _delayedraise(excinfo):
         else:
             raise err.with_traceback(trc)
 
+def _memorysize(text):
+    if not isinstance(text, string_types):
+        raise TypeError("a memory size must be a string, such as \"100 MB\", not {0}".format(repr(text)))
+    if isinstance(text, bytes):
+        text = text.decode("ascii")
+    m = _memorysize._pattern.match(text)
+    if m is None:
+        raise ValueError("a memory size must be a number followed by a unit (B, kB, MB, GB, TB), such as \"100 MB\", not {0}".format(repr(text)))
+    out = int(float(m.group(1)) * _memorysize._units[m.group(2).upper()])
+    if out <= 0:
+        raise ValueError("a memory size must be positive, not {0}".format(repr(text)))
+    return out
+
+_memorysize._pattern = re.compile(r"^\s*([0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?)\s*([kKmMgGtT]?i?[bB])\s*$")
+_memorysize._units = {"B": 1, "KB": 1024, "KIB": 1024, "MB": 1024**2, "MIB": 1024**2, "GB": 1024**3, "GIB": 1024**3, "TB": 1024**4, "TIB": 1024**4}
+
 def _filename_explode(x):
     parsed = urlparse(x)
     if _bytesid(parsed.scheme) == b"file" or len(parsed.scheme) == 0:
@@ -111,51 +135,620 @@ def _filename_explode(x):
     else:
         return [x]
 
-################################################################ high-level interface
+def _numworkers(executor):
+    # an executor's size, if it declares one publicly; otherwise the default size of a concurrent.futures pool of its kind
+    out = getattr(executor, "max_workers", None)
+    if isinstance(out, numbers.Integral) and out > 0:
+        return out
+    elif _isprocesspool(executor):
+        return multiprocessing.cpu_count()
+    else:
+        return min(32, multiprocessing.cpu_count() + 4)
 
-def iterate(path, treepath, branches=None, entrysteps=None, outputtype=dict, reportentries=False, flatten=False, cache=None, basketcache=None, keycache=None, executor=None, blocking=True, localsource=MemmapSource.defaults, xrootdsource=XRootDSource.defaults, httpsource=HTTPSource.defaults, **options):
-    for tree, newbranches, globalentrystart in _iterate(path, treepath, branches, localsource, xrootdsource, httpsource, **options):
-        for start, stop, arrays in tree.iterate(branches=newbranches, entrysteps=entrysteps, outputtype=outputtype, reportentries=True, entrystart=0, entrystop=tree.numentries, flatten=flatten, cache=cache, basketcache=basketcache, keycache=keycache, executor=executor, blocking=blocking):
-            if getattr(outputtype, "__name__", None) == "DataFrame" and getattr(outputtype, "__module__", None) == "pandas.core.frame":
-                index = numpy.frombuffer(arrays.index.data, dtype=arrays.index.dtype)
-                numpy.add(index, globalentrystart, index)
-            if reportentries:
-                yield globalentrystart + start, globalentrystart + stop, arrays
+def _isprocesspool(executor):
+    try:
+        from concurrent.futures import ProcessPoolExecutor
+    except ImportError:
+        return False
+    else:
+        return isinstance(executor, ProcessPoolExecutor)
+
+class _BasketSchedule(object):
+    # one list of basket-filling tasks for all branches of an arrays call, run on one executor in file order
+    class _Task(object):
+        def __init__(self, seek, numbytes, fill):
+            self.seek = seek
+            self.numbytes = numbytes
+            self.fill = fill
+            self.excinfo = None
+            self.done = threading.Event()
+
+    def __init__(self, executor, limit):
+        self._executor = executor
+        self._limit = limit
+        self._lock = threading.Lock()
+        self._tasks = []
+        self._pending = None
+
+    def add(self, seek, numbytes, fill):
+        task = _BasketSchedule._Task(seek, numbytes, fill)
+        with self._lock:
+            if self._pending is not None:
+                raise RuntimeError("cannot add tasks to a schedule that has already started")
+            self._tasks.append(task)
+        return task
+
+    def start(self):
+        with self._lock:
+            if self._pending is not None:
+                return
+            limit = max(1, self._limit)
+
+            # sequential in the file, but the largest baskets of each wave of concurrent tasks go first
+            tasks = sorted(self._tasks, key=lambda task: task.seek)
+            ordered = []
+            for k in range(0, len(tasks), limit):
+                ordered.extend(sorted(tasks[k : k + limit], key=lambda task: -task.numbytes))
+            ordered.reverse()
+
+            self._pending = ordered
+            first = [self._pending.pop() for k in range(min(limit, len(self._pending)))]
+
+        for k, task in enumerate(first):
+            try:
+                self._executor.submit(self._run, task)
+            except:
+                self._abort(first[k:], sys.exc_info())
+                return
+
+    def _abort(self, tasks, excinfo):
+        # tasks that could not be submitted (and all that would follow them) fail with the submit error
+        with self._lock:
+            tasks = list(tasks) + self._pending
+            self._pending = []
+        for task in tasks:
+            task.excinfo = excinfo
+            task.done.set()
+
+    def _run(self, task):
+        try:
+            task.excinfo = task.fill()
+        except:
+            task.excinfo = sys.exc_info()
+        finally:
+            task.done.set()
+
+        # keep at most limit tasks on the executor: each finished task submits the next one
+        with self._lock:
+            if len(self._pending) > 0:
+                nexttask = self._pending.pop()
             else:
-                yield arrays
+                nexttask = None
+        if nexttask is not None:
+            try:
+                self._executor.submit(self._run, nexttask)
+            except:
+                self._abort([nexttask], sys.exc_info())
+
+    def results(self, tasks):
+        self.start()
+        for task in tasks:
+            task.done.wait()
+            yield task.excinfo
+
+def _normalize_entries(entries, numentries, entrystart, entrystop):
+    # selected entry numbers, sorted and without duplicates, restricted to entrystart:entrystop
+    entries = numpy.asarray(entries)
+    if entries.dtype == numpy.dtype(numpy.bool_):
+        if entries.shape != (numentries,):
+            raise ValueError("a boolean entries mask must have one value per entry ({0}), not shape {1}".format(numentries, entries.shape))
+        entries = numpy.nonzero(entries)[0]
+    elif entries.size == 0:
+        entries = numpy.empty(0, dtype=numpy.int64)
+    elif entries.ndim != 1 or not issubclass(entries.dtype.type, numpy.integer):
+        raise TypeError("entries must be a one-dimensional array of entry numbers or a boolean mask")
+
+    entries = numpy.where(entries < 0, entries + numentries, entries)
+    if len(entries) > 0 and (entries.min() < 0 or entries.max() >= numentries):
+        raise IndexError("entries out of range for {0} entries".format(numentries))
+
+    entries = numpy.unique(entries).astype(numpy.int64)
+    return entries[(entries >= entrystart) & (entries < entrystop)]
+
+def _once(wait):
+    # a wait function that runs at most once, for arrays that are inputs of more than one output
+    out = []
+    def once():
+        if len(out) == 0:
+            out.append(wait())
+        return out[0]
+    return once
+
+def _formulacolumns(outputs, columns):
+    # the requested outputs in order, given (name, interpretation, wait) for all branches read, with formulas evaluated from their inputs
+    waits = dict((name, (interpretation, _once(wait))) for name, interpretation, wait in columns)
+    out = []
+    for name, formula, inputnames in outputs:
+        if formula is None:
+            interpretation, wait = waits[name]
+            out.append((name, interpretation, wait))
+        else:
+            inputs = [waits[x][1] for x in inputnames]
+            out.append((name, formula, lambda formula=formula, inputs=inputs: formula(*[wait() for wait in inputs])))
+    return out
 
-def _iterate(path, treepath, branches, localsource, xrootdsource, httpsource, **options):
+def _flattened(interpretation, array):
+    if isinstance(interpretation, asjagged) or (isinstance(interpretation, uproot._formula.Formula) and isinstance(array, uproot.interp.jagged.JaggedArray)):
+        return array.content
+    else:
+        return array
+
+def _selectentries(array, mask):
+    # the entries of an array for which mask is True, or None for types that cannot be selected this way
+    if type(array) is numpy.ndarray:
+        return array[mask]
+    elif type(array) is uproot.interp.jagged.JaggedArray:
+        starts, stops = array.starts[mask], array.stops[mask]
+        offsets = uproot.interp.jagged.sizes2offsets(stops - starts)
+        index = numpy.repeat(starts - offsets[:-1], stops - starts) + numpy.arange(offsets[-1])
+        return uproot.interp.jagged.JaggedArray(array.content[index], offsets[:-1], offsets[1:])
+    else:
+        return None
+
+class _Tasks(object):
+    # excinfos of tasks submitted to an executor; unlike an executor.map iterator, the tasks can be cancelled before anyone iterates
+    def __init__(self, futures, excinfos=None):
+        self.futures = futures
+        self._excinfos = excinfos
+
+    @classmethod
+    def submit(cls, executor, function, items):
+        return cls([executor.submit(function, x) for x in items])
+
+    def __iter__(self):
+        if self._excinfos is None:
+            return (future.result() for future in self.futures)
+        else:
+            return iter(self._excinfos)
+
+    def cancel(self):
+        for future in self.futures:
+            future.cancel()
+
+class _SharedCounts(object):
+    # counts of kGenerateOffsetMap count branches, read once per array/iterate step and shared by all baskets and branches that need them
+    def __init__(self, basketcache=None, keycache=None):
+        self._basketcache = basketcache
+        self._keycache = keycache
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._offsets = {}
+
+    def counts(self, countbranch, entrystart, entrystop):
+        with self._lock:
+            start, stop, counts = self._counts.get(id(countbranch), (entrystart, entrystart, None))
+            if counts is None or entrystart < start or stop < entrystop:
+                pieces = []
+                if entrystart < start:
+                    pieces.append(countbranch.array(entrystart=entrystart, entrystop=start, basketcache=self._basketcache, keycache=self._keycache))
+                if counts is not None:
+                    pieces.append(counts)
+                if stop < entrystop:
+                    # also fills any gap between the counts already read and this range, so that they stay contiguous
+                    pieces.append(countbranch.array(entrystart=stop, entrystop=entrystop, basketcache=self._basketcache, keycache=self._keycache))
+                start, stop = min(start, entrystart), max(stop, entrystop)
+                counts = pieces[0] if len(pieces) == 1 else numpy.concatenate(pieces)
+                self._counts[id(countbranch)] = (start, stop, counts)
+
+        return counts[entrystart - start : entrystop - start]
+
+    def offsets(self, countleaf, sizes):
+        with self._lock:
+            offsets = self._offsets.get(id(countleaf), None)
+            if offsets is None or len(offsets) != len(sizes) + 1:
+                offsets = self._offsets[id(countleaf)] = uproot.interp.jagged.sizes2offsets(sizes)
+        return offsets
+
+# (file, tree) pairs opened by worker processes, kept for the life of the process
+_processpool_trees = {}
+
+def _processpool_close():
+    for file, tree in _processpool_trees.values():
+        file._context.source.close()
+    _processpool_trees.clear()
+
+def _processpool_fill(path, treeseek, branchname, interpretation, shared, jstart, jstop, basketstart, basketstop, entrystart, entrystop, basket_itemoffset, basket_entryoffset):
+    import multiprocessing.util
+    from multiprocessing import shared_memory
+
+    if (path, treeseek) not in _processpool_trees:
+        if len(_processpool_trees) == 0:
+            # closes the files when the worker process exits
+            multiprocessing.util.Finalize(None, _processpool_close, exitpriority=10)
+        file = uproot.rootio.open(path)
+        _processpool_trees[path, treeseek] = file, uproot.rootio.TKey.read(file._context.source, Cursor(treeseek), file._context, None).get()
+    branch = _processpool_trees[path, treeseek][1].get(branchname)
+
+    blocks = [shared_memory.SharedMemory(name=name) for name, dtype, shape in shared]
+    try:
+        arrays = [numpy.ndarray(shape, dtype=dtype, buffer=block.buf) for block, (name, dtype, shape) in zip(blocks, shared)]
+        if len(arrays) == 1:
+            destination = arrays[0]
+        else:
+            destination = uproot.interp.jagged.JaggedArray._Prep(arrays[0], arrays[1])
+
+        keycache = {}
+        sharedcounts = _SharedCounts(keycache=keycache)
+        for j in range(jstart, jstop):
+            i = j + basketstart
+            local_entrystart, local_entrystop = branch._localentries(i, entrystart, entrystop)
+            source = branch._basket(i, interpretation, local_entrystart, local_entrystop, None, keycache, sharedcounts)
+            branch._fillbasket(j, source, interpretation, destination, basketstart, basketstop, entrystart, entrystop, basket_itemoffset, basket_entryoffset)
+
+        return basket_itemoffset[0], basket_itemoffset[-1], basket_entryoffset[0], basket_entryoffset[-1]
+
+    finally:
+        # views into the shared memory must be gone before it can be closed
+        destination = source = arrays = None
+        for block in blocks:
+            block.close()
+
+################################################################ high-level interface
+
+def iterate(path, treepath, branches=None, entrysteps=None, outputtype=dict, reportentries=False, flatten=False, cache=None, basketcache=None, keycache=None, executor=None, blocking=True, localsource=MemmapSource.defaults, xrootdsource=XRootDSource.defaults, httpsource=HTTPSource.defaults, prefetch=0, cut=None, parallelfiles=1, ordered=True, **options):
+    if not isinstance(parallelfiles, numbers.Integral) or parallelfiles < 1:
+        raise ValueError("parallelfiles must be a positive integer")
+
+    def steps(tree, newbranches, blocking):
+        return tree.iterate(branches=newbranches, entrysteps=entrysteps, outputtype=outputtype, reportentries=True, entrystart=0, entrystop=tree.numentries, flatten=flatten, cache=cache, basketcache=basketcache, keycache=keycache, executor=executor, blocking=blocking, prefetch=prefetch, cut=cut)
+
+    if parallelfiles == 1:
+        allsteps = ((globalentrystart, step) for tree, newbranches, globalentrystart in _iterate(path, treepath, branches, localsource, xrootdsource, httpsource, **options) for step in steps(tree, newbranches, blocking))
+    else:
+        # each file is read by one of the file-level threads, a few steps ahead of the consumer
+        allsteps = _iterate_parallel(path, treepath, branches, lambda tree, newbranches: steps(tree, newbranches, True), parallelfiles, ordered, prefetch + 1, localsource, xrootdsource, httpsource, **options)
+
+    for globalentrystart, (start, stop, arrays) in allsteps:
+        if getattr(outputtype, "__name__", None) == "DataFrame" and getattr(outputtype, "__module__", None) == "pandas.core.frame":
+            index = numpy.frombuffer(arrays.index.data, dtype=arrays.index.dtype)
+            numpy.add(index, globalentrystart, index)
+        if parallelfiles > 1 and not blocking:
+            arrays = lambda arrays=arrays: arrays
+        if reportentries:
+            yield globalentrystart + start, globalentrystart + stop, arrays
+        else:
+            yield arrays
+
+def _explode_paths(path):
     if isinstance(path, string_types):
-        paths = _filename_explode(path)
+        return _filename_explode(path)
     else:
-        paths = [y for x in path for y in _filename_explode(x)]
+        return [y for x in path for y in _filename_explode(x)]
+
+def _opentree(path, treepath, branches, oldpath, oldbranches, localsource, xrootdsource, httpsource, **options):
+    tree = uproot.rootio.open(path, localsource=localsource, xrootdsource=xrootdsource, httpsource=httpsource, **options)[treepath]
+    listbranches, outputs = tree._normalize_formulas(branches)
+
+    newbranches = OrderedDict((branch.name, interpretation) for branch, interpretation in listbranches)
+    if oldbranches is not None:
+        for key in set(oldbranches.keys()).union(set(newbranches.keys())):
+            if key not in newbranches:
+                raise ValueError("branch {0} cannot be found in {1}, but it was in {2}".format(repr(key), repr(path), repr(oldpath)))
+            if key not in oldbranches:
+                del newbranches[key]
+            elif not newbranches[key].compatible(oldbranches[key]):
+                raise ValueError("branch {0} interpreted as {1} in {2}, but as {3} in {4}".format(repr(key), newbranches[key], repr(path), oldbranches[key], repr(oldpath)))
+
+    return tree, newbranches, outputs
+
+def _iterate(path, treepath, branches, localsource, xrootdsource, httpsource, **options):
+    paths = _explode_paths(path)
 
     oldpath = None
     oldbranches = None
-    holdover = None
-    holdoverentries = 0
-    outerstart = 0
     globalentrystart = 0
     for path in paths:
-        tree = uproot.rootio.open(path, localsource=localsource, xrootdsource=xrootdsource, httpsource=httpsource, **options)[treepath]
-        listbranches = list(tree._normalize_branches(branches))
-
-        newbranches = OrderedDict((branch.name, interpretation) for branch, interpretation in listbranches)
-        if oldbranches is not None:
-            for key in set(oldbranches.keys()).union(set(newbranches.keys())):
-                if key not in newbranches:
-                    raise ValueError("branch {0} cannot be found in {1}, but it was in {2}".format(repr(key), repr(path), repr(oldpath)))
-                if key not in oldbranches:
-                    del newbranches[key]
-                elif not newbranches[key].compatible(oldbranches[key]):
-                    raise ValueError("branch {0} interpreted as {1} in {2}, but as {3} in {4}".format(repr(key), newbranches[key], repr(path), oldbranches[key], repr(oldpath)))
-
+        tree, newbranches, outputs = _opentree(path, treepath, branches, oldpath, oldbranches, localsource, xrootdsource, httpsource, **options)
         oldpath = path
         oldbranches = newbranches
 
-        yield tree, newbranches, globalentrystart
+        if outputs is None:
+            yield tree, newbranches, globalentrystart
+        else:
+            # formulas are compiled again for each tree; their input branches have been checked above
+            yield tree, branches, globalentrystart
         globalentrystart += tree.numentries
 
+class _StepBuffers(object):
+    # steps of several files, each handed from the thread reading its file to the consumer and bounded to a few steps per file
+    def __init__(self, size):
+        self._size = size
+        self._condition = threading.Condition()
+        self._steps = {}
+        self._closed = False
+
+    def put(self, i, item):
+        # blocks while file i has size steps waiting; returns False if the consumer has stopped
+        with self._condition:
+            steps = self._steps.setdefault(i, deque())
+            while not self._closed and len(steps) >= self._size:
+                self._condition.wait()
+            if self._closed:
+                return False
+            steps.append(item)
+            self._condition.notify_all()
+            return True
+
+    def get(self, files):
+        # the next item of the first file in files that has one, waiting until one of them does
+        with self._condition:
+            while True:
+                for i in files:
+                    steps = self._steps.get(i)
+                    if steps:
+                        item = steps.popleft()
+                        if len(steps) == 0:
+                            del self._steps[i]
+                        self._condition.notify_all()
+                        return i, item
+                self._condition.wait()
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._steps.clear()
+            self._condition.notify_all()
+
+def _iterate_parallel(path, treepath, branches, read, parallelfiles, ordered, readahead, localsource, xrootdsource, httpsource, **options):
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+    except ImportError:
+        raise ImportError("\n\nInstall futures package (for concurrent.futures in Python 2) with:\n\n    pip install futures --user\nor\n    conda install -c conda-forge futures\n\n(or just use Python 3).")
+
+    paths = _explode_paths(path)
+    if len(paths) == 0:
+        return
+
+    # all files are checked against the first file's branches, rather than the previous file's, because they are opened in any order
+    first = _opentree(paths[0], treepath, branches, None, None, localsource, xrootdsource, httpsource, **options)
+    numentries = [None] * len(paths)
+    openerrors = [None] * len(paths)
+    opened = [threading.Event() for x in paths]
+    buffers = _StepBuffers(readahead)
+
+    # each file's steps are followed by (None, None) when it is finished, or (excinfo, None) if it fails
+    def task(i):
+        try:
+            try:
+                if i == 0:
+                    tree, newbranches, outputs = first
+                else:
+                    tree, newbranches, outputs = _opentree(paths[i], treepath, branches, paths[0], first[1], localsource, xrootdsource, httpsource, **options)
+                numentries[i] = tree.numentries
+            except:
+                openerrors[i] = sys.exc_info()
+                raise
+            finally:
+                opened[i].set()
+            for step in read(tree, newbranches if outputs is None else branches):
+                if not buffers.put(i, (None, step)):
+                    return
+            buffers.put(i, (None, None))
+        except:
+            buffers.put(i, (sys.exc_info(), None))
+
+    # global entry numbers of a file start after all of the files before it, which have already been submitted and open first
+    globalentrystarts = [0]
+    def globalentrystart(i):
+        while len(globalentrystarts) <= i:
+            j = len(globalentrystarts) - 1
+            opened[j].wait()
+            _delayedraise(openerrors[j])
+            globalentrystarts.append(globalentrystarts[-1] + numentries[j])
+        return globalentrystarts[i]
+
+    # at most parallelfiles files are being read or consumed, each at most readahead steps ahead of the consumer, to bound memory
+    pending = {}
+    executor = ThreadPoolExecutor(parallelfiles)
+    try:
+        nextfile = 0
+        while nextfile < len(paths) and len(pending) < parallelfiles:
+            pending[nextfile] = executor.submit(task, nextfile)
+            nextfile += 1
+
+        while len(pending) > 0:
+            i, (excinfo, step) = buffers.get([min(pending)] if ordered else sorted(pending))
+            _delayedraise(excinfo)
+
+            if step is None:
+                # the consumer has moved past all of this file's steps, so the next file can be read in its place
+                del pending[i]
+                if nextfile < len(paths):
+                    pending[nextfile] = executor.submit(task, nextfile)
+                    nextfile += 1
+            else:
+                yield globalentrystart(i), step
+                del step
+
+    finally:
+        # on break or close, files that have not started are dropped; files being read stop at their next step
+        for future in pending.values():
+            future.cancel()
+        buffers.close()
+        executor.shutdown(wait=False)
+
+def reduce(path, treepath, branches, mapper, combiner=None, entrysteps=None, flatten=False, cache=None, basketcache=None, keycache=None, executor=None, localsource=MemmapSource.defaults, xrootdsource=XRootDSource.defaults, httpsource=HTTPSource.defaults, cut=None, parallelfiles=8, **options):
+    reducer = None
+    if combiner is None:
+        if not hasattr(mapper, "mapper") or not hasattr(mapper, "combiner"):
+            raise TypeError("combiner is required unless mapper is a Reducer, such as uproot.reducers.Sum()")
+        reducer, combiner = mapper, mapper.combiner
+    if not isinstance(parallelfiles, numbers.Integral) or parallelfiles < 1:
+        raise ValueError("parallelfiles must be a positive integer")
+
+    def withextra(tree):
+        # the reducer's own branches (such as weights) are read too, but only those that were not requested are left out of its results
+        if reducer is None:
+            return branches, []
+        listbranches, outputs = tree._normalize_formulas(branches)
+        if outputs is None:
+            names = set(branch.name for branch, interpretation in listbranches)
+        else:
+            names = set(name for name, formula, inputnames in outputs)
+        added = [x for x in reducer.branches if x not in names]
+
+        if len(added) == 0:
+            return branches, added
+        elif callable(branches):
+            return (lambda branch: True if branch.name in added else branches(branch)), added
+        elif isinstance(branches, dict):
+            out = dict(branches)
+            out.update((x, tree.get(x).interpretation) for x in added)
+            return out, added
+        else:
+            return ([branches] if isinstance(branches, string_types) else list(branches)) + added, added
+
+    def combineall(partials, run):
+        # combine neighbors pairwise, level by level, so that the order of combination is fixed and each level can run in parallel
+        while len(partials) > 1:
+            combined = []
+            for excinfo, partial in run(combine, [(partials[k], partials[k + 1]) for k in range(0, len(partials) - 1, 2)]):
+                _delayedraise(excinfo)
+                combined.append(partial)
+            if len(partials) % 2 == 1:
+                combined.append(partials[-1])
+            partials = combined
+
+        if len(partials) == 0:
+            return None
+        else:
+            return partials[0]
+
+    def combine(pair):
+        try:
+            return None, combiner(*pair)
+        except:
+            return sys.exc_info(), None
+
+    def serial(function, items):
+        return [function(x) for x in items]
+
+    def parallel(function, items):
+        if executor is None:
+            return serial(function, items)
+        else:
+            return list(executor.map(function, items))
+
+    def openfile(i):
+        try:
+            tree = uproot.rootio.open(paths[i], localsource=localsource, xrootdsource=xrootdsource, httpsource=httpsource, **options)[treepath]
+            try:
+                treebranches, added = withextra(tree)
+                treekeycache = uproot.cache.memorycache.ThreadSafeDict() if keycache is None else keycache
+                steps = list(tree._entrysteps(tree._normalize_formulas(treebranches)[0], entrysteps, 0, tree.numentries, treekeycache))
+            except:
+                tree._context.source.close()
+                raise
+            return None, (tree, treebranches, added, steps)
+        except:
+            return sys.exc_info(), None
+
+    # each step is read without the executor, which is busy with the steps themselves
+    def mapstep(task):
+        (tree, treebranches, added, steps), start, stop = task
+        try:
+            arrays = tree.arrays(treebranches, entrystart=start, entrystop=stop, flatten=flatten, cache=cache, basketcache=basketcache, keycache=keycache, cut=cut)
+            if reducer is None:
+                return None, mapper(arrays)
+            else:
+                return None, reducer.mapper(arrays, added)
+        except:
+            return sys.exc_info(), None
+
+    def combinefile(partials):
+        try:
+            return None, combineall(partials, serial)
+        except:
+            return sys.exc_info(), None
+
+    def closefile(future):
+        excinfo, opened = future.result()
+        if opened is not None:
+            opened[0]._context.source.close()
+
+    # each file's partial results are combined into one, and then those of all files
+    paths = _explode_paths(path)
+    results = [[] for x in paths]
+
+    if executor is None:
+        for i in range(len(paths)):
+            excinfo, opened = openfile(i)
+            _delayedraise(excinfo)
+            try:
+                partials = []
+                for excinfo, partial in serial(mapstep, [(opened, start, stop) for start, stop in opened[3]]):
+                    _delayedraise(excinfo)
+                    partials.append(partial)
+            finally:
+                opened[0]._context.source.close()
+            if len(partials) > 0:
+                results[i] = [combineall(partials, serial)]
+
+    else:
+        from concurrent.futures import wait, FIRST_COMPLETED
+
+        # a sliding window of parallelfiles open files: when the last step of a file has been mapped, the file is closed and the next one is opened
+        opening, mapping, combining = {}, {}, {}
+        openfiles = {}
+        nextfile = 0
+        try:
+            while True:
+                while nextfile < len(paths) and len(opening) + len(openfiles) < parallelfiles:
+                    opening[executor.submit(openfile, nextfile)] = nextfile
+                    nextfile += 1
+                if len(opening) + len(mapping) + len(combining) == 0:
+                    break
+
+                for future in wait(list(opening) + list(mapping) + list(combining), return_when=FIRST_COMPLETED)[0]:
+                    if future in opening:
+                        i = opening.pop(future)
+                        excinfo, opened = future.result()
+                        _delayedraise(excinfo)
+                        openfiles[i] = opened, [None] * len(opened[3]), [len(opened[3])]
+                        for k, (start, stop) in enumerate(opened[3]):
+                            mapping[executor.submit(mapstep, (opened, start, stop))] = i, k
+
+                    elif future in mapping:
+                        i, k = mapping.pop(future)
+                        excinfo, partial = future.result()
+                        _delayedraise(excinfo)
+                        openfiles[i][1][k] = partial
+                        openfiles[i][2][0] -= 1
+
+                    else:
+                        i = combining.pop(future)
+                        excinfo, partial = future.result()
+                        _delayedraise(excinfo)
+                        results[i] = [partial]
+
+                for i in [i for i, (opened, partials, left) in openfiles.items() if left[0] == 0]:
+                    opened, partials, left = openfiles.pop(i)
+                    opened[0]._context.source.close()
+                    if len(partials) > 0:
+                        combining[executor.submit(combinefile, partials)] = i
+
+        finally:
+            # after an error, tasks that have not started are dropped and files still open (or being opened) are closed
+            for future in list(mapping) + list(combining):
+                future.cancel()
+            for future in opening:
+                if not future.cancel():
+                    future.add_done_callback(closefile)
+            for opened, partials, left in openfiles.values():
+                opened[0]._context.source.close()
+
+    return combineall([x for result in results for x in result], parallel)
+
 ################################################################ methods for TTree
 
 class TTreeMethods(object):
@@ -250,7 +843,13 @@ class TTreeMethods(object):
             if len(branch.fLeaves) == 1:
                 leaf2branch[id(branch.fLeaves[0])] = branch
 
+        if isinstance(parent, uproot.rootio.TKey):
+            treekeyseek = parent.fSeekKey
+        else:
+            treekeyseek = None
+
         for branch in self.itervalues(recursive=True):
+            branch._treekeyseek = treekeyseek
             if len(branch.fLeaves) > 0:
                 branch._countleaf = branch.fLeaves[0].fLeafCount
                 if branch._countleaf is not None:
@@ -338,82 +937,82 @@ class TTreeMethods(object):
             return True
 
     def clusters(self, branches=None, entrystart=None, entrystop=None, strict=False):
-        branches = list(self._normalize_branches(branches))
+        return self._clusters(self._normalize_formulas(branches)[0], entrystart, entrystop, strict)
 
+    def _clusters(self, branches, entrystart, entrystop, strict):
         if len(branches) == 0:
             yield self._normalize_entrystartstop(entrystart, entrystop)
 
         else:
-            # convenience class; simplifies presentation of the algorithm
-            class BranchCursor(object):
-                def __init__(self, branch):
-                    self.branch = branch
-                    self.basketstart = 0
-                    self.basketstop = 0
-                @property
-                def entrystart(self):
-                    return self.branch.basket_entrystart(self.basketstart)
-                @property
-                def entrystop(self):
-                    return self.branch.basket_entrystop(self.basketstop)
-
-            cursors = [BranchCursor(branch) for branch, interpretation in branches]
-
-            # everybody starts at the same entry number; if there is no such place before someone runs out of baskets, there will be an exception
-            leadingstart = max(cursor.entrystart for cursor in cursors)
-            while not all(cursor.entrystart == leadingstart for cursor in cursors):
-                for cursor in cursors:
-                    while cursor.entrystart < leadingstart:
-                        cursor.basketstart += 1
-                        cursor.basketstop += 1
-                leadingstart = max(cursor.entrystart for cursor in cursors)
+            for branch, interpretation in branches:
+                if branch.numbaskets == 0:
+                    raise ValueError("branch {0} has no baskets, so it has no clusters".format(repr(branch.name)))
 
-            entrystart, entrystop = self._normalize_entrystartstop(entrystart, entrystop)
+            # clusters are bounded by the entry numbers at which all branches start a new basket
+            boundaries = functools.reduce(numpy.intersect1d, [branch._entryoffsets for branch, interpretation in branches])
 
-            # move all cursors forward, yielding a (start, stop) pair if their baskets line up
-            while any(cursor.basketstop < cursor.branch.numbaskets for cursor in cursors):
-                # move all subleading baskets forward until they are no longer subleading
-                leadingstop = max(cursor.entrystop for cursor in cursors)
-                for cursor in cursors:
-                    while cursor.entrystop < leadingstop:
-                        cursor.basketstop += 1
-
-                # if they all line up, this is a good cluster
-                if all(cursor.entrystop == leadingstop for cursor in cursors):
-                    # check to see if it's within the bounds the user requested (strictly or not strictly)
-                    if strict:
-                        if entrystart <= leadingstart and leadingstop <= entrystop:
-                            yield leadingstart, leadingstop
-                    else:
-                        if entrystart < leadingstop and leadingstart < entrystop:
-                            yield leadingstart, leadingstop
+            entrystart, entrystop = self._normalize_entrystartstop(entrystart, entrystop)
 
-                    # anyway, move all the starts to the new stopping position and move all stops forward by one
-                    leadingstart = leadingstop
-                    for cursor in cursors:
-                        cursor.basketstart = cursor.basketstop
-                        cursor.basketstop += 1
+            for leadingstart, leadingstop in zip(boundaries[:-1], boundaries[1:]):
+                leadingstart, leadingstop = int(leadingstart), int(leadingstop)
 
                 # stop iterating if we're past all acceptable clusters
                 if leadingstart >= entrystop:
                     break
 
-    def array(self, branch, interpretation=None, entrystart=None, entrystop=None, flatten=False, cache=None, basketcache=None, keycache=None, executor=None, blocking=True):
-        return self.get(branch).array(interpretation=interpretation, entrystart=entrystart, entrystop=entrystop, flatten=flatten, cache=cache, basketcache=basketcache, keycache=keycache, executor=executor, blocking=blocking)
+                # check to see if it's within the bounds the user requested (strictly or not strictly)
+                if strict:
+                    if entrystart <= leadingstart and leadingstop <= entrystop:
+                        yield leadingstart, leadingstop
+                else:
+                    if entrystart < leadingstop and leadingstart < entrystop:
+                        yield leadingstart, leadingstop
+
+    def array(self, branch, interpretation=None, entrystart=None, entrystop=None, flatten=False, cache=None, basketcache=None, keycache=None, executor=None, blocking=True, copy=True, entries=None):
+        return self.get(branch).array(interpretation=interpretation, entrystart=entrystart, entrystop=entrystop, flatten=flatten, cache=cache, basketcache=basketcache, keycache=keycache, executor=executor, blocking=blocking, copy=copy, entries=entries)
 
-    def arrays(self, branches=None, outputtype=dict, entrystart=None, entrystop=None, flatten=False, cache=None, basketcache=None, keycache=None, executor=None, blocking=True):
-        branches = list(self._normalize_branches(branches))
+    def arrays(self, branches=None, outputtype=dict, entrystart=None, entrystop=None, flatten=False, cache=None, basketcache=None, keycache=None, executor=None, blocking=True, sharedoffsets=False, copy=True, entries=None, cut=None, limit=None):
+        if limit is not None and (not isinstance(limit, numbers.Integral) or limit < 1):
+            raise ValueError("limit must be None or a positive integer")
+        branches, outputs = self._normalize_formulas(branches)
 
         # for the case of outputtype == pandas.DataFrame, do some preparation to fill DataFrames efficiently
         ispandas = getattr(outputtype, "__name__", None) == "DataFrame" and getattr(outputtype, "__module__", None) == "pandas.core.frame"
         entrystart, entrystop = self._normalize_entrystartstop(entrystart, entrystop)
-
-        # start the job of filling the arrays
-        futures = [(branch.name, interpretation, branch.array(interpretation=interpretation, entrystart=entrystart, entrystop=entrystop, flatten=(flatten and not ispandas), cache=cache, basketcache=basketcache, keycache=keycache, executor=executor, blocking=False)) for branch, interpretation in branches]
+        if entries is not None:
+            entries = _normalize_entries(entries, self.numentries, entrystart, entrystop)
+        reuse = None
+        if cut is not None:
+            # the cut branches are read first; the others only in baskets with entries that pass
+            entries, reuse = self._cutentries(cut, entrystart, entrystop, entries, cache, basketcache, keycache, executor)
+
+        # start the job of filling the arrays; count branches needed to reconstruct offsets are read only once
+        sharedcounts = _SharedCounts(basketcache, keycache)
+        if executor is not None and entries is None and not isinstance(executor, uproot.pipeline.Pipeline) and not _isprocesspool(executor):
+            schedule = _BasketSchedule(executor, _numworkers(executor) if limit is None else limit)
+        else:
+            schedule = None
+        futures = []
+        for branch, interpretation in branches:
+            out = None if reuse is None else reuse(branch, interpretation)
+            if out is None:
+                futures.append((branch.name, interpretation, branch._array(interpretation, entrystart, entrystop, (flatten and not ispandas and outputs is None), cache, basketcache, keycache, executor, False, sharedcounts, sharedoffsets, copy, schedule, entries)))
+            else:
+                if flatten and not ispandas and outputs is None:
+                    out = _flattened(interpretation, out)
+                futures.append((branch.name, interpretation, lambda out=out: out))
+        if schedule is not None:
+            schedule.start()
+
+        if outputs is not None:
+            # formulas are evaluated from their inputs, which are read unflattened and not returned unless requested
+            futures = _formulacolumns(outputs, futures)
+            if flatten and not ispandas:
+                futures = [(name, interpretation, lambda interpretation=interpretation, future=future: _flattened(interpretation, future())) for name, interpretation, future in futures]
 
         # make functions that wait for the filling job to be done and return the right outputtype
         if outputtype == namedtuple:
-            outputtype = namedtuple("Arrays", [branch.name.decode("ascii") for branch, interpretation in branches])
+            outputtype = namedtuple("Arrays", [name.decode("ascii") for name, interpretation, future in futures])
             def wait():
                 return outputtype(*[future() for name, interpretation, future in futures])
 
@@ -443,24 +1042,28 @@ class TTreeMethods(object):
                     return outputtype(columns=columns, data=data)
 
                 else:
-                    index = pandas.MultiIndex.from_arrays([numpy.arange(entrystart, entrystop, dtype=numpy.int64), numpy.zeros(entrystop - entrystart, dtype=numpy.int64)], names=["entry", "subentry"])
+                    if entries is None:
+                        selected = numpy.arange(entrystart, entrystop, dtype=numpy.int64)
+                    else:
+                        selected = entries
+                    index = pandas.MultiIndex.from_arrays([selected, numpy.zeros(len(selected), dtype=numpy.int64)], names=["entry", "subentry"])
                     out = outputtype(index=index)
 
                     for name, interpretation, future in futures:
                         array = future()
 
                         if isinstance(array, uproot.interp.jagged.JaggedArray):
-                            entries = numpy.empty(len(array.content), dtype=numpy.int64)
+                            itementries = numpy.empty(len(array.content), dtype=numpy.int64)
                             subentries = numpy.empty(len(array.content), dtype=numpy.int64)
                             starts, stops = array.starts, array.stops
                             i = 0
-                            numentries = entrystop - entrystart
+                            numentries = len(selected)
                             while i < numentries:
-                                entries[starts[i]:stops[i]] = i + entrystart
+                                itementries[starts[i]:stops[i]] = selected[i]
                                 subentries[starts[i]:stops[i]] = numpy.arange(stops[i] - starts[i])
                                 i += 1
 
-                            df = outputtype(index=pandas.MultiIndex.from_arrays([entries, subentries], names=["entry", "subentry"]))
+                            df = outputtype(index=pandas.MultiIndex.from_arrays([itementries, subentries], names=["entry", "subentry"]))
                             if interpretation.asdtype.todims == ():
                                 df[name] = array.content
                             else:
@@ -500,10 +1103,10 @@ class TTreeMethods(object):
         else:
             return wait
 
-    def lazyarray(self, branch, interpretation=None, limitbytes=1024**2, cache=None, basketcache=None, keycache=None, executor=None):
-        return self.get(branch).lazyarray(interpretation=interpretation, limitbytes=limitbytes, cache=cache, basketcache=basketcache, keycache=keycache, executor=executor)
+    def lazyarray(self, branch, interpretation=None, limitbytes=1024**2, cache=None, basketcache=None, keycache=None, executor=None, copy=True):
+        return self.get(branch).lazyarray(interpretation=interpretation, limitbytes=limitbytes, cache=cache, basketcache=basketcache, keycache=keycache, executor=executor, copy=copy)
 
-    def lazyarrays(self, branches=None, outputtype=dict, limitbytes=1024**2, cache=None, basketcache=None, keycache=None, executor=None):
+    def lazyarrays(self, branches=None, outputtype=dict, limitbytes=1024**2, cache=None, basketcache=None, keycache=None, executor=None, copy=True):
         branches = list(self._normalize_branches(branches))
 
         if basketcache is None:
@@ -511,7 +1114,7 @@ class TTreeMethods(object):
         if keycache is None:
             keycache = uproot.cache.memorycache.ThreadSafeDict()
 
-        lazyarrays = [(branch.name, branch.lazyarray(interpretation=interpretation, limitbytes=limitbytes, cache=cache, basketcache=basketcache, keycache=keycache, executor=executor)) for branch, interpretation in branches]
+        lazyarrays = [(branch.name, branch.lazyarray(interpretation=interpretation, limitbytes=limitbytes, cache=cache, basketcache=basketcache, keycache=keycache, executor=executor, copy=copy)) for branch, interpretation in branches]
 
         if outputtype == namedtuple:
             outputtype = namedtuple("Arrays", [branch.name.decode("ascii") for branch, interpretation in branches])
@@ -525,81 +1128,87 @@ class TTreeMethods(object):
         else:
             return outputtype(*[lazyarray for name, lazyarray in lazyarrays])
 
-    def iterate(self, branches=None, entrysteps=None, outputtype=dict, reportentries=False, entrystart=None, entrystop=None, flatten=False, cache=None, basketcache=None, keycache=None, executor=None, blocking=True):
-        entrystart, entrystop = self._normalize_entrystartstop(entrystart, entrystop)
-
-        if entrysteps is None:
-            entrysteps = self.clusters(branches, entrystart=entrystart, entrystop=entrystop, strict=False)
-
-        elif isinstance(entrysteps, numbers.Integral):
-            entrystepsize = entrysteps
-            if entrystepsize <= 0:
-                raise ValueError("if an integer, entrysteps must be positive")
-
-            def startstop():
-                start = entrystart
-                while start < entrystop and start < self.numentries:
-                    stop = min(start + entrystepsize, entrystop)
-                    yield start, stop
-                    start = stop
-            entrysteps = startstop()
+    def iterate(self, branches=None, entrysteps=None, outputtype=dict, reportentries=False, entrystart=None, entrystop=None, flatten=False, cache=None, basketcache=None, keycache=None, executor=None, blocking=True, prefetch=0, entries=None, cut=None):
+        if not isinstance(prefetch, numbers.Integral) or prefetch < 0:
+            raise ValueError("prefetch must be a non-negative integer")
+        if prefetch > 0 and executor is None:
+            raise ValueError("prefetch requires an executor to read the next steps on")
 
-        else:
-            try:
-                iter(entrysteps)
-            except TypeError:
-                raise TypeError("entrysteps must be None for cluster iteration, a positive integer for equal steps in number of entries, or an iterable of 2-tuples for explicit entry starts (inclusive) and stops (exclusive)")
+        entrystart, entrystop = self._normalize_entrystartstop(entrystart, entrystop)
+        if entries is not None:
+            entries = _normalize_entries(entries, self.numentries, entrystart, entrystop)
 
-        branches = list(self._normalize_branches(branches))
+        # formulas are compiled once, here, and evaluated in each step
+        branches, outputs = self._normalize_formulas(branches)
 
         if keycache is None:
             keycache = uproot.cache.memorycache.ThreadSafeDict()
 
+        entrysteps = self._entrysteps(branches, entrysteps, entrystart, entrystop, keycache)
+
         if basketcache is None:
             basketcache = uproot.cache.memorycache.ThreadSafeDict()
             explicit_basketcache = False
         else:
             explicit_basketcache = True
 
-        def evaluate(branch, interpretation, future, past, cachekey, pythonize):
+        def evaluate(branch, interpretation, future, past, cachekey):
             if future is None:
                 return past
             else:
                 out = interpretation.finalize(future(), branch)
                 if cache is not None:
                     cache[cachekey] = out
-                if flatten and isinstance(interpretation, asjagged):
-                    return out.content
-                elif pythonize:
-                    return list(out)
-                else:
-                    return out
+                return out
+
+        def present(interpretation, out, pythonize):
+            if flatten:
+                return _flattened(interpretation, out)
+            elif pythonize and (isinstance(interpretation, asjagged) or isinstance(out, uproot.interp.jagged.JaggedArray)):
+                return list(out)
+            else:
+                return out
 
         if outputtype == namedtuple:
-            outputtype = namedtuple("Arrays", [branch.name.decode("ascii") for branch, interpretation in branches])
-            def wrap_for_python_scope(futures, start, stop):
-                return lambda: outputtype(*[evaluate(branch, interpretation, future, past, cachekey, False) for branch, interpretation, future, past, cachekey in futures])
+            if outputs is None:
+                outputtype = namedtuple("Arrays", [branch.name.decode("ascii") for branch, interpretation in branches])
+            else:
+                outputtype = namedtuple("Arrays", [name.decode("ascii") for name, formula, inputnames in outputs])
+            def wrap_for_python_scope(columns, index):
+                return lambda: outputtype(*[present(interpretation, wait(), False) for name, interpretation, wait in columns])
         elif getattr(outputtype, "__name__", None) == "DataFrame" and getattr(outputtype, "__module__", None) == "pandas.core.frame":
-            def wrap_for_python_scope(futures, start, stop):
-                return lambda: outputtype(data=OrderedDict((branch.name, evaluate(branch, interpretation, future, past, cachekey, isinstance(interpretation, asjagged))) for branch, interpretation, future, past, cachekey in futures), index=numpy.arange(start, stop))
+            def wrap_for_python_scope(columns, index):
+                return lambda: outputtype(data=OrderedDict((name, present(interpretation, wait(), True)) for name, interpretation, wait in columns), index=index)
         elif isinstance(outputtype, type) and issubclass(outputtype, dict):
-            def wrap_for_python_scope(futures, start, stop):
-                return lambda: outputtype((branch.name, evaluate(branch, interpretation, future, past, cachekey, False)) for branch, interpretation, future, past, cachekey in futures)
+            def wrap_for_python_scope(columns, index):
+                return lambda: outputtype((name, present(interpretation, wait(), False)) for name, interpretation, wait in columns)
         elif isinstance(outputtype, type) and issubclass(outputtype, (list, tuple)):
-            def wrap_for_python_scope(futures, start, stop):
-                return lambda: outputtype(evaluate(branch, interpretation, future, past, cachekey, False) for branch, interpretation, future, past, cachekey in futures)
+            def wrap_for_python_scope(columns, index):
+                return lambda: outputtype(present(interpretation, wait(), False) for name, interpretation, wait in columns)
         else:
-            def wrap_for_python_scope(futures, start, stop):
-                return lambda: outputtype(*[evaluate(branch, interpretation, future, past, cachekey, False) for branch, interpretation, future, past, cachekey in futures])
-
-        for start, stop in entrysteps:
-            start = max(start, entrystart)
-            stop = min(stop, entrystop)
-            if start > stop:
-                continue
+            def wrap_for_python_scope(columns, index):
+                return lambda: outputtype(*[present(interpretation, wait(), False) for name, interpretation, wait in columns])
 
+        def startstep(start, stop, stepentries, reuse):
             futures = []
+            tasks = []
+            sharedcounts = _SharedCounts(basketcache if explicit_basketcache else None, keycache)
             for branch, interpretation in branches:
+                out = None if reuse is None else reuse(branch, interpretation)
+                if out is not None:
+                    futures.append((branch, interpretation, None, out, None))
+                    continue
+
+                if stepentries is not None:
+                    cachekey = branch._sparsecachekey(interpretation, stepentries)
+                    out = None if cache is None else cache.get(cachekey, None)
+                    if out is not None:
+                        futures.append((branch, interpretation, None, out, cachekey))
+                    else:
+                        future = branch._sparse_array(interpretation, stepentries, basketcache, keycache, executor, sharedcounts, releasestop=(None if explicit_basketcache else stop), tasks=tasks)
+                        futures.append((branch, interpretation, future, None, cachekey))
+                    continue
+
                 basketstart, basketstop = branch._basketstartstop(start, stop)
                 basket_itemoffset = branch._basket_itemoffset(interpretation, basketstart, basketstop, keycache)
                 basket_entryoffset = branch._basket_entryoffset(basketstart, basketstop)
@@ -610,18 +1219,178 @@ class TTreeMethods(object):
                     if out is not None:
                         futures.append((branch, interpretation, None, out, cachekey))
                         continue
-                future = branch._step_array(interpretation, basket_itemoffset, basket_entryoffset, start, stop, basketcache, keycache, executor, explicit_basketcache)
+                future = branch._step_array(interpretation, basket_itemoffset, basket_entryoffset, start, stop, basketcache, keycache, executor, explicit_basketcache, sharedcounts, tasks)
                 futures.append((branch, interpretation, future, None, cachekey))
 
-            out = wrap_for_python_scope(futures, start, stop)
+            columns = [(args[0].name, args[1], lambda args=args: evaluate(*args)) for args in futures]
+            if outputs is not None:
+                # the inputs of formulas are released with this step
+                columns = _formulacolumns(outputs, columns)
+
+            if stepentries is None:
+                index = numpy.arange(start, stop)
+            else:
+                index = stepentries
+            return start, stop, wrap_for_python_scope(columns, index), tasks
 
+        def finishstep(start, stop, out, tasks):
             if blocking:
                 out = out()
 
             if reportentries:
-                yield start, stop, out
+                return start, stop, out
             else:
-                yield out
+                return out
+
+        # steps that have been started on the executor but not yet yielded: at most prefetch of them, to bound memory
+        inflight = deque()
+        try:
+            for start, stop in entrysteps:
+                start = max(start, entrystart)
+                stop = min(stop, entrystop)
+                if start > stop:
+                    continue
+
+                if entries is None:
+                    stepentries = None
+                else:
+                    # only the selected entries of this step are read; steps without any are skipped
+                    stepentries = entries[numpy.searchsorted(entries, start) : numpy.searchsorted(entries, stop)]
+                    if len(stepentries) == 0:
+                        continue
+
+                reuse = None
+                if cut is not None:
+                    # the cut branches' baskets are not held by iterate's own basketcache, which would never release them
+                    stepentries, reuse = self._cutentries(cut, start, stop, stepentries, cache, (basketcache if explicit_basketcache else None), keycache, executor)
+                    if len(stepentries) == 0:
+                        continue
+
+                inflight.append(startstep(start, stop, stepentries, reuse))
+                if len(inflight) > prefetch:
+                    yield finishstep(*inflight.popleft())
+
+            while len(inflight) > 0:
+                yield finishstep(*inflight.popleft())
+
+        finally:
+            # on break or close, cancel the baskets of prefetched steps that have not started (a Pipeline's baskets run to completion)
+            for start, stop, out, tasks in inflight:
+                for x in tasks:
+                    x.cancel()
+            inflight.clear()
+
+    def _entrysteps(self, branches, entrysteps, entrystart, entrystop, keycache):
+        if entrysteps is None:
+            return self._clusters(branches, entrystart, entrystop, False)
+
+        elif isinstance(entrysteps, numbers.Integral):
+            entrystepsize = entrysteps
+            if entrystepsize <= 0:
+                raise ValueError("if an integer, entrysteps must be positive")
+
+            def startstop():
+                start = entrystart
+                while start < entrystop and start < self.numentries:
+                    stop = min(start + entrystepsize, entrystop)
+                    yield start, stop
+                    start = stop
+            return startstop()
+
+        elif isinstance(entrysteps, string_types):
+            return self._bytesteps(branches, _memorysize(entrysteps), entrystart, entrystop, keycache)
+
+        else:
+            try:
+                iter(entrysteps)
+            except TypeError:
+                raise TypeError("entrysteps must be None for cluster iteration, a positive integer for equal steps in number of entries, a string like \"100 MB\" for steps of roughly equal memory, or an iterable of 2-tuples for explicit entry starts (inclusive) and stops (exclusive)")
+            return entrysteps
+
+    def _cutentries(self, cut, entrystart, entrystop, entries, cache, basketcache, keycache, executor):
+        try:
+            cutbranches, function = cut
+        except (TypeError, ValueError):
+            raise TypeError("cut must be a 2-tuple of (branches to read for the cut, function from a dict of their arrays to a boolean mask)")
+        if not callable(function):
+            raise TypeError("the second item of cut must be a function from a dict of arrays to a boolean mask")
+
+        arrays = self.arrays(cutbranches, entrystart=entrystart, entrystop=entrystop, cache=cache, basketcache=basketcache, keycache=keycache, executor=executor, entries=entries)
+        numentries = entrystop - entrystart if entries is None else len(entries)
+
+        mask = numpy.asarray(function(arrays))
+        if mask.dtype != numpy.dtype(numpy.bool_) or mask.shape != (numentries,):
+            raise ValueError("cut function must return a boolean mask with one value per entry ({0}), not an array of {1} with shape {2}".format(numentries, mask.dtype, mask.shape))
+
+        listbranches, outputs = self._normalize_formulas(cutbranches)
+        if outputs is None:
+            identifiers = dict((branch.name, interpretation.identifier) for branch, interpretation in listbranches)
+        else:
+            identifiers = {}
+
+        def reuse(branch, interpretation):
+            # a cut branch that is also an output is not read again: its passing entries are selected from the cut's array
+            if branch.name not in identifiers or identifiers[branch.name] != interpretation.identifier:
+                return None
+            else:
+                return _selectentries(arrays[branch.name], mask)
+
+        if entries is None:
+            return numpy.nonzero(mask)[0].astype(numpy.int64) + entrystart, reuse
+        else:
+            return entries[mask], reuse
+
+    def _bytesteps(self, branches, targetbytes, entrystart, entrystop, keycache):
+        # cumulative bytes at every basket boundary of every branch, assuming a uniform density within each basket
+        boundaries = [numpy.array([entrystart, entrystop], dtype=numpy.int64)]
+        cumulatives = []
+        for branch, interpretation in branches:
+            if branch._recoveredbaskets is None:
+                branch._tryrecover()
+            basketstart, basketstop = branch._basketstartstop(entrystart, entrystop)
+            if basketstart is None:
+                continue
+
+            offsets = branch._entryoffsets[basketstart : basketstop + 1]
+            basketbytes = numpy.array([min(key.fObjlen, key.border) for key in branch._threadsafe_iterate_keys(keycache, True, basketstart, basketstop)], dtype=numpy.float64)
+
+            # scale to the decoded size: e.g. twice the bytes for float32 read as float64, plus starts and stops for jagged arrays
+            content = interpretation.asdtype if isinstance(interpretation, asjagged) else interpretation
+            fromdtype, todtype = getattr(content, "fromdtype", None), getattr(content, "todtype", None)
+            if fromdtype is not None and todtype is not None and fromdtype.itemsize > 0:
+                numpy.multiply(basketbytes, float(todtype.itemsize) / fromdtype.itemsize, basketbytes)
+            if isinstance(interpretation, asjagged):
+                basketbytes += 16 * numpy.diff(offsets)
+
+            cumbytes = numpy.zeros(len(offsets), dtype=numpy.float64)
+            numpy.cumsum(basketbytes, out=cumbytes[1:])
+
+            boundaries.append(offsets)
+            cumulatives.append((offsets, cumbytes))
+
+        candidates = numpy.unique(numpy.concatenate(boundaries))
+        candidates = candidates[(candidates >= entrystart) & (candidates <= entrystop)]
+        total = numpy.zeros(len(candidates), dtype=numpy.float64)
+        for offsets, cumbytes in cumulatives:
+            total += numpy.interp(candidates, offsets, cumbytes)
+
+        out = []
+        start = entrystart
+        while start < entrystop:
+            budget = numpy.interp(start, candidates, total) + targetbytes
+
+            # the furthest basket boundary within budget
+            stop = int(candidates[numpy.searchsorted(total, budget, side="right") - 1])
+
+            if stop <= start:
+                # the next basket boundary is already over budget; split inside the basket, taking at least one entry
+                nextboundary = int(candidates[numpy.searchsorted(candidates, start, side="right")])
+                stop = min(max(int(numpy.interp(budget, total, candidates)), start + 1), nextboundary)
+
+            out.append((start, stop))
+            start = stop
+
+        return out
 
     def _format(self, indent=""):
         # TODO: add TTree data to the bottom of this
@@ -665,6 +1434,53 @@ class TTreeMethods(object):
                 flagsbyte += re.X
         return flagsbyte
 
+    def _formula(self, word):
+        # a Formula if word is an expression of branches, or an alias to one, rather than a branch name or pattern
+        word = _bytesid(word)
+        if re.match(self._branch_regex, word) is not None:
+            return None
+        try:
+            self.get(word)
+        except KeyError:
+            pass
+        else:
+            return None
+
+        try:
+            formula = uproot._formula.Formula(self.aliases.get(word, word).decode("utf-8"))
+        except (ValueError, UnicodeDecodeError):
+            return None
+        if formula.isname or not all(name in self for name in formula.inputs):
+            return None
+        return formula
+
+    def _normalize_formulas(self, arg):
+        # branches to read, and if any words of arg are formulas, the (name, formula or None, input branch names) of each output
+        if arg is None or callable(arg) or isinstance(arg, dict):
+            return list(self._normalize_branches(arg)), None
+
+        words = [arg] if isinstance(arg, string_types) else list(arg)
+        formulas = [self._formula(word) for word in words]
+        if all(formula is None for formula in formulas):
+            return list(self._normalize_branches(words)), None
+
+        toread = OrderedDict()
+        outputs = []
+        for word, formula in zip(words, formulas):
+            if formula is None:
+                for branch, interpretation in self._normalize_branches([word]):
+                    toread.setdefault(branch.name, (branch, interpretation))
+                    outputs.append((branch.name, None, None))
+            else:
+                inputnames = []
+                for name in formula.inputs:
+                    for branch, interpretation in self._normalize_branches([name]):
+                        toread.setdefault(branch.name, (branch, interpretation))
+                        inputnames.append(branch.name)
+                outputs.append((_bytesid(word), formula, inputnames))
+
+        return list(toread.values()), outputs
+
     def _normalize_branches(self, arg, allownone=True, allowcallable=True, allowdict=True, allowstring=True, aliases=True):
         if allownone and arg is None:                      # no specification; read all branches
             for branch in self.allvalues():                # that have interpretations
@@ -806,7 +1622,7 @@ class TBranchMethods(object):
 
         if self.numentries == self.fBasketEntry[self._numgoodbaskets]:
             self._recoveredbaskets = []
-            self._entryoffsets = self.fBasketEntry[: self._numgoodbaskets + 1].tolist()
+            self._entryoffsets = numpy.array(self.fBasketEntry[: self._numgoodbaskets + 1], dtype=numpy.int64)
             self._recoverylock = None
         else:
             self._recoveredbaskets = None
@@ -814,6 +1630,7 @@ class TBranchMethods(object):
             self._recoverylock = threading.Lock()
 
         self._countbranch = None
+        self._treekeyseek = None
         self._tree_iofeatures = 0
         if hasattr(parent, "fIOFeatures"):
             self._tree_iofeatures = parent.fIOFeatures.fIOBits
@@ -904,7 +1721,11 @@ class TBranchMethods(object):
         return "{0};{1};{2};{3};{4}-{5}".format(base64.b64encode(self._context.uuid).decode("ascii"), self._context.treename.decode("ascii"), self.name.decode("ascii"), interpretation.identifier, entrystart, entrystop)
 
     def _basketcachekey(self, i):
-        return "{0};{1};{2};{3};raw".format(base64.b64encode(self._context.uuid).decode("ascii"), self._context.treename.decode("ascii"), self.name.decode("ascii"), i)
+        if 0 <= i < self._numgoodbaskets:
+            # a basket is identified by its position in the file, so any TTree object or interpretation that reads it hits the same entry
+            return "{0};{1};raw".format(base64.b64encode(self._context.uuid).decode("ascii"), self.fBasketSeek[i])
+        else:
+            return "{0};{1};{2};{3};raw".format(base64.b64encode(self._context.uuid).decode("ascii"), self._context.treename.decode("ascii"), self.name.decode("ascii"), i)
 
     def _keycachekey(self, i):
         return "{0};{1};{2};{3};key".format(base64.b64encode(self._context.uuid).decode("ascii"), self._context.treename.decode("ascii"), self.name.decode("ascii"), i)
@@ -939,6 +1760,15 @@ class TBranchMethods(object):
                     yield key
                 done = True
 
+        if not done and basketstop <= self._numgoodbaskets and isinstance(self._source.parent(), MemmapSource):
+            keys = self._BasketKey._readmany(self._source.parent(), self.fBasketSeek[basketstart:basketstop], self.compression)
+            if keycache is not None:
+                for i, key in enumerate(keys):
+                    keycache[self._keycachekey(basketstart + i)] = key
+            for key in keys:
+                yield key
+            done = True
+
         if not done:
             keysource = self._source.threadlocal()
             try:
@@ -1019,7 +1849,7 @@ class TBranchMethods(object):
         if self._recoveredbaskets is None:
             self._tryrecover()
         if 0 <= i < self.numbaskets:
-            return self._entryoffsets[i]
+            return int(self._entryoffsets[i])
         else:
             raise IndexError("index {0} out of range for branch with {1} baskets".format(i, self.numbaskets))
 
@@ -1027,7 +1857,7 @@ class TBranchMethods(object):
         if self._recoveredbaskets is None:
             self._tryrecover()
         if 0 <= i < self.numbaskets:
-            return self._entryoffsets[i + 1]
+            return int(self._entryoffsets[i + 1])
         else:
             raise IndexError("index {0} out of range for branch with {1} baskets".format(i, self.numbaskets))
 
@@ -1035,7 +1865,7 @@ class TBranchMethods(object):
         if self._recoveredbaskets is None:
             self._tryrecover()
         if 0 <= i < self.numbaskets:
-            return self._entryoffsets[i + 1] - self._entryoffsets[i]
+            return int(self._entryoffsets[i + 1] - self._entryoffsets[i])
         else:
             raise IndexError("index {0} out of range for branch with {1} baskets".format(i, self.numbaskets))
 
@@ -1067,11 +1897,14 @@ class TBranchMethods(object):
         return entrystart, entrystop
 
     def _localentries(self, i, entrystart, entrystop):
-        local_entrystart = max(0, entrystart - self.basket_entrystart(i))
-        local_entrystop  = max(0, min(entrystop - self.basket_entrystart(i), self.basket_entrystop(i) - self.basket_entrystart(i)))
+        if self._recoveredbaskets is None:
+            self._tryrecover()
+        basket_entrystart, basket_entrystop = self._entryoffsets[i : i + 2].tolist()
+        local_entrystart = max(0, entrystart - basket_entrystart)
+        local_entrystop  = max(0, min(entrystop - basket_entrystart, basket_entrystop - basket_entrystart))
         return local_entrystart, local_entrystop
 
-    def _basket(self, i, interpretation, local_entrystart, local_entrystop, basketcache, keycache):
+    def _basket(self, i, interpretation, local_entrystart, local_entrystop, basketcache, keycache, sharedcounts=None):
         basketdata = None
         if basketcache is not None:
             basketcachekey = self._basketcachekey(i)
@@ -1080,24 +1913,32 @@ class TBranchMethods(object):
         key = self._threadsafe_key(i, keycache, True)
 
         if basketdata is None:
+            starttime = time.time()
             basketdata = key.basketdata()
+            if hasattr(basketcache, "setcost"):
+                basketcache.setcost(basketcachekey, time.time() - starttime)
 
         if basketcache is not None:
             basketcache[basketcachekey] = basketdata
 
+        return self._interpretbasket(i, key, basketdata, interpretation, local_entrystart, local_entrystop, sharedcounts)
+
+    def _interpretbasket(self, i, key, basketdata, interpretation, local_entrystart, local_entrystop, sharedcounts=None):
         if key.fObjlen == key.border:
             data, offsets = basketdata, None
 
             if self._countbranch is not None and numpy.uint8(self._tree_iofeatures) & numpy.uint8(uproot.const.kGenerateOffsetMap) != 0:
-                counts = self._countbranch.array(entrystart=(local_entrystart + self.basket_entrystart(i)),
-                                                 entrystop=(local_entrystop + self.basket_entrystart(i)))
+                # offsets must span the whole basket, since that is what data contains
+                if sharedcounts is None:
+                    sharedcounts = _SharedCounts()
+                counts = sharedcounts.counts(self._countbranch, self.basket_entrystart(i), self.basket_entrystop(i))
                 itemsize = 1
                 if isinstance(interpretation, asjagged):
                     itemsize = interpretation.asdtype.fromdtype.itemsize
-                numpy.multiply(counts, itemsize, counts)
                 offsets = numpy.empty(len(counts) + 1, dtype=numpy.int32)
                 offsets[0] = 0
                 numpy.cumsum(counts, out=offsets[1:])
+                numpy.multiply(offsets, itemsize, offsets)     # not counts, which may be shared
 
         else:
             data = basketdata[:key.border]
@@ -1146,20 +1987,17 @@ class TBranchMethods(object):
             return out
 
     def _basketstartstop(self, entrystart, entrystop):
-        basketstart, basketstop = None, None
-        for i in range(self.numbaskets):
-            if basketstart is None:
-                if entrystart < self.basket_entrystop(i) and self.basket_entrystart(i) < entrystop:
-                    basketstart = i
-                    basketstop = i
-            else:
-                if self.basket_entrystart(i) < entrystop:
-                    basketstop = i
+        if self._recoveredbaskets is None:
+            self._tryrecover()
 
-        if basketstop is not None:
-            basketstop += 1    # stop is exclusive
+        # first basket that ends after entrystart and one past the last basket that begins before entrystop
+        basketstart = int(numpy.searchsorted(self._entryoffsets[1:], entrystart, side="right"))
+        basketstop = int(numpy.searchsorted(self._entryoffsets[:-1], entrystop, side="left"))
 
-        return basketstart, basketstop
+        if basketstart < basketstop:
+            return basketstart, basketstop
+        else:
+            return None, None
 
     def baskets(self, interpretation=None, entrystart=None, entrystop=None, flatten=False, cache=None, basketcache=None, keycache=None, reportentries=False, executor=None, blocking=True):
         if self._recoveredbaskets is None:
@@ -1218,33 +2056,239 @@ class TBranchMethods(object):
         interpretation = self._normalize_interpretation(interpretation)
         entrystart, entrystop = self._normalize_entrystartstop(entrystart, entrystop)
 
-        for i in range(self.numbaskets):
-            if entrystart < self.basket_entrystop(i) and self.basket_entrystart(i) < entrystop:
-                local_entrystart, local_entrystop = self._localentries(i, entrystart, entrystop)
+        basketstart, basketstop = self._basketstartstop(entrystart, entrystop)
+        if basketstart is None:
+            return
 
-                if local_entrystop > local_entrystart:
-                    if reportentries:
-                        yield (local_entrystart + self.basket_entrystart(i),
-                               local_entrystop + self.basket_entrystart(i),
-                               self.basket(i, interpretation=interpretation, entrystart=entrystart, entrystop=entrystop, flatten=flatten, cache=cache, basketcache=basketcache, keycache=keycache))
-                    else:
-                        yield self.basket(i, interpretation=interpretation, entrystart=entrystart, entrystop=entrystop, flatten=flatten, cache=cache, basketcache=basketcache, keycache=keycache)
+        for i in range(basketstart, basketstop):
+            local_entrystart, local_entrystop = self._localentries(i, entrystart, entrystop)
+
+            if local_entrystop > local_entrystart:
+                if reportentries:
+                    yield (local_entrystart + self.basket_entrystart(i),
+                           local_entrystop + self.basket_entrystart(i),
+                           self.basket(i, interpretation=interpretation, entrystart=entrystart, entrystop=entrystop, flatten=flatten, cache=cache, basketcache=basketcache, keycache=keycache))
+                else:
+                    yield self.basket(i, interpretation=interpretation, entrystart=entrystart, entrystop=entrystop, flatten=flatten, cache=cache, basketcache=basketcache, keycache=keycache)
 
     def _basket_itemoffset(self, interpretation, basketstart, basketstop, keycache):
+        basket_numentries = numpy.diff(self._entryoffsets[basketstart : basketstop + 1]).tolist()
         basket_itemoffset = [0]
         for j, key in enumerate(self._threadsafe_iterate_keys(keycache, True, basketstart, basketstop)):
-            i = basketstart + j
-            numitems = interpretation.numitems(key.border, self.basket_numentries(i))
+            numitems = interpretation.numitems(key.border, basket_numentries[j])
             basket_itemoffset.append(basket_itemoffset[-1] + numitems)
         return basket_itemoffset
 
     def _basket_entryoffset(self, basketstart, basketstop):
-        basket_entryoffset = [0]
-        for i in range(basketstart, basketstop):
-            basket_entryoffset.append(basket_entryoffset[-1] + self.basket_numentries(i))
-        return basket_entryoffset
+        return (self._entryoffsets[basketstart : basketstop + 1] - self._entryoffsets[basketstart]).tolist()
+
+    def _fillbasket(self, j, source, interpretation, destination, basketstart, basketstop, entrystart, entrystop, basket_itemoffset, basket_entryoffset):
+        i = j + basketstart
+        local_entrystart, local_entrystop = self._localentries(i, entrystart, entrystop)
+
+        expecteditems = basket_itemoffset[j + 1] - basket_itemoffset[j]
+        source_numitems = interpretation.source_numitems(source)
+
+        expectedentries = basket_entryoffset[j + 1] - basket_entryoffset[j]
+        source_numentries = local_entrystop - local_entrystart
+
+        if j + 1 == basketstop - basketstart:
+            if expecteditems > source_numitems:
+                basket_itemoffset[j + 1] -= expecteditems - source_numitems
+            if expectedentries > source_numentries:
+                basket_entryoffset[j + 1] -= expectedentries - source_numentries
+
+        elif j == 0:
+            if expecteditems > source_numitems:
+                basket_itemoffset[j] += expecteditems - source_numitems
+            if expectedentries > source_numentries:
+                basket_entryoffset[j] += expectedentries - source_numentries
+
+        interpretation.fill(source,
+                            destination,
+                            basket_itemoffset[j],
+                            basket_itemoffset[j + 1],
+                            basket_entryoffset[j],
+                            basket_entryoffset[j + 1])
+
+    def _releasebasket(self, i, entrystop, basketcache):
+        # a basket that this step has read to its end is not needed by any later step
+        if basketcache is not None and self.basket_entrystop(i) <= entrystop:
+            try:
+                del basketcache[self._basketcachekey(i)]
+            except KeyError:
+                pass
 
-    def array(self, interpretation=None, entrystart=None, entrystop=None, flatten=False, cache=None, basketcache=None, keycache=None, executor=None, blocking=True):
+    def _fillbaskets(self, interpretation, destination, basketstart, basketstop, entrystart, entrystop, basket_itemoffset, basket_entryoffset, basketcache, keycache, executor, sharedcounts=None, schedule=None, releasebaskets=False):
+        if sharedcounts is None:
+            sharedcounts = _SharedCounts(basketcache, keycache)
+        if self._countbranch is not None and numpy.uint8(self._tree_iofeatures) & numpy.uint8(uproot.const.kGenerateOffsetMap) != 0:
+            # read the counts for all baskets at once, rather than one basket at a time
+            sharedcounts.counts(self._countbranch, int(self._entryoffsets[basketstart]), int(self._entryoffsets[basketstop]))
+
+        def fill(j):
+            try:
+                i = j + basketstart
+                local_entrystart, local_entrystop = self._localentries(i, entrystart, entrystop)
+                source = self._basket(i, interpretation, local_entrystart, local_entrystop, basketcache, keycache, sharedcounts)
+                self._fillbasket(j, source, interpretation, destination, basketstart, basketstop, entrystart, entrystop, basket_itemoffset, basket_entryoffset)
+                if releasebaskets:
+                    self._releasebasket(i, entrystop, basketcache)
+            except:
+                return sys.exc_info()
+
+        if executor is None:
+            for j in range(basketstop - basketstart):
+                _delayedraise(fill(j))
+            return ()
+
+        elif _isprocesspool(executor) and self._treekeyseek is not None and isinstance(destination, (numpy.ndarray, uproot.interp.jagged.JaggedArray._Prep)):
+            return self._fillbaskets_processpool(interpretation, destination, basketstart, basketstop, entrystart, entrystop, basket_itemoffset, basket_entryoffset, executor)
+
+        elif isinstance(executor, uproot.pipeline.Pipeline):
+            def read(j):
+                i = j + basketstart
+                key = self._threadsafe_key(i, keycache, True)
+                basketdata = None
+                if basketcache is not None:
+                    basketdata = basketcache.get(self._basketcachekey(i), None)
+                if basketdata is None:
+                    return j, key, None, key.rawdata(materialize=True)
+                else:
+                    return j, key, basketdata, None
+
+            def decompress(args):
+                j, key, basketdata, rawdata = args
+                i = j + basketstart
+                if basketdata is None:
+                    starttime = time.time()
+                    basketdata = key.decompress(rawdata)
+                    if hasattr(basketcache, "setcost"):
+                        basketcache.setcost(self._basketcachekey(i), time.time() - starttime)
+                if basketcache is not None:
+                    basketcache[self._basketcachekey(i)] = basketdata
+                return j, key, basketdata
+
+            def interpret(args):
+                j, key, basketdata = args
+                i = j + basketstart
+                local_entrystart, local_entrystop = self._localentries(i, entrystart, entrystop)
+                source = self._interpretbasket(i, key, basketdata, interpretation, local_entrystart, local_entrystop, sharedcounts)
+                self._fillbasket(j, source, interpretation, destination, basketstart, basketstop, entrystart, entrystop, basket_itemoffset, basket_entryoffset)
+                if releasebaskets:
+                    self._releasebasket(i, entrystop, basketcache)
+
+            return executor.run((read, decompress, interpret), range(basketstop - basketstart))
+
+        elif schedule is not None:
+            tasks = []
+            for j in range(basketstop - basketstart):
+                i = j + basketstart
+                if i < self._numgoodbaskets:
+                    seek, numbytes = int(self.fBasketSeek[i]), int(self.fBasketBytes[i])
+                else:
+                    seek, numbytes = 0, 0      # recovered baskets are already in memory
+                tasks.append(schedule.add(seek, numbytes, lambda j=j: fill(j)))
+            return schedule.results(tasks)
+
+        else:
+            return _Tasks.submit(executor, fill, range(basketstop - basketstart))
+
+    def _fillbaskets_processpool(self, interpretation, destination, basketstart, basketstop, entrystart, entrystop, basket_itemoffset, basket_entryoffset, executor):
+        try:
+            from multiprocessing import shared_memory
+        except ImportError:
+            raise ImportError("reading with a ProcessPoolExecutor requires multiprocessing.shared_memory (Python 3.8 or later)")
+
+        try:
+            pickle.dumps(interpretation)
+        except Exception:
+            if isinstance(interpretation, asjagged):
+                # object and variable-length interpretations fill the same bytes as a plain jagged array; the rest happens in this process
+                interpretation = asjagged(interpretation.asdtype, interpretation.skip_bytes)
+            else:
+                return self._fillbaskets(interpretation, destination, basketstart, basketstop, entrystart, entrystop, basket_itemoffset, basket_entryoffset, None, None, None)
+
+        if isinstance(destination, numpy.ndarray):
+            targets = [destination]
+        else:
+            targets = [destination.content, destination.sizes]
+
+        blocks = []
+        futures = []
+        def release():
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        try:
+            for x in targets:
+                blocks.append(shared_memory.SharedMemory(create=True, size=max(1, x.nbytes)))
+            shared = [(block.name, x.dtype, x.shape) for block, x in zip(blocks, targets)]
+
+            numbaskets = basketstop - basketstart
+            numtasks = min(numbaskets, 4 * multiprocessing.cpu_count())
+            bounds = [numbaskets * k // numtasks for k in range(numtasks + 1)]
+
+            for k in range(numtasks):
+                futures.append(executor.submit(_processpool_fill, self._context.sourcepath, self._treekeyseek, self.name, interpretation, shared, bounds[k], bounds[k + 1], basketstart, basketstop, entrystart, entrystop, list(basket_itemoffset), list(basket_entryoffset)))
+        except:
+            for future in futures:
+                future.cancel()
+            release()
+            raise
+
+        # the last task to finish copies the shared memory into the destination and releases it, whether or not anyone waits for the result
+        lock = threading.Lock()
+        remaining = [numtasks]
+        copied = threading.Event()
+        copyexcinfo = []
+
+        def done(future):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] > 0:
+                    return
+            try:
+                try:
+                    for block, (name, dtype, shape), x in zip(blocks, shared, targets):
+                        view = numpy.ndarray(shape, dtype=dtype, buffer=block.buf)
+                        x[...] = view
+                        del view
+                finally:
+                    release()
+            except:
+                copyexcinfo.append(sys.exc_info())
+            finally:
+                copied.set()
+
+        for future in futures:
+            future.add_done_callback(done)
+
+        def excinfos():
+            for k, future in enumerate(futures):
+                try:
+                    itemstart, itemstop, entrystart, entrystop = future.result()
+                except:
+                    yield sys.exc_info()
+                else:
+                    if bounds[k] == 0:
+                        basket_itemoffset[0], basket_entryoffset[0] = itemstart, entrystart
+                    if bounds[k + 1] == numbaskets:
+                        basket_itemoffset[-1], basket_entryoffset[-1] = itemstop, entrystop
+
+            copied.wait()
+            for excinfo in copyexcinfo:
+                yield excinfo
+
+        return _Tasks(futures, excinfos())
+
+    def array(self, interpretation=None, entrystart=None, entrystop=None, flatten=False, cache=None, basketcache=None, keycache=None, executor=None, blocking=True, copy=True, entries=None):
+        if entries is not None:
+            entries = _normalize_entries(entries, self.numentries, *self._normalize_entrystartstop(entrystart, entrystop))
+        return self._array(interpretation, entrystart, entrystop, flatten, cache, basketcache, keycache, executor, blocking, None, copy=copy, entries=entries)
+
+    def _array(self, interpretation, entrystart, entrystop, flatten, cache, basketcache, keycache, executor, blocking, sharedcounts, sharedoffsets=False, copy=True, schedule=None, entries=None):
         if self._recoveredbaskets is None:
             self._tryrecover()
 
@@ -1253,7 +2297,10 @@ class TBranchMethods(object):
         basketstart, basketstop = self._basketstartstop(entrystart, entrystop)
 
         if cache is not None:
-            cachekey = self._cachekey(interpretation, entrystart, entrystop)
+            if entries is None:
+                cachekey = self._cachekey(interpretation, entrystart, entrystop)
+            else:
+                cachekey = self._sparsecachekey(interpretation, entries)
             out = cache.get(cachekey, None)
             if out is not None:
                 if flatten and isinstance(interpretation, asjagged):
@@ -1263,6 +2310,24 @@ class TBranchMethods(object):
                 else:
                     return lambda: out
 
+        if entries is not None:
+            # entries have already been normalized (sorted, unique, and within entrystart:entrystop)
+            future = self._sparse_array(interpretation, entries, basketcache, keycache, executor, sharedcounts)
+
+            def wait():
+                out = interpretation.finalize(future(), self)
+                if cache is not None:
+                    cache[cachekey] = out
+                if flatten and isinstance(interpretation, asjagged):
+                    return out.content
+                else:
+                    return out
+
+            if blocking:
+                return wait()
+            else:
+                return wait
+
         if basketstart is None:
             if blocking:
                 return interpretation.empty()
@@ -1274,51 +2339,27 @@ class TBranchMethods(object):
         if keycache is None:
             keycache = uproot.cache.memorycache.ThreadSafeDict()
 
+        if not copy:
+            pieces = self._views(interpretation, basketstart, basketstop, entrystart, entrystop, keycache)
+            if pieces is not None:
+                if len(pieces) == 1:
+                    # a read-only view into the file is not cached: a copy=True read of the same key would get it
+                    out = pieces[0]
+                else:
+                    out = numpy.concatenate(pieces)    # the pieces are scattered in the file; use lazyarray to avoid this copy
+                    if cache is not None:
+                        cache[cachekey] = out
+                if blocking:
+                    return out
+                else:
+                    return lambda: out
+
         basket_itemoffset = self._basket_itemoffset(interpretation, basketstart, basketstop, keycache)
         basket_entryoffset = self._basket_entryoffset(basketstart, basketstop)
 
         destination = interpretation.destination(basket_itemoffset[-1], basket_entryoffset[-1])
 
-        def fill(j):
-            try:
-                i = j + basketstart
-                local_entrystart, local_entrystop = self._localentries(i, entrystart, entrystop)
-                source = self._basket(i, interpretation, local_entrystart, local_entrystop, basketcache, keycache)
-
-                expecteditems = basket_itemoffset[j + 1] - basket_itemoffset[j]
-                source_numitems = interpretation.source_numitems(source)
-
-                expectedentries = basket_entryoffset[j + 1] - basket_entryoffset[j]
-                source_numentries = local_entrystop - local_entrystart 
-
-                if j + 1 == basketstop - basketstart:
-                    if expecteditems > source_numitems:
-                        basket_itemoffset[j + 1] -= expecteditems - source_numitems
-                    if expectedentries > source_numentries:
-                        basket_entryoffset[j + 1] -= expectedentries - source_numentries
-
-                elif j == 0:
-                    if expecteditems > source_numitems:
-                        basket_itemoffset[j] += expecteditems - source_numitems
-                    if expectedentries > source_numentries:
-                        basket_entryoffset[j] += expectedentries - source_numentries
-
-                interpretation.fill(source,
-                                    destination,
-                                    basket_itemoffset[j],
-                                    basket_itemoffset[j + 1],
-                                    basket_entryoffset[j],
-                                    basket_entryoffset[j + 1])
-
-            except:
-                return sys.exc_info()
-
-        if executor is None:
-            for j in range(basketstop - basketstart):
-                _delayedraise(fill(j))
-            excinfos = ()
-        else:
-            excinfos = executor.map(fill, range(basketstop - basketstart))
+        excinfos = self._fillbaskets(interpretation, destination, basketstart, basketstop, entrystart, entrystop, basket_itemoffset, basket_entryoffset, basketcache, keycache, executor, sharedcounts, schedule)
 
         def wait():
             for excinfo in excinfos:
@@ -1330,6 +2371,10 @@ class TBranchMethods(object):
                                           basket_entryoffset[0],
                                           basket_entryoffset[-1])
 
+            if sharedoffsets and interpretation.__class__ is asjagged and self._countleaf is not None:
+                # every branch counted by the same leaf has the same sizes; build their offsets only once
+                clipped.offsets = sharedcounts.offsets(self._countleaf, clipped.sizes)
+
             out = interpretation.finalize(clipped, self)
             if cache is not None:
                 cache[cachekey] = out
@@ -1343,7 +2388,24 @@ class TBranchMethods(object):
         else:
             return wait
 
-    def _step_array(self, interpretation, basket_itemoffset, basket_entryoffset, entrystart, entrystop, basketcache, keycache, executor, explicit_basketcache):
+    def _views(self, interpretation, basketstart, basketstop, entrystart, entrystop, keycache):
+        # read-only views of the requested entries in the file's own bytes, or None if any basket would need a conversion
+        if interpretation.__class__ is not asdtype or interpretation.fromdtype != interpretation.todtype or interpretation.fromdims != interpretation.todims:
+            return None
+
+        keys = list(self._threadsafe_iterate_keys(keycache, True, basketstart, basketstop))
+        if any(key.fObjlen != key.fNbytes - key.fKeylen or key.fObjlen != key.border for key in keys):
+            return None     # compressed baskets or baskets with an entry offset table
+
+        pieces = []
+        for j, key in enumerate(keys):
+            local_entrystart, local_entrystop = self._localentries(basketstart + j, entrystart, entrystop)
+            piece = interpretation.fromroot(key.rawdata(), None, local_entrystart, local_entrystop).view()
+            piece.flags.writeable = False
+            pieces.append(piece)
+        return pieces
+
+    def _step_array(self, interpretation, basket_itemoffset, basket_entryoffset, entrystart, entrystop, basketcache, keycache, executor, explicit_basketcache, sharedcounts=None, tasks=None):
         if self._recoveredbaskets is None:
             self._tryrecover()
 
@@ -1354,67 +2416,98 @@ class TBranchMethods(object):
 
         destination = interpretation.destination(basket_itemoffset[-1], basket_entryoffset[-1])
 
-        def fill(j):
-            try:
-                i = j + basketstart
-                local_entrystart, local_entrystop = self._localentries(i, entrystart, entrystop)
-                source = self._basket(i, interpretation, local_entrystart, local_entrystop, basketcache, keycache)
-
-                expecteditems = basket_itemoffset[j + 1] - basket_itemoffset[j]
-                source_numitems = interpretation.source_numitems(source)
+        # with iterate's own basketcache, each basket is released as soon as its last step has filled it
+        excinfos = self._fillbaskets(interpretation, destination, basketstart, basketstop, entrystart, entrystop, basket_itemoffset, basket_entryoffset, basketcache, keycache, executor, sharedcounts, releasebaskets=(not explicit_basketcache))
+        if tasks is not None and isinstance(excinfos, _Tasks):
+            tasks.append(excinfos)
 
-                expectedentries = basket_entryoffset[j + 1] - basket_entryoffset[j]
-                source_numentries = local_entrystop - local_entrystart
+        def wait():
+            for excinfo in excinfos:
+                _delayedraise(excinfo)
 
-                if j + 1 == basketstop - basketstart:
-                    if expecteditems > source_numitems:
-                        basket_itemoffset[j + 1] -= expecteditems - source_numitems
-                    if expectedentries > source_numentries:
-                        basket_entryoffset[j + 1] -= expectedentries - source_numentries
+            return interpretation.clip(destination,
+                                       basket_itemoffset[0],
+                                       basket_itemoffset[-1],
+                                       basket_entryoffset[0],
+                                       basket_entryoffset[-1])
 
-                elif j == 0:
-                    if expecteditems > source_numitems:
-                        basket_itemoffset[j] += expecteditems - source_numitems
-                    if expectedentries > source_numentries:
-                        basket_entryoffset[j] += expectedentries - source_numentries
+        return wait
 
-                interpretation.fill(source,
-                                    destination,
-                                    basket_itemoffset[j],
-                                    basket_itemoffset[j + 1],
-                                    basket_entryoffset[j],
-                                    basket_entryoffset[j + 1])
+    def _sparsecachekey(self, interpretation, entries):
+        # a selection of entries is identified by a digest of the entry numbers
+        return self._cachekey(interpretation, "entries", hashlib.sha1(entries.tobytes()).hexdigest())
 
+    def _sparse_array(self, interpretation, entries, basketcache, keycache, executor, sharedcounts=None, releasestop=None, tasks=None):
+        # entries must be sorted and unique; only the baskets that contain them are read, and only those entries are filled
+        if self._recoveredbaskets is None:
+            self._tryrecover()
+        if keycache is None:
+            keycache = uproot.cache.memorycache.ThreadSafeDict()
+        if sharedcounts is None:
+            sharedcounts = _SharedCounts(basketcache, keycache)
+
+        baskets = numpy.searchsorted(self._entryoffsets, entries, side="right") - 1
+
+        # a run of consecutive selected entries in the same basket is interpreted and filled like a small basket of its own
+        newrun = numpy.empty(len(entries), dtype=numpy.bool_)
+        newrun[:1] = True
+        numpy.logical_or(entries[1:] != entries[:-1] + 1, baskets[1:] != baskets[:-1], out=newrun[1:])
+        runstarts = numpy.nonzero(newrun)[0]
+        runstops = numpy.empty_like(runstarts)
+        runstops[:-1] = runstarts[1:]
+        runstops[-1:] = len(entries)
+        runbaskets = baskets[runstarts]
+
+        touched = numpy.unique(runbaskets)
+        if len(touched) > 0 and self._countbranch is not None and numpy.uint8(self._tree_iofeatures) & numpy.uint8(uproot.const.kGenerateOffsetMap) != 0:
+            # read the counts for all touched baskets at once, rather than one basket at a time
+            sharedcounts.counts(self._countbranch, self.basket_entrystart(int(touched[0])), self.basket_entrystop(int(touched[-1])))
+        firstrun = numpy.append(numpy.searchsorted(runbaskets, touched), len(runstarts)).tolist()
+        run_entrystart = entries[runstarts].tolist()
+        run_entrystop = (entries[runstops - 1] + 1).tolist()
+        sources = [None] * len(runstarts)
+
+        def read(k):
+            try:
+                i = int(touched[k])
+                # without a basketcache, hold this basket only while its runs are interpreted
+                cache = basketcache if basketcache is not None else {}
+                offset = self.basket_entrystart(i)
+                for r in range(firstrun[k], firstrun[k + 1]):
+                    sources[r] = self._basket(i, interpretation, run_entrystart[r] - offset, run_entrystop[r] - offset, cache, keycache, sharedcounts)
+                if releasestop is not None:
+                    self._releasebasket(i, releasestop, basketcache)
             except:
                 return sys.exc_info()
 
-        if executor is None:
-            for j in range(basketstop - basketstart):
-                _delayedraise(fill(j))
+        if executor is None or _isprocesspool(executor):
+            for k in range(len(touched)):
+                _delayedraise(read(k))
             excinfos = ()
         else:
-            excinfos = executor.map(fill, range(basketstop - basketstart))
+            excinfos = _Tasks.submit(executor, read, range(len(touched)))
+            if tasks is not None:
+                tasks.append(excinfos)
 
         def wait():
             for excinfo in excinfos:
                 _delayedraise(excinfo)
 
-            if not explicit_basketcache:
-                for i in range(basketstop - 1):  # not including the last real basket
-                    try:
-                        del basketcache[self._basketcachekey(i)]
-                    except KeyError:
-                        pass
+            itemoffset = [0]
+            for source in sources:
+                itemoffset.append(itemoffset[-1] + interpretation.source_numitems(source))
+            entryoffset = [0] + numpy.cumsum(runstops - runstarts).tolist()
 
-            return interpretation.clip(destination,
-                                       basket_itemoffset[0],
-                                       basket_itemoffset[-1],
-                                       basket_entryoffset[0],
-                                       basket_entryoffset[-1])
+            destination = interpretation.destination(itemoffset[-1], entryoffset[-1])
+            for r, source in enumerate(sources):
+                interpretation.fill(source, destination, itemoffset[r], itemoffset[r + 1], entryoffset[r], entryoffset[r + 1])
+                sources[r] = None
+
+            return interpretation.clip(destination, 0, itemoffset[-1], 0, entryoffset[-1])
 
         return wait
 
-    def lazyarray(self, interpretation=None, limitbytes=1024**2, cache=None, basketcache=None, keycache=None, executor=None):
+    def lazyarray(self, interpretation=None, limitbytes=1024**2, cache=None, basketcache=None, keycache=None, executor=None, copy=True):
         if self._recoveredbaskets is None:
             self._tryrecover()
 
@@ -1424,7 +2517,7 @@ class TBranchMethods(object):
             keycache = uproot.cache.memorycache.ThreadSafeDict()
 
         interpretation = self._normalize_interpretation(interpretation)
-        return LazyArray._frombranch(self, interpretation, cache, basketcache, keycache, executor)
+        return LazyArray._frombranch(self, interpretation, cache, basketcache, keycache, executor, copy)
 
     class _BasketKey(object):
         def __init__(self, source, cursor, compression, complete):
@@ -1445,17 +2538,58 @@ class TBranchMethods(object):
                     if source.size() - self.fSeekKey < self.fNbytes:
                         raise ValueError("TKey declares that object {0} has {1} bytes but only {2} remain in the file".format(repr(self.fName), self.fNbytes, source.size() - self.fSeekKey))
 
-                if self.fObjlen != self.fNbytes - self.fKeylen:
-                    self.source = uproot.source.compressed.CompressedSource(compression, source, Cursor(self.fSeekKey + self.fKeylen), self.fNbytes - self.fKeylen, self.fObjlen)
-                    self.cursor = Cursor(0)
-                else:
-                    self.source = source
-                    self.cursor = Cursor(self.fSeekKey + self.fKeylen)
+                self._parent = source
+                self._compression = compression
 
         _format_small = struct.Struct(">ihiIhhii")
         _format_big = struct.Struct(">ihiIhhqq")
         _format_complete = struct.Struct(">Hiiii")
 
+        # the same layouts as structured dtypes, for reading many keys at once
+        _dtype_small = numpy.dtype([("fNbytes", ">i4"), ("fVersion", ">i2"), ("fObjlen", ">i4"), ("fDatime", ">u4"), ("fKeylen", ">i2"), ("fCycle", ">i2"), ("fSeekKey", ">i4"), ("fSeekPdir", ">i4")])
+        _dtype_big = numpy.dtype([("fNbytes", ">i4"), ("fVersion", ">i2"), ("fObjlen", ">i4"), ("fDatime", ">u4"), ("fKeylen", ">i2"), ("fCycle", ">i2"), ("fSeekKey", ">i8"), ("fSeekPdir", ">i8")])
+        _dtype_complete = numpy.dtype([("fVersion", ">u2"), ("fBufferSize", ">i4"), ("fNevBufSize", ">i4"), ("fNevBuf", ">i4"), ("fLast", ">i4")])
+
+        @classmethod
+        def _readmany(cls, source, seeks, compression):
+            # gather the fixed-size parts of all keys with fancy-indexing and decode them as structured arrays
+            data = source._source
+            size = len(data)
+
+            def gather(starts, dtype):
+                index = starts[:, numpy.newaxis] + numpy.arange(dtype.itemsize)
+                numpy.minimum(index, size - 1, index)
+                return data[index].reshape(-1).view(dtype)
+
+            seeks = numpy.asarray(seeks, dtype=numpy.int64)
+            head = gather(seeks, cls._dtype_small)
+            isbig = head["fVersion"] > 1000
+            fields = dict((n, head[n].astype(numpy.int64)) for n in cls._dtype_small.names)
+            if isbig.any():
+                big = gather(seeks[isbig], cls._dtype_big)
+                for n in cls._dtype_big.names:
+                    fields[n][isbig] = big[n]
+
+            toolong = size - fields["fSeekKey"] < fields["fNbytes"]
+            if toolong.any():
+                i = numpy.nonzero(toolong)[0][0]
+                raise ValueError("TKey declares that object {0} has {1} bytes but only {2} remain in the file".format(repr("TBranchMethods._BasketKey"), fields["fNbytes"][i], size - fields["fSeekKey"][i]))
+
+            complete = gather(seeks + fields["fKeylen"] - cls._format_complete.size - 1, cls._dtype_complete)
+            for n in cls._dtype_complete.names:
+                fields[n] = complete[n].astype(numpy.int64)
+
+            names = list(fields)
+            out = []
+            for values in zip(*[fields[n].tolist() for n in names]):
+                key = cls.__new__(cls)
+                key.__dict__.update(zip(names, values))
+                key.border = key.fLast - key.fKeylen
+                key._parent = source
+                key._compression = compression
+                out.append(key)
+            return out
+
         @property
         def fName(self):
             return "TBranchMethods._BasketKey"
@@ -1469,11 +2603,24 @@ class TBranchMethods(object):
             return "TBasket"
 
         def basketdata(self):
-            datasource = self.source.threadlocal()
+            return self.decompress(self.rawdata())
+
+        def rawdata(self, materialize=False):
+            # the basket as stored in the file (compressed or not), without decompressing it
+            datasource = self._parent.threadlocal()
             try:
-                return self.cursor.copied().bytes(datasource, self.fObjlen)
+                out = Cursor(self.fSeekKey + self.fKeylen).bytes(datasource, self.fNbytes - self.fKeylen)
             finally:
                 datasource.dismiss()
+            if materialize and isinstance(self._parent, MemmapSource) and self.fObjlen != self.fNbytes - self.fKeylen:
+                out = numpy.array(out)    # fault in the pages now, rather than in the decompression stage
+            return out
+
+        def decompress(self, rawdata):
+            if self.fObjlen != self.fNbytes - self.fKeylen:
+                return uproot.source.compressed.CompressedSource(self._compression, uproot.source.source.Source(rawdata), Cursor(0), len(rawdata), self.fObjlen).data(0, self.fObjlen)
+            else:
+                return rawdata
             
     class _RecoveredTBasket(uproot.rootio.ROOTObject):
         @classmethod
@@ -1517,6 +2664,12 @@ class TBranchMethods(object):
         def basketdata(self):
             return self.contents
 
+        def rawdata(self, materialize=False):
+            return self.contents
+
+        def decompress(self, rawdata):
+            return rawdata
+
         @property
         def numentries(self):
             return self.fNevBuf
@@ -1535,7 +2688,7 @@ class TBranchMethods(object):
         if entryoffsets[-1] == self.numentries:
             with self._recoverylock:
                 self._recoveredbaskets = recoveredbaskets
-                self._entryoffsets = entryoffsets
+                self._entryoffsets = numpy.array(entryoffsets, dtype=numpy.int64)
         else:
             raise ValueError("entries in recovered baskets (offsets {0}) don't add up to total number of entries ({1})".format(entryoffsets, self.numentries))
 
@@ -1681,14 +2834,14 @@ def daskframe(path, treepath, branches=None, chunks=None, limitbytes=1024**2, ca
                 series.append(dask.dataframe.from_dask_array(array, columns=name))
     return dask.dataframe.concat(series, axis=1)
 
-def lazyarray(path, treepath, branchname, interpretation=None, limitbytes=1024**2, cache=None, basketcache=None, keycache=None, localsource=MemmapSource.defaults, xrootdsource=XRootDSource.defaults, httpsource=HTTPSource.defaults, executor=None):
+def lazyarray(path, treepath, branchname, interpretation=None, limitbytes=1024**2, cache=None, basketcache=None, keycache=None, localsource=MemmapSource.defaults, xrootdsource=XRootDSource.defaults, httpsource=HTTPSource.defaults, executor=None, copy=True):
     if interpretation is None:
         branches = branchname
     else:
         branches = {branchname: interpretation}
-    return lazyarrays(path, treepath, branches=branches, outputtype=tuple, limitbytes=limitbytes, cache=cache, basketcache=basketcache, keycache=keycache, localsource=localsource, xrootdsource=xrootdsource, httpsource=httpsource, executor=executor)[0]
+    return lazyarrays(path, treepath, branches=branches, outputtype=tuple, limitbytes=limitbytes, cache=cache, basketcache=basketcache, keycache=keycache, localsource=localsource, xrootdsource=xrootdsource, httpsource=httpsource, executor=executor, copy=copy)[0]
 
-def lazyarrays(path, treepath, branches=None, outputtype=dict, limitbytes=1024**2, cache=None, basketcache=None, keycache=None, localsource=MemmapSource.defaults, xrootdsource=XRootDSource.defaults, httpsource=HTTPSource.defaults, executor=None):
+def lazyarrays(path, treepath, branches=None, outputtype=dict, limitbytes=1024**2, cache=None, basketcache=None, keycache=None, localsource=MemmapSource.defaults, xrootdsource=XRootDSource.defaults, httpsource=HTTPSource.defaults, executor=None, copy=True):
     if isinstance(path, string_types):
         paths = _filename_explode(path)
     else:
@@ -1717,22 +2870,22 @@ def lazyarrays(path, treepath, branches=None, outputtype=dict, limitbytes=1024**
 
     if outputtype == namedtuple:
         outputtype = namedtuple("Arrays", [branch.name.decode("ascii") for branch, interpretation in branches])
-        return outputtype(*[LazyArray._frompaths(paths, uuids, treepath, branch.name, chunksize(branch), interpretation, globalentryoffset, cache, basketcache, keycache, localsource, xrootdsource, httpsource, executor) for branch, interpretation in branches])
+        return outputtype(*[LazyArray._frompaths(paths, uuids, treepath, branch.name, chunksize(branch), interpretation, globalentryoffset, cache, basketcache, keycache, localsource, xrootdsource, httpsource, executor, copy) for branch, interpretation in branches])
     elif getattr(outputtype, "__name__", None) == "DataFrame" and getattr(outputtype, "__module__", None) == "pandas.core.frame":
         raise TypeError("pandas.DataFrame cannot store lazyarrays")
     elif isinstance(outputtype, type) and issubclass(outputtype, dict):
-        return outputtype((branch.name, LazyArray._frompaths(paths, uuids, treepath, branch.name, chunksize(branch), interpretation, globalentryoffset, cache, basketcache, keycache, localsource, xrootdsource, httpsource, executor)) for branch, interpretation in branches)
+        return outputtype((branch.name, LazyArray._frompaths(paths, uuids, treepath, branch.name, chunksize(branch), interpretation, globalentryoffset, cache, basketcache, keycache, localsource, xrootdsource, httpsource, executor, copy)) for branch, interpretation in branches)
     elif isinstance(outputtype, type) and issubclass(outputtype, (list, tuple)):
-        return outputtype(LazyArray._frompaths(paths, uuids, treepath, branch.name, chunksize(branch), interpretation, globalentryoffset, cache, basketcache, keycache, localsource, xrootdsource, httpsource, executor) for branch, interpretation in branches)
+        return outputtype(LazyArray._frompaths(paths, uuids, treepath, branch.name, chunksize(branch), interpretation, globalentryoffset, cache, basketcache, keycache, localsource, xrootdsource, httpsource, executor, copy) for branch, interpretation in branches)
     else:
-        return outputtype(*[LazyArray._frompaths(paths, uuids, treepath, branch.name, chunksize(branch), interpretation, globalentryoffset, cache, basketcache, keycache, localsource, xrootdsource, httpsource, executor) for branch, interpretation in branches])
+        return outputtype(*[LazyArray._frompaths(paths, uuids, treepath, branch.name, chunksize(branch), interpretation, globalentryoffset, cache, basketcache, keycache, localsource, xrootdsource, httpsource, executor, copy) for branch, interpretation in branches])
 
 class LazyArray(object):
     def __init__(self):
         raise TypeError("LazyArrays should be created with uproot.lazyarrays or TTreeMethods.lazyarrays")
 
     @classmethod
-    def _frombranch(cls, onlybranch, interpretation, cache, basketcache, keycache, executor):
+    def _frombranch(cls, onlybranch, interpretation, cache, basketcache, keycache, executor, copy=True):
         self = cls.__new__(cls)
         self._onlybranch = onlybranch
         self._paths = (None,)
@@ -1749,10 +2902,11 @@ class LazyArray(object):
         self._xrootdsource = None
         self._httpsource = None
         self._executor = executor
+        self._copy = copy
         return self
 
     @classmethod
-    def _frompaths(cls, paths, uuids, treepath, branchname, chunksize, interpretation, globalentryoffset, cache, basketcache, keycache, localsource, xrootdsource, httpsource, executor):
+    def _frompaths(cls, paths, uuids, treepath, branchname, chunksize, interpretation, globalentryoffset, cache, basketcache, keycache, localsource, xrootdsource, httpsource, executor, copy=True):
         self = cls.__new__(cls)
         self._onlybranch = None
         self._paths = paths
@@ -1769,6 +2923,7 @@ class LazyArray(object):
         self._xrootdsource = xrootdsource
         self._httpsource = httpsource
         self._executor = executor
+        self._copy = copy
         return self
 
     def __repr__(self):
@@ -1826,9 +2981,9 @@ class LazyArray(object):
 
         if self._onlybranch is None:
             tree = self._tree(filenum)
-            array = tree[self._branchname].array(interpretation=self._interpretation, entrystart=entrystart, entrystop=entrystop, flatten=False, cache=None, basketcache=self._basketcache, keycache=self._keycache, executor=self._executor, blocking=True)
+            array = tree[self._branchname].array(interpretation=self._interpretation, entrystart=entrystart, entrystop=entrystop, flatten=False, cache=None, basketcache=self._basketcache, keycache=self._keycache, executor=self._executor, blocking=True, copy=self._copy)
         else:
-            array = self._onlybranch.array(interpretation=self._interpretation, entrystart=entrystart, entrystop=entrystop, flatten=False, cache=None, basketcache=self._basketcache, keycache=self._keycache, executor=self._executor, blocking=True)
+            array = self._onlybranch.array(interpretation=self._interpretation, entrystart=entrystart, entrystop=entrystop, flatten=False, cache=None, basketcache=self._basketcache, keycache=self._keycache, executor=self._executor, blocking=True, copy=self._copy)
 
         if step < 0:
             array = array[::step]
@@ -1855,6 +3010,10 @@ class LazyArray(object):
             if isinstance(self._interpretation, asdtype):
                 shape = shape + self._interpretation.todims
 
+            if not self._copy and isinstance(self._interpretation, asdtype) and step == 1 and start < stop and stop <= self._globalentryoffset[start_filenum + 1]:
+                # a slice within one file can be returned as it comes from the branch, which may be a view
+                return self._piece(start_filenum, start - self._globalentryoffset[start_filenum], stop - self._globalentryoffset[start_filenum], step)
+
             out = numpy.empty(shape, dtype=self.dtype)
             pointer = 0
 